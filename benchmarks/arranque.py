@@ -0,0 +1,129 @@
+"""
+Benchmark del arranque en frío de la app (python -X importtime).
+
+Mide, en procesos nuevos, el tiempo de import de:
+- dependencias: streamlit + pandas solos, el piso que paga cualquier página
+  en esta máquina (la línea base del presupuesto).
+- app: el shell de app.py (Streamlit, barra lateral, config de precios).
+- arranque: app + la página por defecto (Calculadora), lo que paga el
+  primer render después de un deploy.
+- cada página por separado.
+
+Y verifica el presupuesto de arranque en frío:
+- la mediana de "arranque" no supera --presupuesto-relativo veces la de
+  "dependencias" (o --presupuesto-ms, si se da un presupuesto absoluto);
+- "arranque" no importa paquetes que deben cargarse diferido (altair,
+  fpdf…), independientemente de la velocidad de la máquina.
+
+Uso:
+    python benchmarks/arranque.py
+    python benchmarks/arranque.py --repeticiones 7 --presupuesto-relativo 1.3
+    python benchmarks/arranque.py --presupuesto-ms 1200
+
+Código de salida 1 si se excede el presupuesto.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OBJETIVOS = {
+    "dependencias": ["streamlit", "pandas"],
+    "app": ["app"],
+    "arranque": ["app", "paginas.calculadora"],
+    "paginas.simulaciones": ["paginas.simulaciones"],
+    "paginas.optimizador": ["paginas.optimizador"],
+    "paginas.copies": ["paginas.copies"],
+    "paginas.calendario": ["paginas.calendario"],
+}
+# Arranque ≤ 1,5 × dependencias: medido, el arranque queda en ~1,0–1,2 × y un
+# presupuesto absoluto depende demasiado de la máquina.
+PRESUPUESTO_RELATIVO = 1.5
+DIFERIDOS = ("altair", "fpdf", "PIL", "scipy")  # no deben cargarse en el arranque
+
+# ------------------ MEDICIÓN ------------------ #
+
+def medir(modulos: list) -> tuple:
+    """
+    Un proceso nuevo con -X importtime. Devuelve (total en ms, tiempo propio
+    en ms por paquete de primer nivel).
+    """
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Falló el import de {modulos}:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    por_paquete = defaultdict(float)
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        por_paquete[nombre.strip().split(".")[0]] += int(propio) / 1000
+        if not nombre.startswith("  "):  # import de primer nivel (sin sangría)
+            total_us += int(acumulado)
+    return total_us / 1000, dict(por_paquete)
+
+def medir_mediana(modulos: list, repeticiones: int) -> tuple:
+    corridas = [medir(modulos) for _ in range(repeticiones)]
+    totales = [t for t, _ in corridas]
+    mediana = statistics.median(totales)
+    # Desglose de la corrida más cercana a la mediana
+    _, por_paquete = min(corridas, key=lambda c: abs(c[0] - mediana))
+    return mediana, min(totales), por_paquete
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto-relativo", type=float, default=PRESUPUESTO_RELATIVO)
+    parser.add_argument(
+        "--presupuesto-ms", type=float, default=None, help="Presupuesto absoluto (reemplaza al relativo)"
+    )
+    parser.add_argument("--top", type=int, default=8, help="Paquetes a mostrar por objetivo")
+    args = parser.parse_args(argv)
+
+    resultados, medianas = {}, {}
+    for nombre, modulos in OBJETIVOS.items():
+        mediana, minimo, por_paquete = medir_mediana(modulos, args.repeticiones)
+        resultados[nombre] = por_paquete
+        medianas[nombre] = mediana
+        print(f"{nombre:<22} mediana {mediana:8.1f} ms   mín {minimo:8.1f} ms")
+        for paquete, ms in sorted(por_paquete.items(), key=lambda x: -x[1])[: args.top]:
+            print(f"    {paquete:<24} {ms:8.1f} ms")
+
+    presupuesto_ms = args.presupuesto_ms
+    if presupuesto_ms is None:
+        presupuesto_ms = args.presupuesto_relativo * medianas["dependencias"]
+    arranque_ms = medianas["arranque"]
+
+    fallas = []
+    if arranque_ms > presupuesto_ms:
+        fallas.append(
+            f"Arranque en frío de {arranque_ms:,.0f} ms supera el presupuesto "
+            f"de {presupuesto_ms:,.0f} ms."
+        )
+    cargados = sorted(set(DIFERIDOS) & set(resultados["arranque"]))
+    if cargados:
+        fallas.append(f"El arranque importa paquetes que deben ser diferidos: {', '.join(cargados)}")
+
+    print()
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if not fallas:
+        print(f"OK: arranque dentro del presupuesto ({presupuesto_ms:,.0f} ms).")
+    return 1 if fallas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Benchmarks de los cálculos con verificación contra valores dorados.
+
+Casos:
+- costo:    costos.costo_cop_vectorizado y costos.get_cost_cop
+- cupo:     costos.cupos_envios_vectorizado y costos.get_budget_envios_max
+- canal:    motor.calcular_canales (el cálculo por canal de la Calculadora)
+- sim1:     motor.barrido_sensibilidad (simulación 1) y simulaciones.simulacion_presupuesto
+- sim2_sql / sim2_mql: simulaciones.objetivo_vectorizado y simulaciones.simulacion_objetivo
+
+Para cada escala se generan filas aleatorias (semilla fija), se mide el
+motor vectorizado y se compara, valor por valor y sin tolerancia, contra
+las reglas escalares originales (benchmarks/referencia.py) sobre hasta
+--max-escalar filas. Las funciones escalares de mdhub también se miden y
+se verifican sobre esa muestra.
+
+Uso:
+    python benchmarks/calculos.py
+    python benchmarks/calculos.py --escalas 1,1000,1000000,10000000 --casos costo,sim1
+
+Código de salida 1 si algún valor difiere de la referencia.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import referencia  # noqa: E402
+from mdhub import costos, motor, precios, simulaciones  # noqa: E402
+
+ESCALAS = (1, 100, 10_000, 1_000_000)
+MAX_ESCALAR = 100_000
+SEMILLA = 7
+TIEMPO_MINIMO = 0.2  # segundos de medición por punto (se repite si el cálculo es corto)
+
+# ------------------ DATOS ------------------ #
+
+def _elegir(rng, opciones, n):
+    return np.array(opciones, dtype="object")[rng.integers(0, len(opciones), n)]
+
+def _tasas(rng, n, maximo):
+    tasa = rng.random(n) * maximo
+    tasa[rng.random(n) < 0.05] = 0.0  # algunas tasas 0 (casos sin solución)
+    return tasa
+
+def generar(n: int, rng, config) -> dict:
+    canales = list(config.channels) + ["sms promo", "cb", "Correo X", "whatsapp biz", "otro"]
+    return {
+        "pais": _elegir(rng, list(config.paises) + ["Perú", ""], n),
+        "canal": _elegir(rng, canales, n),
+        "proveedor_sms": _elegir(rng, ["Masive", "Nua", "nua"], n),
+        "segmento": _elegir(rng, ["Empresarios", "Aliados", "Contadores", "Otro"], n),
+        "periodo": _elegir(rng, ["Mensual", "Anual"], n),
+        "tipo_funnel": _elegir(rng, [motor.FUNNEL_DIRECTO, motor.FUNNEL_MQL_SQL], n),
+        "base": rng.integers(0, 200_000, n),
+        "envios_contacto": _elegir(rng, [0.5, 1.0, 1.5, 2.0, 3.0], n).astype("float64"),
+        "tasa_mql": _tasas(rng, n, 0.2),
+        "tasa_sql": _tasas(rng, n, 0.3),
+        "tipo_cambio": _elegir(rng, [3800.0, 4000.0, 4123.5], n).astype("float64"),
+        "budget": rng.random(n) * 50_000_000,
+        "cantidad": rng.integers(1, 5_000, n),
+        "costo_unit_cop": _elegir(rng, [0.0, 4.0, 12.0, 119.0, 320.0, 360.0], n).astype("float64"),
+    }
+
+def _subconjunto(d: dict, mascara) -> dict:
+    return {k: v[mascara] for k, v in d.items()}
+
+def sin_costo(d: dict, config) -> np.ndarray:
+    """
+    Filas cuyo canal no tiene costo (ni tabla del país ni entrada en
+    "canales"). Cambio de comportamiento deliberado: la referencia, como
+    app.py, las cobra a 0.0; mdhub lanza ValueError. Cada combinación
+    distinta se resuelve una sola vez.
+    """
+    combos = pd.MultiIndex.from_arrays([d["canal"], d["pais"], d["proveedor_sms"]])
+    unicos = combos.unique()
+    cero = [
+        referencia.costo_cop(canal, 4000.0, pais, proveedor, config) == 0.0
+        and canal not in config.channels
+        for canal, pais, proveedor in unicos
+    ]
+    return np.asarray(cero, dtype=bool)[unicos.get_indexer(combos)]
+
+# ------------------ CASOS ------------------ #
+# Cada caso: vectorizado(d, config) → dict de arreglos; referencia(d, i, config)
+# y escalar(d, i, config) → dict por fila con las mismas claves. Los casos con
+# usa_costo verifican aparte las filas sin costo (ver sin_costo).
+
+class Costo:
+    nombre = "costo"
+    usa_costo = True
+
+    def vectorizado(self, d, config):
+        return {
+            "costo_unit_cop": costos.costo_cop_vectorizado(
+                d["canal"], d["pais"], d["proveedor_sms"], d["tipo_cambio"], config
+            )
+        }
+
+    def referencia(self, d, i, config):
+        return {
+            "costo_unit_cop": referencia.costo_cop(
+                d["canal"][i], d["tipo_cambio"][i], d["pais"][i], d["proveedor_sms"][i], config
+            )
+        }
+
+    def escalar(self, d, i, config):
+        return {
+            "costo_unit_cop": costos.get_cost_cop(
+                d["canal"][i], d["tipo_cambio"][i], d["pais"][i], d["proveedor_sms"][i], config
+            )
+        }
+
+class Cupo:
+    nombre = "cupo"
+
+    def vectorizado(self, d, config):
+        return {
+            "cupo": costos.cupos_envios_vectorizado(
+                d["pais"], d["periodo"], d["segmento"], d["canal"], config
+            )
+        }
+
+    def referencia(self, d, i, config):
+        cupo = referencia.cupo_envios(
+            d["pais"][i], d["periodo"][i], d["segmento"][i], d["canal"][i], config
+        )
+        return {"cupo": np.nan if cupo is None else float(cupo)}
+
+    def escalar(self, d, i, config):
+        cupo = costos.get_budget_envios_max(
+            d["pais"][i], d["periodo"][i], d["segmento"][i], d["canal"][i], config
+        )
+        return {"cupo": np.nan if cupo is None else float(cupo)}
+
+class Canal:
+    nombre = "canal"
+    usa_costo = True
+    columnas = ("envios", "costo_unit_cop", "mql", "sql", "costo_total_cop", "costo_por_sql_cop")
+
+    def vectorizado(self, d, config):
+        plan = pd.DataFrame({k: d[k] for k in motor.COLUMNAS_ENTRADA})
+        resultado = motor.calcular_canales(plan, config)
+        return {c: resultado[c].to_numpy() for c in self.columnas}
+
+    def referencia(self, d, i, config):
+        return referencia.canal({k: d[k][i] for k in motor.COLUMNAS_ENTRADA}, config)
+
+    escalar = None
+
+class Simulacion1:
+    """
+    Grilla budgets × tasas_sql × tasas_mql de un canal en funnel MQL → SQL;
+    la fila i es la celda i de la grilla aplanada.
+    """
+
+    nombre = "sim1"
+    canal, pais, proveedor = "WhatsApp", "México", "Masive"
+
+    def _grilla(self, d):
+        n = len(d["budget"])
+        k = 1 if n < 100 else 10
+        return d["budget"][: max(n // (k * k), 1)], d["tasa_sql"][:k], d["tasa_mql"][:k]
+
+    def vectorizado(self, d, config):
+        budgets, tasas_sql, tasas_mql = self._grilla(d)
+        barrido = motor.barrido_sensibilidad(
+            self.canal, self.pais, self.proveedor, motor.FUNNEL_MQL_SQL, "COP",
+            budgets, tasas_sql, tasas_mql, (4000.0,), config,
+        )
+        return {k: barrido[k].ravel() for k in ("envios", "mql", "sql")}
+
+    def _celda(self, d, i):
+        budgets, tasas_sql, tasas_mql = self._grilla(d)
+        b, s, m, _ = np.unravel_index(i, (len(budgets), len(tasas_sql), len(tasas_mql), 1))
+        return budgets[b], tasas_sql[s], tasas_mql[m]
+
+    def referencia(self, d, i, config):
+        budget, tasa_sql, tasa_mql = self._celda(d, i)
+        costo = referencia.costo_cop(self.canal, 4000.0, self.pais, self.proveedor, config)
+        res = referencia.simulacion1(budget, costo, tasa_mql, tasa_sql, directo=False)
+        return res or {"envios": 0, "mql": 0, "sql": 0}
+
+    def escalar(self, d, i, config):
+        budget, tasa_sql, tasa_mql = self._celda(d, i)
+        try:
+            res = simulaciones.simulacion_presupuesto(
+                budget, self.canal, self.pais, self.proveedor, motor.FUNNEL_MQL_SQL,
+                tasa_mql, tasa_sql, "COP", 4000.0, config,
+            )
+        except ValueError:  # budget que no alcanza ni un envío
+            return {"envios": 0, "mql": 0, "sql": 0}
+        return {k: res[k] for k in ("envios", "mql", "sql")}
+
+class Simulacion2:
+    def __init__(self, objetivo: str):
+        self.objetivo = objetivo
+        self.nombre = f"sim2_{objetivo}"
+
+    def vectorizado(self, d, config):
+        res = simulaciones.objetivo_vectorizado(
+            self.objetivo,
+            d["cantidad"],
+            d["tasa_mql"],
+            d["tasa_sql"],
+            d["tipo_funnel"] == motor.FUNNEL_DIRECTO,
+            d["costo_unit_cop"],
+        )
+        return {k: res[k] for k in ("base", "mql", "sql", "budget_cop")}
+
+    def referencia(self, d, i, config):
+        res = referencia.simulacion2(
+            self.objetivo,
+            int(d["cantidad"][i]),
+            float(d["costo_unit_cop"][i]),
+            float(d["tasa_mql"][i]),
+            float(d["tasa_sql"][i]),
+            d["tipo_funnel"][i] == motor.FUNNEL_DIRECTO,
+        )
+        return res or {"base": -1, "mql": -1, "sql": -1, "budget_cop": np.nan}
+
+    def escalar(self, d, i, config):
+        try:
+            res = simulaciones.simulacion_objetivo(
+                self.objetivo, int(d["cantidad"][i]), "WhatsApp", "México", "Masive",
+                d["tipo_funnel"][i], float(d["tasa_mql"][i]), float(d["tasa_sql"][i]),
+                "COP", 4000.0, config,
+            )
+        except ValueError:  # tasas 0
+            return {"base": -1, "mql": -1, "sql": -1, "budget_cop": np.nan}
+        # simulacion_objetivo cobra el costo del canal; el budget se compara con el de la fila
+        return {
+            "base": res["base"],
+            "mql": res["mql"],
+            "sql": res["sql"],
+            "budget_cop": res["base"] * float(d["costo_unit_cop"][i]),
+        }
+
+CASOS = {c.nombre: c for c in (Costo(), Cupo(), Canal(), Simulacion1(), Simulacion2("sql"), Simulacion2("mql"))}
+
+# ------------------ MEDICIÓN ------------------ #
+
+def _medir(funcion):
+    """
+    (segundos por llamada, último resultado); repite hasta TIEMPO_MINIMO.
+    """
+    repeticiones, inicio = 0, time.perf_counter()
+    while True:
+        resultado = funcion()
+        repeticiones += 1
+        transcurrido = time.perf_counter() - inicio
+        if transcurrido >= TIEMPO_MINIMO:
+            return transcurrido / repeticiones, resultado
+
+def _diferencias(vector: dict, filas: list) -> int:
+    """
+    Valores distintos entre el motor y una lista de filas escalares.
+    """
+    malos = 0
+    for clave, arreglo in vector.items():
+        esperado = np.array([f[clave] for f in filas], dtype="float64")
+        obtenido = np.asarray(arreglo[: len(filas)], dtype="float64")
+        malos += int((~((esperado == obtenido) | (np.isnan(esperado) & np.isnan(obtenido)))).sum())
+    return malos
+
+def _lanza_valor(funcion) -> bool:
+    try:
+        funcion()
+    except ValueError:
+        return True
+    return False
+
+def verificar_sin_costo(caso, d: dict, config, max_escalar: int) -> int:
+    """
+    Fallas en las filas sin costo: la referencia debe cobrar 0.0 y el motor
+    (vectorizado y escalar) lanzar ValueError.
+    """
+    n = len(d["canal"])
+    if n == 0:
+        return 0
+    fallas = int(not _lanza_valor(lambda: caso.vectorizado(d, config)))
+    for i in range(min(n, max_escalar)):
+        fallas += int(caso.referencia(d, i, config)["costo_unit_cop"] != 0.0)
+        if caso.escalar is not None:
+            fallas += int(not _lanza_valor(lambda: caso.escalar(d, i, config)))
+    return fallas
+
+def correr_caso(caso, n: int, config, max_escalar: int) -> dict:
+    datos = generar(n, np.random.default_rng(SEMILLA), config)
+    excluidas, fallas = 0, 0
+    if getattr(caso, "usa_costo", False):
+        mascara = sin_costo(datos, config)
+        excluidas = int(mascara.sum())
+        fallas = verificar_sin_costo(caso, _subconjunto(datos, mascara), config, max_escalar)
+        datos = _subconjunto(datos, ~mascara)
+
+    t_vector, vector = _medir(lambda: caso.vectorizado(datos, config))
+    total = len(next(iter(vector.values())))
+    muestra = range(min(total, max_escalar))
+
+    t_ref, ref = _medir(lambda: [caso.referencia(datos, i, config) for i in muestra])
+    malos = _diferencias(vector, ref)
+    fila = {
+        "caso": caso.nombre,
+        "filas": total,
+        "vectorizado_ms": t_vector * 1000,
+        "vectorizado_ns_fila": t_vector / max(total, 1) * 1e9,
+        "referencia_ns_fila": t_ref / max(len(muestra), 1) * 1e9,
+        "escalar_ns_fila": np.nan,
+        "verificadas": len(muestra),
+        "sin_costo": excluidas,
+        "diferencias": malos + fallas,
+    }
+    if caso.escalar is not None and len(muestra):
+        t_esc, esc = _medir(lambda: [caso.escalar(datos, i, config) for i in muestra])
+        fila["escalar_ns_fila"] = t_esc / len(muestra) * 1e9
+        fila["diferencias"] += _diferencias({k: [f[k] for f in ref] for k in ref[0]}, esc)
+    return fila
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks con verificación de valores dorados.")
+    parser.add_argument(
+        "--escalas",
+        default=",".join(str(e) for e in ESCALAS),
+        help="Filas por punto, separadas por coma",
+    )
+    parser.add_argument("--casos", default=",".join(CASOS), help="Casos, separados por coma")
+    parser.add_argument("--max-escalar", type=int, default=MAX_ESCALAR, help="Filas verificadas por punto")
+    parser.add_argument("--salida", help="CSV con los resultados")
+    args = parser.parse_args(argv)
+
+    config = precios.actual()
+    escalas = [int(float(e)) for e in args.escalas.split(",")]
+    desconocidos = set(args.casos.split(",")) - set(CASOS)
+    if desconocidos:
+        parser.error(f"Casos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    filas = []
+    for nombre in args.casos.split(","):
+        for n in escalas:
+            fila = correr_caso(CASOS[nombre], n, config, args.max_escalar)
+            filas.append(fila)
+            print(
+                f"{fila['caso']:<9} {fila['filas']:>11,} filas  "
+                f"vect {fila['vectorizado_ms']:10.2f} ms ({fila['vectorizado_ns_fila']:9.1f} ns/fila)  "
+                f"ref {fila['referencia_ns_fila']:8.0f} ns/fila  "
+                f"escalar {fila['escalar_ns_fila']:8.0f} ns/fila  "
+                f"dif {fila['diferencias']} / {fila['verificadas']:,}  "
+                f"sin costo {fila['sin_costo']:,}",
+                flush=True,
+            )
+
+    tabla = pd.DataFrame(filas)
+    if args.salida:
+        tabla.to_csv(args.salida, index=False)
+    total = int(tabla["diferencias"].sum())
+    print()
+    print("OK: todos los valores coinciden con la referencia." if total == 0 else f"FALLA: {total} diferencias.")
+    return 1 if total else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Prueba de carga de la API (mdhub.api) con asyncio, sin dependencias.
+
+Abre --conexiones conexiones HTTP/1.1 keep-alive contra una instancia
+local y cada una envía peticiones en serie durante --duracion segundos.
+Reporta peticiones por segundo, latencias P50 / P90 / P99 y errores.
+
+Uso:
+    python -m mdhub.api --port 8000 --workers 4 &
+    python benchmarks/carga_api.py --url http://127.0.0.1:8000 --endpoint funnel
+
+    # o levantando la instancia desde el script:
+    python benchmarks/carga_api.py --iniciar --workers 2 --lote 100
+
+Código de salida 1 si hubo errores o no se alcanzó --min-rps.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CUERPOS = {
+    "funnel": {"canal": "WhatsApp", "pais": "México", "base": 20000, "tipo_funnel": "Directo a SQL"},
+    "costo": {"canal": "SMS", "pais": "Colombia", "proveedor_sms": "Nua"},
+    "cupo": {
+        "pais": "Colombia",
+        "periodo": "Mensual",
+        "segmento": "Empresarios",
+        "canal": "WhatsApp",
+        "envios": 20000,
+    },
+}
+
+# ------------------ CLIENTE ------------------ #
+
+def _peticion(host: str, endpoint: str, lote: int) -> bytes:
+    cuerpo = CUERPOS[endpoint]
+    datos = json.dumps([cuerpo] * lote if lote > 1 else cuerpo).encode("utf-8")
+    cabecera = (
+        f"POST /{endpoint} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(datos)}\r\n"
+        "\r\n"
+    ).encode("ascii")
+    return cabecera + datos
+
+async def _leer_respuesta(lector) -> int:
+    cabecera = await lector.readuntil(b"\r\n\r\n")
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    estado = int(lineas[0].split()[1])
+    largo = 0
+    for linea in lineas[1:]:
+        nombre, _, valor = linea.partition(":")
+        if nombre.lower() == "content-length":
+            largo = int(valor)
+    await lector.readexactly(largo)
+    return estado
+
+async def _conexion(host, puerto, peticion, hasta, latencias, errores):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        while time.perf_counter() < hasta:
+            inicio = time.perf_counter()
+            escritor.write(peticion)
+            await escritor.drain()
+            estado = await _leer_respuesta(lector)
+            if estado == 200:
+                latencias.append(time.perf_counter() - inicio)
+            else:
+                errores.append(estado)
+    finally:
+        escritor.close()
+
+async def cargar(host, puerto, endpoint, lote, conexiones, duracion) -> dict:
+    peticion = _peticion(host, endpoint, lote)
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    hasta = inicio + duracion
+    resultados = await asyncio.gather(
+        *(_conexion(host, puerto, peticion, hasta, latencias, errores) for _ in range(conexiones)),
+        return_exceptions=True,
+    )
+    transcurrido = time.perf_counter() - inicio
+    fallas = [r for r in resultados if isinstance(r, Exception)]
+    cuantiles = statistics.quantiles(latencias, n=100) if len(latencias) >= 2 else [float("nan")] * 99
+    return {
+        "peticiones": len(latencias),
+        "rps": len(latencias) / transcurrido,
+        "items_por_segundo": len(latencias) * lote / transcurrido,
+        "p50_ms": cuantiles[49] * 1000,
+        "p90_ms": cuantiles[89] * 1000,
+        "p99_ms": cuantiles[98] * 1000,
+        "errores_http": len(errores),
+        "conexiones_fallidas": len(fallas),
+    }
+
+# ------------------ INSTANCIA LOCAL ------------------ #
+
+def _esperar_salud(url: str, timeout: float = 30.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(url + "/salud", timeout=1) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"La API no respondió en {url} dentro de {timeout:.0f} s.")
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de mdhub.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=list(CUERPOS), default="funnel")
+    parser.add_argument("--lote", type=int, default=1, help="Ítems por petición")
+    parser.add_argument("--conexiones", type=int, default=64)
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos")
+    parser.add_argument("--min-rps", type=float, default=0.0, help="Falla si no se alcanza")
+    parser.add_argument("--iniciar", action="store_true", help="Levanta python -m mdhub.api")
+    parser.add_argument("--workers", type=int, default=1, help="Workers con --iniciar")
+    args = parser.parse_args(argv)
+
+    url = urllib.parse.urlsplit(args.url)
+    servidor = None
+    if args.iniciar:
+        servidor = subprocess.Popen(
+            [
+                sys.executable, "-m", "mdhub.api",
+                "--host", url.hostname, "--port", str(url.port), "--workers", str(args.workers),
+            ],
+            cwd=RAIZ,
+        )
+    try:
+        _esperar_salud(args.url)
+        res = asyncio.run(
+            cargar(url.hostname, url.port, args.endpoint, args.lote, args.conexiones, args.duracion)
+        )
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait(timeout=10)
+
+    print(
+        f"/{args.endpoint} · lote {args.lote} · {args.conexiones} conexiones · {args.duracion:.0f} s"
+    )
+    print(f"  Peticiones:        {res['peticiones']:,}")
+    print(f"  Peticiones / s:    {res['rps']:,.0f}")
+    print(f"  Ítems / s:         {res['items_por_segundo']:,.0f}")
+    print(f"  Latencia P50 / P90 / P99: {res['p50_ms']:.2f} / {res['p90_ms']:.2f} / {res['p99_ms']:.2f} ms")
+    print(f"  Errores HTTP: {res['errores_http']} · conexiones fallidas: {res['conexiones_fallidas']}")
+
+    fallo = res["errores_http"] or res["conexiones_fallidas"] or res["rps"] < args.min_rps
+    return 1 if fallo else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
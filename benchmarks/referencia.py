@@ -0,0 +1,142 @@
+"""
+Implementaciones escalares de referencia (valores dorados).
+
+Son las reglas originales de app.py, fila por fila con `math` y dicts,
+leyendo las tablas del snapshot de precios en vez de las constantes de
+módulo. Los motores vectorizados de mdhub deben dar exactamente lo mismo
+(mismos floor / ceil, mismos floats).
+"""
+
+import math
+
+# ------------------ COSTOS Y CUPOS ------------------ #
+
+def costo_cop(canal: str, fx: float, pais: str, proveedor_sms: str, config) -> float:
+    if not pais:
+        pais = "Colombia"
+    pais = pais.strip()
+
+    canal_low = canal.lower()
+    tablas = config.costos_cop
+    base_cop = None
+
+    if "whatsapp" in canal_low:
+        base_cop = tablas.get("whatsapp", {}).get(pais)
+    elif canal_low.startswith("email") or "correo" in canal_low:
+        base_cop = tablas.get("email", {}).get(pais)
+    elif "call blasting" in canal_low or canal_low == "cb":
+        base_cop = tablas.get("call_blasting", {}).get(pais)
+    elif "sms" in canal_low:
+        prov = (proveedor_sms or "Masive").lower()
+        if prov == "nua":
+            base_cop = tablas.get("sms_nua", {}).get(pais)
+        else:
+            base_cop = tablas.get("sms_masive", {}).get(pais)
+
+    if base_cop is not None:
+        return float(base_cop)
+
+    info = config.channels.get(canal)
+    if info is None:
+        return 0.0
+    if info["moneda"] == "COP":
+        return float(info["costo"])
+    return float(info["costo"]) * fx
+
+def cupo_envios(pais: str, periodo: str, segmento_ui: str, canal: str, config):
+    if segmento_ui == "Empresarios":
+        seg_key = "Empresarios"
+    elif segmento_ui in ("Contadores", "Aliados"):
+        seg_key = "Aliados"
+    else:
+        return None
+
+    canal_low = canal.lower()
+    if "whatsapp" in canal_low or "wapp" in canal_low:
+        canal_key = "WAPP"
+    elif "sms" in canal_low:
+        canal_key = "SMS"
+    elif "call blasting" in canal_low or canal_low == "cb":
+        canal_key = "CB"
+    else:
+        return None
+
+    return config.budget_envios.get(pais, {}).get(periodo, {}).get(seg_key, {}).get(canal_key)
+
+# ------------------ CALCULADORA (POR CANAL) ------------------ #
+
+def canal(fila: dict, config) -> dict:
+    """
+    Una fila del loop por canal de la Calculadora.
+    """
+    base = fila["base"]
+    envios = base * fila["envios_contacto"]
+    costo_unit_cop = costo_cop(
+        fila["canal"], fila["tipo_cambio"], fila["pais"], fila["proveedor_sms"], config
+    )
+    costo_canal_cop = envios * costo_unit_cop
+
+    if fila["tipo_funnel"] == "Directo a SQL":
+        mql = math.floor(base * fila["tasa_sql"])
+        sql = mql
+    else:
+        mql = math.floor(base * fila["tasa_mql"])
+        sql = math.floor(mql * fila["tasa_sql"])
+
+    cps_canal_cop = costo_canal_cop / sql if sql > 0 else 0.0
+    return {
+        "envios": envios,
+        "costo_unit_cop": costo_unit_cop,
+        "mql": mql,
+        "sql": sql,
+        "costo_total_cop": costo_canal_cop,
+        "costo_por_sql_cop": cps_canal_cop,
+    }
+
+# ------------------ SIMULACIONES ------------------ #
+
+def simulacion1(budget_cop: float, costo_unit_cop: float, tasa_mql, tasa_sql, directo) -> dict:
+    """
+    Simulación 1 con budget ya en COP (None si el costo es 0).
+    """
+    if costo_unit_cop <= 0:
+        return None
+    envios = math.floor(budget_cop / costo_unit_cop)
+    base = envios
+    if directo:
+        mql = math.floor(base * tasa_sql)
+        sql = mql
+    else:
+        mql = math.floor(base * tasa_mql)
+        sql = math.floor(mql * tasa_sql)
+    return {"envios": envios, "mql": mql, "sql": sql}
+
+def simulacion2(objetivo: str, cantidad: int, costo_unit_cop: float, tasa_mql, tasa_sql, directo):
+    """
+    Simulación 2 (None si no tiene solución por tasas 0).
+    """
+    if objetivo == "sql":
+        if directo:
+            if tasa_sql <= 0:
+                return None
+            base = math.ceil(cantidad / tasa_sql)
+            mql = cantidad
+        else:
+            if tasa_mql <= 0 or tasa_sql <= 0:
+                return None
+            base = math.ceil(cantidad / (tasa_mql * tasa_sql))
+            mql = math.ceil(base * tasa_mql)
+        sql = cantidad
+    else:
+        if directo:
+            if tasa_sql <= 0:
+                return None
+            base = math.ceil(cantidad / tasa_sql)
+            sql = cantidad
+        else:
+            if tasa_mql <= 0:
+                return None
+            base = math.ceil(cantidad / tasa_mql)
+            sql = math.floor(cantidad * tasa_sql)
+        mql = cantidad
+    return {"base": base, "mql": mql, "sql": sql, "budget_cop": base * costo_unit_cop}
@@ -0,0 +1,3 @@
+"""
+Lógica de marketing directo (costos, funnel y cupos) sin dependencias de Streamlit.
+"""
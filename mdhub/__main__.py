@@ -0,0 +1,242 @@
+"""
+CLI de mdhub sin Streamlit, para corridas programadas.
+
+    python -m mdhub calcular campanias.json
+    python -m mdhub presupuesto casos.csv
+    python -m mdhub objetivo casos.json
+    python -m mdhub cupos plan.csv --fallar-si-excede
+    python -m mdhub --json calcular campanias.json
+
+calcular / presupuesto / objetivo leen un archivo de casos: JSON (un
+objeto o una lista de objetos) o CSV (una fila por caso); "-" lee JSON de
+stdin. Las claves son los parámetros de calculadora.calcular_campania y de
+simulaciones.simulacion_presupuesto / simulacion_objetivo, más "fecha"
+opcional para tomar tipo_cambio de la tabla de cambio. cupos recibe un
+plan masivo (CSV / Parquet) como importacion.
+
+Los módulos de cálculo se importan dentro de cada comando: `--help` y los
+errores de argumentos no pagan el import de pandas / NumPy.
+
+Código de salida: 0 = ok, 1 = algún caso falló o (con --fallar-si-excede)
+algún cupo se excede.
+"""
+
+import argparse
+import json
+import math
+import sys
+
+DEFAULTS_CALCULADORA = {
+    "moneda_trabajo": "COP",
+    "pais": "Colombia",
+    "proveedor_sms": "Masive",
+    "periodo_ppto": "Mensual",
+    "segmento": "Otro",
+    "tipo_funnel": "Directo a SQL",
+    "num_envios_contacto": 1.0,
+}
+
+# ------------------ ENTRADA / SALIDA ------------------ #
+
+def _leer_casos(ruta: str) -> list:
+    """
+    Casos de un archivo JSON / CSV como lista de dicts (celdas vacías → None).
+    """
+    if ruta == "-":
+        datos = json.load(sys.stdin)
+    elif ruta.lower().endswith(".csv"):
+        import pandas as pd
+
+        df = pd.read_csv(ruta)
+        datos = df.astype(object).where(df.notna(), None).to_dict("records")
+    else:
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+    if isinstance(datos, dict):
+        datos = [datos]
+    if not isinstance(datos, list) or not all(isinstance(d, dict) for d in datos):
+        raise ValueError("El archivo de casos debe ser un objeto o una lista de objetos.")
+    return datos
+
+def _a_json(valor):
+    if hasattr(valor, "tolist"):  # arreglos y escalares de NumPy
+        return valor.tolist()
+    if hasattr(valor, "to_dict"):
+        return valor.astype(object).where(valor.notna(), None).to_dict("records")
+    raise TypeError(f"Valor no serializable a JSON: {type(valor).__name__}")
+
+def _sin_nan(valor):
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if isinstance(valor, dict):
+        return {k: _sin_nan(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_sin_nan(v) for v in valor]
+    return valor
+
+def _imprimir_json(datos):
+    datos = _sin_nan(json.loads(json.dumps(datos, default=_a_json)))
+    json.dump(datos, sys.stdout, ensure_ascii=False, indent=2, allow_nan=False)
+    print()
+
+def _argumentos(funcion, caso: dict, obligatorios=()) -> dict:
+    """
+    Valida las claves de un caso contra la firma de la función.
+    """
+    import inspect
+
+    parametros = set(inspect.signature(funcion).parameters) - {"config"}
+    desconocidas = sorted(set(caso) - parametros)
+    if desconocidas:
+        raise ValueError(f"Claves desconocidas: {', '.join(desconocidas)}")
+    faltantes = [p for p in obligatorios if caso.get(p) is None]
+    if faltantes:
+        raise ValueError(f"Faltan claves obligatorias: {', '.join(faltantes)}")
+    return {k: v for k, v in caso.items() if v is not None}
+
+def _con_tipo_cambio(caso: dict) -> dict:
+    """
+    Sin tipo_cambio, usa la tasa de la tabla de cambio en la clave opcional
+    "fecha" del caso (sin fecha, la última publicada).
+    """
+    from . import cambio
+
+    caso = dict(caso)
+    fecha = caso.pop("fecha", None)
+    if caso.get("tipo_cambio") is None:
+        caso["tipo_cambio"] = cambio.tabla().tasa_en(fecha)
+        if cambio.error_tabla():
+            print(
+                f"Aviso: tasas de cambio no válidas, se usa {caso['tipo_cambio']:,.0f}: "
+                f"{cambio.error_tabla()}",
+                file=sys.stderr,
+            )
+    return caso
+
+# ------------------ COMANDOS ------------------ #
+
+def cmd_calcular(args) -> int:
+    from . import calculadora
+
+    salida, errores = [], 0
+    for i, caso in enumerate(_leer_casos(args.casos), start=1):
+        try:
+            entradas = dict(DEFAULTS_CALCULADORA)
+            entradas.update(
+                _argumentos(calculadora.calcular_campania, _con_tipo_cambio(caso), ("canales",))
+            )
+            calc = calculadora.calcular_campania(**entradas)
+        except ValueError as exc:
+            errores += 1
+            salida.append({"caso": i, "error": str(exc)})
+            continue
+        calc = {k: v for k, v in calc.items() if k != "resultado"}
+        salida.append({"caso": i, **calc})
+
+    if args.json:
+        _imprimir_json(salida)
+        return 1 if errores else 0
+
+    for r in salida:
+        print(f"===== Caso {r['caso']} =====")
+        if "error" in r:
+            print(f"Error: {r['error']}")
+        else:
+            print(f"(precios {r['version_precios']})")
+            print(r["output_text"])
+            for alerta in r["alertas_cupo"]:
+                print(alerta)
+        print()
+    return 1 if errores else 0
+
+def _cmd_simulacion(args, funcion, obligatorios) -> int:
+    import pandas as pd
+
+    salida, errores = [], 0
+    for i, caso in enumerate(_leer_casos(args.casos), start=1):
+        try:
+            resultado = funcion(**_argumentos(funcion, _con_tipo_cambio(caso), obligatorios))
+        except ValueError as exc:
+            errores += 1
+            salida.append({"caso": i, "error": str(exc)})
+            continue
+        salida.append({"caso": i, **resultado})
+
+    if args.json:
+        _imprimir_json(salida)
+    else:
+        print(pd.DataFrame(salida).set_index("caso").to_string(na_rep=""))
+    return 1 if errores else 0
+
+def cmd_presupuesto(args) -> int:
+    from .simulaciones import simulacion_presupuesto
+
+    return _cmd_simulacion(args, simulacion_presupuesto, ("budget", "canal", "pais"))
+
+def cmd_objetivo(args) -> int:
+    from .simulaciones import simulacion_objetivo
+
+    return _cmd_simulacion(args, simulacion_objetivo, ("objetivo", "cantidad", "canal", "pais"))
+
+def cmd_cupos(args) -> int:
+    from .importacion import procesar_plan
+
+    acumulador = procesar_plan(args.plan, formato=args.formato)
+    resumen = acumulador.resumen()
+    cupos = acumulador.uso_cupos()
+    excedidos = cupos[cupos["envios_campaña"] > cupos["cupo_disponible"]]
+
+    if args.json:
+        _imprimir_json({"resumen": resumen, "cupos": cupos, "excedidos": excedidos})
+    else:
+        print(f"Filas: {resumen['filas']:,}")
+        print(f"Envíos totales: {resumen['total_envios']:,.0f}")
+        print(f"Costo total: {resumen['total_costo_cop']:,.0f} COP")
+        if not cupos.empty:
+            print()
+            print(cupos.to_string(index=False))
+        print()
+        print(f"Cupos excedidos: {len(excedidos)}")
+    return 1 if args.fallar_si_excede and not excedidos.empty else 0
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mdhub",
+        description="Calculadora, simulaciones y chequeo de cupos sin Streamlit.",
+    )
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("calcular", help="Calculadora de campañas")
+    p.add_argument("casos", help="JSON / CSV con las entradas de cada campaña")
+    p.set_defaults(funcion=cmd_calcular)
+
+    p = sub.add_parser("presupuesto", help="Simulación 1: budget → MQL / SQL")
+    p.add_argument("casos", help="JSON / CSV con budget, canal, pais, ...")
+    p.set_defaults(funcion=cmd_presupuesto)
+
+    p = sub.add_parser("objetivo", help="Simulación 2: MQL / SQL objetivo → budget")
+    p.add_argument("casos", help="JSON / CSV con objetivo, cantidad, canal, pais, ...")
+    p.set_defaults(funcion=cmd_objetivo)
+
+    p = sub.add_parser("cupos", help="Uso de cupos de envíos de un plan masivo")
+    p.add_argument("plan", help="Archivo del plan (.csv o .parquet)")
+    p.add_argument("--formato", choices=("csv", "parquet"), help="Forzar formato de entrada")
+    p.add_argument(
+        "--fallar-si-excede",
+        action="store_true",
+        help="Código de salida 1 si algún cupo se excede",
+    )
+    p.set_defaults(funcion=cmd_cupos)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.funcion(args)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
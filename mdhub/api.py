@@ -0,0 +1,379 @@
+"""
+Servicio HTTP (ASGI) sobre el motor de costos / funnel / cupos.
+
+Endpoints (JSON):
+    GET  /salud    versión de precios vigente
+    GET  /config   países y canales con sus tasas por defecto
+    POST /costo    {"canal", "pais", "proveedor_sms", "tipo_cambio" o "fecha"}
+    POST /funnel   una fila de plan: {"canal", "base", "pais", "tipo_funnel", ...}
+    POST /cupo     {"pais", "periodo", "segmento", "canal", "envios"}
+
+Cada POST acepta un objeto (responde un objeto) o una lista de objetos
+(lote, responde una lista en el mismo orden). Las claves omitidas usan los
+defaults de motor.COLUMNAS_ENTRADA y las tasas vacías los defaults del
+canal, igual que un plan masivo.
+
+La app ASGI no usa framework ni pandas en el camino de una petición: los
+índices de la matriz de costos precompilada se resuelven una vez por
+combinación distinta del lote y el funnel corre con motor.funnel sobre
+arreglos NumPy. Cada petición usa un único snapshot de precios.
+
+Para servirla hace falta un servidor ASGI (uvicorn):
+    python -m mdhub.api --port 8000 --workers 4
+"""
+
+import argparse
+import json
+import math
+
+import numpy as np
+
+from . import cambio, precios
+from .costos import (
+    get_budget_envios_max,
+    resolver_canal,
+    resolver_pais,
+    resolver_proveedor,
+    validar_costos,
+)
+from .motor import COLUMNAS_ENTRADA, FUNNEL_DIRECTO, funnel
+
+MAX_ITEMS = 50_000            # ítems por lote
+MAX_CUERPO = 16 * 1024 * 1024  # bytes por petición
+MAX_CONTEO = 1e12              # contactos / envíos por ítem (int64 sin desbordar)
+
+class ErrorPeticion(ValueError):
+    """
+    Error del cliente: se responde con `estado` y {"error": mensaje}.
+    """
+
+    def __init__(self, mensaje: str, estado: int = 400):
+        super().__init__(mensaje)
+        self.estado = estado
+
+# ------------------ LECTURA DE ÍTEMS ------------------ #
+
+def _items(datos) -> tuple:
+    """
+    (lista de ítems, es_lote) a partir del cuerpo JSON.
+    """
+    es_lote = isinstance(datos, list)
+    items = datos if es_lote else [datos]
+    if not all(isinstance(i, dict) for i in items):
+        raise ErrorPeticion("El cuerpo debe ser un objeto JSON o una lista de objetos.")
+    if len(items) > MAX_ITEMS:
+        raise ErrorPeticion(f"El lote supera el máximo de {MAX_ITEMS:,} ítems.", 413)
+    return items, es_lote
+
+def _texto(items, clave: str, obligatoria: bool = False) -> list:
+    default = COLUMNAS_ENTRADA.get(clave)
+    valores = []
+    for n, item in enumerate(items):
+        valor = item.get(clave)
+        if valor is None:
+            if obligatoria or default is None:
+                raise ErrorPeticion(f"Falta '{clave}' en el ítem {n}.")
+            valor = default
+        valores.append(str(valor).strip())
+    return valores
+
+def _numero(items, clave: str, default=None) -> np.ndarray:
+    if default is None:
+        default = COLUMNAS_ENTRADA.get(clave)
+    valores = [item.get(clave) for item in items]
+    dados = np.array([v is not None for v in valores], dtype=bool)
+    valores = [default if v is None else v for v in valores]
+    try:
+        numeros = np.array([np.nan if v is None else v for v in valores], dtype="float64")
+    except (TypeError, ValueError):
+        raise ErrorPeticion(f"'{clave}' debe ser numérico.") from None
+    # NaN = dato ausente; NaN / Infinity escritos en el JSON no se aceptan
+    invalidos = dados & ~np.isfinite(numeros) | (numeros < 0)
+    if invalidos.any():
+        n = int(np.flatnonzero(invalidos)[0])
+        raise ErrorPeticion(
+            f"'{clave}' debe ser un número finito y no negativo (ítem {n}: {valores[n]!r})."
+        )
+    return numeros
+
+def _conteo(items, clave: str, default=None) -> np.ndarray:
+    """
+    Como _numero, pero el valor es un conteo: entero y a lo sumo MAX_CONTEO.
+    """
+    numeros = _numero(items, clave, default)
+    # NaN = dato ausente: lo decide quien llama
+    invalidos = (numeros != np.floor(numeros)) & ~np.isnan(numeros) | (numeros > MAX_CONTEO)
+    if invalidos.any():
+        n = int(np.flatnonzero(invalidos)[0])
+        raise ErrorPeticion(
+            f"'{clave}' debe ser un entero entre 0 y {MAX_CONTEO:,.0f} "
+            f"(ítem {n}: {items[n].get(clave)!r})."
+        )
+    return numeros
+
+def _tipo_cambio(items) -> np.ndarray:
+    """
+    tipo_cambio de cada ítem; sin él, la tasa de la tabla en su "fecha"
+    (o la última publicada), buscadas todas de una vez. Una "fecha" que no
+    es una fecha ISO (YYYY-MM-DD) responde 400 en vez de usar la última tasa.
+    """
+    fx = _numero(items, "tipo_cambio")
+    vacios = np.flatnonzero(np.isnan(fx))
+    if len(vacios):
+        fechas = [items[n].get("fecha") for n in vacios]
+        for n, fecha in zip(vacios, fechas):
+            if fecha is not None and not _es_fecha(fecha):
+                raise ErrorPeticion(f"'fecha' no es una fecha válida (ítem {n}: {fecha!r}).")
+        fx[vacios] = cambio.tasas_en(fechas)
+    return fx
+
+def _es_fecha(valor) -> bool:
+    if not isinstance(valor, str):
+        return False
+    try:
+        return not np.isnat(np.datetime64(valor.strip(), "D"))
+    except ValueError:
+        return False
+
+def _costos(canales, paises, proveedores, fx, config) -> np.ndarray:
+    """
+    Costo por envío en COP, misma regla que costos.costo_cop_vectorizado;
+    cada combinación distinta se resuelve una sola vez.
+    """
+    resueltos = {}
+    indices = []
+    for clave in zip(canales, paises, proveedores):
+        idx = resueltos.get(clave)
+        if idx is None:
+            canal, pais, proveedor = clave
+            canonico, fallback = resolver_canal(canal, config)
+            idx = resueltos[clave] = (
+                resolver_pais(pais, config),
+                int(canonico),
+                int(resolver_proveedor(proveedor)),
+                int(fallback),
+            )
+        indices.append(idx)
+    idx = tuple(np.array(indices, dtype="int64").reshape(-1, 4).T)
+    try:
+        validar_costos(idx, canales, config)
+    except ValueError as exc:
+        raise ErrorPeticion(str(exc)) from None
+    cop = config.matriz_costo_cop[idx]
+    usd = config.matriz_costo_usd[idx]
+    return np.where(usd != 0.0, cop + usd * fx, cop)
+
+def _cupos(paises, periodos, segmentos, canales, config) -> list:
+    resueltos = {}
+    cupos = []
+    for clave in zip(paises, periodos, segmentos, canales):
+        if clave not in resueltos:
+            resueltos[clave] = get_budget_envios_max(*clave, config=config)
+        cupos.append(resueltos[clave])
+    return cupos
+
+def _uso_cupo(envios: float, cupo) -> dict:
+    if cupo is None:
+        return {"cupo_disponible": None, "%_uso": None, "envios_restantes": None, "excede_cupo": None}
+    envios = int(envios)
+    return {
+        "cupo_disponible": cupo,
+        "%_uso": round(envios / cupo * 100.0, 1) if cupo > 0 else 0.0,
+        "envios_restantes": max(cupo - envios, 0),
+        "excede_cupo": envios > cupo,
+    }
+
+# ------------------ ENDPOINTS ------------------ #
+
+def costo(items: list, config) -> list:
+    canales = _texto(items, "canal", obligatoria=True)
+    fx = _tipo_cambio(items)
+    cop = _costos(
+        canales, _texto(items, "pais"), _texto(items, "proveedor_sms"), fx, config
+    ).tolist()
+    return [
+        {"canal": c, "costo_unit_cop": v, "costo_unit_usd": v / f if f > 0 else None}
+        for c, v, f in zip(canales, cop, fx.tolist())
+    ]
+
+def calcular_funnel(items: list, config) -> list:
+    canales = _texto(items, "canal", obligatoria=True)
+    paises = _texto(items, "pais")
+    segmentos = _texto(items, "segmento")
+    periodos = _texto(items, "periodo")
+    base = _conteo(items, "base")
+    if np.isnan(base).any():
+        raise ErrorPeticion("Falta 'base' en algún ítem.")
+
+    tasas = {}
+    for col in ("tasa_mql", "tasa_sql"):
+        tasa = _numero(items, col)
+        for n in np.flatnonzero(np.isnan(tasa)):
+            tasa[n] = config.channels.get(canales[n], {}).get(col, 0.0)
+        tasas[col] = tasa
+
+    costo_unit_cop = _costos(
+        canales, paises, _texto(items, "proveedor_sms"), _tipo_cambio(items), config
+    )
+    salida = funnel(
+        base.astype("int64"),
+        _numero(items, "envios_contacto"),
+        tasas["tasa_mql"],
+        tasas["tasa_sql"],
+        np.array([f == FUNNEL_DIRECTO for f in _texto(items, "tipo_funnel")], dtype=bool),
+        costo_unit_cop,
+    )
+    cupos = _cupos(paises, periodos, segmentos, canales, config)
+
+    columnas = {k: v.tolist() for k, v in salida.items()}
+    columnas["costo_unit_cop"] = costo_unit_cop.tolist()
+    respuesta = []
+    for n, canal in enumerate(canales):
+        fila = {"canal": canal, "pais": paises[n], "base": int(base[n])}
+        fila.update({k: v[n] for k, v in columnas.items()})
+        fila.update(_uso_cupo(columnas["envios"][n], cupos[n]))
+        respuesta.append(fila)
+    return respuesta
+
+def cupo(items: list, config) -> list:
+    paises = _texto(items, "pais")
+    periodos = _texto(items, "periodo")
+    segmentos = _texto(items, "segmento", obligatoria=True)
+    canales = _texto(items, "canal", obligatoria=True)
+    envios = _conteo(items, "envios", 0.0).tolist()
+    cupos = _cupos(paises, periodos, segmentos, canales, config)
+    return [
+        {"pais": p, "periodo": pe, "segmento": s, "canal": c, "envios": e, **_uso_cupo(e, cu)}
+        for p, pe, s, c, e, cu in zip(paises, periodos, segmentos, canales, envios, cupos)
+    ]
+
+def salud(config) -> dict:
+    respuesta = {"ok": True, "version_precios": config.version}
+    error_fx = cambio.error_tabla()
+    if error_fx:
+        respuesta["error_tasas_cambio"] = error_fx
+    return respuesta
+
+def datos_config(config) -> dict:
+    return {
+        "version_precios": config.version,
+        "paises": list(config.paises),
+        "canales": {
+            canal: {"tasa_mql": info.get("tasa_mql"), "tasa_sql": info.get("tasa_sql")}
+            for canal, info in config.channels.items()
+        },
+    }
+
+RUTAS_GET = {"/salud": salud, "/config": datos_config}
+RUTAS_POST = {"/costo": costo, "/funnel": calcular_funnel, "/cupo": cupo}
+
+def despachar(metodo: str, ruta: str, cuerpo: bytes) -> tuple:
+    """
+    (estado HTTP, datos JSON) para una petición; sin I/O, fácil de probar.
+    """
+    config = precios.actual()
+    if ruta in RUTAS_GET:
+        if metodo != "GET":
+            return 405, {"error": f"{ruta} solo acepta GET."}
+        return 200, RUTAS_GET[ruta](config)
+    if ruta not in RUTAS_POST:
+        return 404, {"error": f"Ruta desconocida: {ruta}"}
+    if metodo != "POST":
+        return 405, {"error": f"{ruta} solo acepta POST."}
+
+    try:
+        datos = json.loads(cuerpo or b"null")
+    except ValueError:
+        return 400, {"error": "El cuerpo no es JSON válido."}
+    try:
+        items, es_lote = _items(datos)
+        respuesta = RUTAS_POST[ruta](items, config)
+    except ErrorPeticion as exc:
+        return exc.estado, {"error": str(exc)}
+    return 200, respuesta if es_lote else respuesta[0]
+
+# ------------------ ASGI ------------------ #
+
+def _json(datos) -> bytes:
+    def sin_nan(valor):
+        return None if isinstance(valor, float) and math.isnan(valor) else valor
+
+    if isinstance(datos, list):
+        datos = [{k: sin_nan(v) for k, v in d.items()} for d in datos]
+    elif isinstance(datos, dict):
+        datos = {k: sin_nan(v) for k, v in datos.items()}
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+async def _leer_cuerpo(receive) -> bytes:
+    partes = []
+    largo = 0
+    while True:
+        mensaje = await receive()
+        if mensaje["type"] == "http.disconnect":
+            return b""
+        parte = mensaje.get("body", b"")
+        largo += len(parte)
+        if largo > MAX_CUERPO:
+            raise ErrorPeticion(f"El cuerpo supera {MAX_CUERPO:,} bytes.", 413)
+        partes.append(parte)
+        if not mensaje.get("more_body", False):
+            return b"".join(partes)
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                precios.actual()  # carga y compila las matrices antes de la primera petición
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    try:
+        cuerpo = await _leer_cuerpo(receive)
+        estado, datos = despachar(scope["method"], scope["path"], cuerpo)
+    except ErrorPeticion as exc:
+        estado, datos = exc.estado, {"error": str(exc)}
+    contenido = _json(datos)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": estado,
+            "headers": [
+                (b"content-type", b"application/json; charset=utf-8"),
+                (b"content-length", str(len(contenido)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": contenido})
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP de costos / funnel / cupos.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Procesos del servidor")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError as exc:
+        raise ImportError(
+            "Servir la API requiere uvicorn (pip install uvicorn)."
+        ) from exc
+
+    uvicorn.run(
+        "mdhub.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        access_log=False,
+        log_level="warning",
+    )
+
+if __name__ == "__main__":
+    main()
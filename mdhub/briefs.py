@@ -0,0 +1,349 @@
+"""
+Briefs de campaña en PDF (fpdf2).
+
+Un brief tiene las métricas resumen, la tabla por canal, el uso de cupos y
+el bloque de texto de la Calculadora. En modo batch se genera un brief por
+grupo del plan (por defecto país × segmento × canal): el cálculo se hace
+una vez en el proceso principal con el motor vectorizado y solo el render
+de los PDF se reparte en un pool de procesos.
+
+Se usan las fuentes core del PDF (Helvetica / Courier): no hay archivos de
+fuente que leer ni subconjuntos que embeber por documento, y la plantilla
+de página (anchos de columnas, estilos) se arma una sola vez por proceso.
+Las fuentes core son latin-1, así que el texto se sanea antes de escribir.
+
+Uso por consola:
+    python -m mdhub.briefs plan.csv -o briefs/
+"""
+
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import pandas as pd
+from fpdf import FPDF
+
+from . import cambio, motor, precios
+from .importacion import FORMATOS, TAMANO_CHUNK, AcumuladorPlan, leer_en_chunks
+from .texto import sin_tildes
+
+AGRUPACION = ("pais", "segmento", "canal")
+UMBRAL_PROCESOS = 8  # briefs mínimos para usar el pool
+
+_REEMPLAZOS_LATIN1 = {
+    "→": "->",
+    "–": "-",
+    "—": "-",
+    "…": "...",
+    "“": '"',
+    "”": '"',
+    "‘": "'",
+    "’": "'",
+}
+
+# ------------------ PLANTILLA ------------------ #
+
+@lru_cache(maxsize=1)
+def _plantilla() -> dict:
+    """
+    Geometría y columnas de las tablas, calculadas una vez por proceso.
+    Cada columna: (título, clave, ancho en mm, alineación, formato).
+    """
+    entero = "{:,.0f}".format
+    return {
+        "margen": 12,
+        "alto_fila": 6,
+        "detalle": [
+            ("Segmento", "segmento", 30, "L", str),
+            ("Canal", "canal", 28, "L", str),
+            ("Base", "base", 20, "R", entero),
+            ("Envíos", "envios", 20, "R", entero),
+            ("MQL", "mql", 16, "R", entero),
+            ("SQL", "sql", 16, "R", entero),
+            ("Costo (COP)", "costo_total_cop", 26, "R", entero),
+            ("COP / SQL", "costo_por_sql_cop", 24, "R", entero),
+        ],
+        "cupos": [
+            ("País", "pais", 22, "L", str),
+            ("Periodo", "periodo", 18, "L", str),
+            ("Segmento", "segmento", 28, "L", str),
+            ("Canal", "canal", 22, "L", str),
+            ("Envíos", "envios_campaña", 22, "R", entero),
+            ("Cupo", "cupo_disponible", 22, "R", entero),
+            ("% uso", "%_uso", 16, "R", "{:.1f}".format),
+            ("Restantes", "envios_restantes", 22, "R", entero),
+        ],
+    }
+
+def latin1(texto) -> str:
+    """
+    Texto representable con las fuentes core (latin-1); lo demás se quita.
+    """
+    texto = str(texto)
+    for original, reemplazo in _REEMPLAZOS_LATIN1.items():
+        texto = texto.replace(original, reemplazo)
+    return texto.encode("latin-1", "ignore").decode("latin-1")
+
+def _formatear(valor, formato) -> str:
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return "-"
+    return latin1(formato(valor))
+
+# ------------------ CONTENIDO ------------------ #
+
+def contenido_calculadora(calc: dict, entradas: dict) -> dict:
+    """
+    Contenido del brief para un resultado de calculadora.calcular_campania.
+    """
+    moneda = entradas["moneda_trabajo"]
+    cps = cambio.formatear(calc["cps_calc"], moneda) if calc["total_sql"] > 0 else "N/A"
+    segmentos = " / ".join(dict.fromkeys(r["segmento"] for r in calc["resultados_canales"]))
+    return {
+        "titulo": entradas.get("base_label") or "Campaña",
+        "subtitulo": (
+            f"{entradas['pais']} · {segmentos or entradas['segmento']} · {entradas['periodo_ppto']} · "
+            f"{entradas['tipo_funnel']} · precios {calc.get('version_precios', '')}"
+        ),
+        "metricas": [
+            ("Base total", f"{int(calc['total_base']):,}"),
+            ("SQL totales", f"{int(calc['total_sql']):,}"),
+            ("Costo total", f"{cambio.formatear(calc['costo_total_calc'], moneda)} {moneda}"),
+            ("Costo por SQL", f"{cps} {moneda}"),
+        ],
+        "detalle": calc["resultados_canales"],
+        "cupos": calc["cap_rows"],
+        "texto": calc["output_text"],
+    }
+
+def _texto_grupo(resultado: pd.DataFrame, tot: dict) -> str:
+    lines = []
+    for r in motor.filas_detalle(resultado):
+        lines.append(f"{r['segmento']} – {r['canal']}:")
+        lines.append(f"    i. Base {r['base']} contactos")
+        lines.append(f"    ii. Envíos: {r['envios']} {r['canal'].lower()}")
+        lines.append(f"    iii. MQLs: {r['mql']}")
+        lines.append(f"    iv. SQLs: {r['sql']} -> {r['nota']}")
+        lines.append("")
+    lines.append("Costos:")
+    lines.append(f"SQLs totales: {tot['total_sql']}")
+    lines.append(f"Costo total estimado: {tot['total_costo_cop']:,.0f} COP")
+    lines.append(f"Costo por sql: {tot['costo_por_sql_cop']:,.0f} COP")
+    return "\n".join(lines)
+
+def _consolidar(resultado: pd.DataFrame) -> pd.DataFrame:
+    """
+    Una fila por segmento / canal / nota: un grupo puede traer miles de
+    filas del plan y el brief muestra el agregado.
+    """
+    consolidado = (
+        resultado.groupby(["segmento", "canal", "nota"], sort=True)[
+            ["base", "envios", "mql", "sql", "costo_total_cop"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    sql = consolidado["sql"]
+    consolidado["costo_por_sql_cop"] = (consolidado["costo_total_cop"] / sql).where(sql > 0, 0.0)
+    return consolidado
+
+def contenido_grupo(resultado: pd.DataFrame, titulo: str, config=None) -> dict:
+    """
+    Contenido del brief para un grupo de filas ya calculadas por el motor.
+    """
+    tot = motor.totales(resultado)
+    consolidado = _consolidar(resultado)
+    acumulador = AcumuladorPlan(config)
+    acumulador.agregar(resultado)
+    cps = f"{tot['costo_por_sql_cop']:,.0f}" if tot["total_sql"] > 0 else "N/A"
+    return {
+        "titulo": titulo,
+        "subtitulo": f"{len(resultado):,} fila(s) del plan",
+        "metricas": [
+            ("Base total", f"{tot['total_base']:,}"),
+            ("SQL totales", f"{tot['total_sql']:,}"),
+            ("Costo total", f"{tot['total_costo_cop']:,.0f} COP"),
+            ("Costo por SQL", f"{cps} COP"),
+        ],
+        "detalle": motor.filas_detalle(consolidado),
+        "cupos": acumulador.uso_cupos().to_dict("records"),
+        "texto": _texto_grupo(consolidado, tot),
+    }
+
+# ------------------ RENDER ------------------ #
+
+def _tabla(pdf: FPDF, columnas: list, filas: list, alto: float):
+    pdf.set_font("Helvetica", "B", 8)
+    pdf.set_fill_color(230, 230, 230)
+    for titulo, _, ancho, alineacion, _ in columnas:
+        pdf.cell(ancho, alto, latin1(titulo), border=1, align=alineacion, fill=True)
+    pdf.ln(alto)
+    pdf.set_font("Helvetica", "", 8)
+    for fila in filas:
+        for _, clave, ancho, alineacion, formato in columnas:
+            pdf.cell(ancho, alto, _formatear(fila.get(clave), formato), border=1, align=alineacion)
+        pdf.ln(alto)
+
+def render_pdf(contenido: dict) -> bytes:
+    """
+    PDF de un brief a partir de su contenido (ver contenido_calculadora /
+    contenido_grupo).
+    """
+    plantilla = _plantilla()
+    alto = plantilla["alto_fila"]
+
+    pdf = FPDF(format="A4")
+    pdf.set_margins(plantilla["margen"], plantilla["margen"])
+    pdf.set_auto_page_break(True, plantilla["margen"])
+    pdf.add_page()
+
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, latin1(contenido["titulo"]), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 9)
+    pdf.set_text_color(90, 90, 90)
+    pdf.cell(0, 5, latin1(contenido["subtitulo"]), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(3)
+
+    # Métricas resumen en una fila de recuadros
+    ancho = (pdf.epw - 3 * 2) / 4
+    y = pdf.get_y()
+    for i, (etiqueta, valor) in enumerate(contenido["metricas"]):
+        x = plantilla["margen"] + i * (ancho + 2)
+        pdf.rect(x, y, ancho, 16)
+        pdf.set_xy(x + 2, y + 2)
+        pdf.set_font("Helvetica", "", 8)
+        pdf.cell(ancho - 4, 4, latin1(etiqueta))
+        pdf.set_xy(x + 2, y + 7)
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.cell(ancho - 4, 6, latin1(valor))
+    pdf.set_xy(plantilla["margen"], y + 20)
+
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 7, "Detalle por canal", new_x="LMARGIN", new_y="NEXT")
+    _tabla(pdf, plantilla["detalle"], contenido["detalle"], alto)
+    pdf.ln(3)
+
+    if contenido["cupos"]:
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.cell(0, 7, "Uso de cupos de envíos", new_x="LMARGIN", new_y="NEXT")
+        _tabla(pdf, plantilla["cupos"], contenido["cupos"], alto)
+        pdf.ln(3)
+
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 7, "Output en formato texto", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Courier", "", 8)
+    # Las sangrías largas del formato de la Calculadora no caben en la página
+    texto = re.sub(r"(?m)^ {8,}", "    ", contenido["texto"])
+    pdf.multi_cell(0, 4, latin1(texto))
+
+    return bytes(pdf.output())
+
+# ------------------ BATCH ------------------ #
+
+def nombre_archivo(clave) -> str:
+    partes = clave if isinstance(clave, tuple) else (clave,)
+    texto = "_".join(str(p) for p in partes)
+    return (re.sub(r"[^A-Za-z0-9]+", "_", sin_tildes(texto)).strip("_").lower() or "brief") + ".pdf"
+
+def _nombre_unico(nombre: str, usados: set) -> str:
+    """
+    nombre, o nombre_2, nombre_3… si otro grupo ya lo usa (p. ej. segmentos
+    que solo difieren en mayúsculas o tildes).
+    """
+    base, n = nombre[: -len(".pdf")], 1
+    while nombre in usados:
+        n += 1
+        nombre = f"{base}_{n}.pdf"
+    usados.add(nombre)
+    return nombre
+
+def _render_a_archivo(args) -> str:
+    contenido, ruta = args
+    with open(ruta, "wb") as f:
+        f.write(render_pdf(contenido))
+    return ruta
+
+def generar_briefs(
+    origen,
+    carpeta: str,
+    formato=None,
+    agrupar_por=AGRUPACION,
+    procesos=None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    al_avanzar=None,
+) -> list:
+    """
+    Un brief PDF por grupo del plan en `carpeta`; devuelve las rutas (una
+    por grupo: los nombres que coinciden llevan sufijo _2, _3…).
+
+    procesos: workers del pool (None = os.cpu_count()); con menos de
+    UMBRAL_PROCESOS briefs se renderiza en serie.
+    al_avanzar: callback opcional al_avanzar(hechos, total).
+    """
+    config = precios.actual()
+    resultado = pd.concat(
+        [motor.calcular_canales(chunk, config) for chunk in leer_en_chunks(origen, formato, tamano_chunk)],
+        ignore_index=True,
+    )
+    agrupar_por = list(agrupar_por)
+    desconocidas = [c for c in agrupar_por if c not in resultado.columns]
+    if desconocidas:
+        raise ValueError(f"Columnas de agrupación desconocidas: {', '.join(desconocidas)}")
+    os.makedirs(carpeta, exist_ok=True)
+
+    tareas, usados = [], set()
+    for clave, grupo in resultado.groupby(agrupar_por, sort=True):
+        titulo = " · ".join(str(c) for c in (clave if isinstance(clave, tuple) else (clave,)))
+        nombre = _nombre_unico(nombre_archivo(clave), usados)
+        tareas.append((contenido_grupo(grupo, titulo, config), os.path.join(carpeta, nombre)))
+
+    rutas = []
+    total = len(tareas)
+    if total >= UMBRAL_PROCESOS and (procesos is None or procesos > 1):
+        workers = min(procesos or os.cpu_count() or 1, total)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = [pool.submit(_render_a_archivo, t) for t in tareas]
+            for futuro in as_completed(futuros):
+                rutas.append(futuro.result())
+                if al_avanzar is not None:
+                    al_avanzar(len(rutas), total)
+    else:
+        for tarea in tareas:
+            rutas.append(_render_a_archivo(tarea))
+            if al_avanzar is not None:
+                al_avanzar(len(rutas), total)
+
+    return sorted(rutas)
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Genera un brief PDF por grupo de un plan de campañas (CSV / Parquet)."
+    )
+    parser.add_argument("plan", help="Archivo del plan (.csv o .parquet)")
+    parser.add_argument("-o", "--salida", default="briefs", help="Carpeta de salida")
+    parser.add_argument("--formato", choices=FORMATOS, help="Forzar formato de entrada")
+    parser.add_argument(
+        "--agrupar",
+        default=",".join(AGRUPACION),
+        help="Columnas que definen cada brief, separadas por coma",
+    )
+    parser.add_argument("--procesos", type=int, help="Procesos del pool (default: CPUs)")
+    args = parser.parse_args(argv)
+
+    rutas = generar_briefs(
+        args.plan,
+        args.salida,
+        args.formato,
+        agrupar_por=[c.strip() for c in args.agrupar.split(",") if c.strip()],
+        procesos=args.procesos,
+        al_avanzar=lambda hechos, total: print(f"\rBriefs: {hechos:,} / {total:,}", end="", flush=True),
+    )
+    print()
+    print(f"{len(rutas):,} briefs en {args.salida}")
+
+if __name__ == "__main__":
+    main()
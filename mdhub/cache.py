@@ -0,0 +1,122 @@
+"""
+Caché LRU con TTL para resultados de cálculos.
+
+Streamlit vuelve a ejecutar app.py completo en cada cambio de widget; con
+esta caché los cálculos con las mismas entradas se reutilizan entre reruns
+y entre sesiones del mismo proceso. Las claves son el hash canónico de las
+entradas (JSON con claves ordenadas → SHA-256).
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_ENTRADAS = 512
+TTL_SEGUNDOS = 15 * 60
+
+# ------------------ CLAVES ------------------ #
+
+def _normalizar(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    if hasattr(valor, "to_dict"):
+        return valor.to_dict("list")
+    raise TypeError(f"Valor no serializable para la clave de caché: {type(valor).__name__}")
+
+def clave_canonica(espacio: str, entradas) -> str:
+    """
+    Hash estable de las entradas: el mismo formulario produce la misma clave
+    sin importar el orden de los campos.
+    """
+    texto = json.dumps(
+        [espacio, entradas],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_normalizar,
+    )
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+# ------------------ CACHÉ ------------------ #
+
+class CacheLRU:
+    """
+    Caché LRU acotada con expiración por TTL y contadores de uso.
+    Segura para varios hilos (cada sesión de Streamlit corre en su hilo).
+    """
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS, ttl_segundos: float = TTL_SEGUNDOS):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+        self.desalojados = 0
+
+    def obtener(self, clave: str, default=None):
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return default
+            vence, valor = entrada
+            if vence < ahora:
+                del self._datos[clave]
+                self.expirados += 1
+                self.misses += 1
+                return default
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return valor
+
+    def guardar(self, clave: str, valor):
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojados += 1
+
+    def obtener_o_calcular(self, clave: str, calcular):
+        """
+        Devuelve el valor en caché o lo calcula con calcular() y lo guarda.
+        El cálculo corre fuera del lock para no bloquear otras sesiones.
+        """
+        faltante = object()
+        valor = self.obtener(clave, faltante)
+        if valor is faltante:
+            valor = calcular()
+            self.guardar(clave, valor)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / consultas if consultas else 0.0,
+                "expirados": self.expirados,
+                "desalojados": self.desalojados,
+            }
+
+# Caché compartida por todas las sesiones del proceso
+CACHE_CALCULOS = CacheLRU()
@@ -0,0 +1,246 @@
+"""
+Cálculo completo de una campaña de la Calculadora (sin Streamlit).
+
+Recibe las mismas entradas que el formulario y devuelve todo lo que la
+página muestra: detalle por canal, totales, tabla de cupos y el output en
+formato texto.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from . import cambio, motor, precios
+from .cache import CACHE_CALCULOS, clave_canonica
+from .costos import _canal_to_budget_key, _segmento_to_budget_key, cupos_envios_vectorizado
+
+# ------------------ VALIDACIÓN ------------------ #
+
+def _positivo(valor) -> bool:
+    try:
+        return math.isfinite(float(valor)) and float(valor) > 0
+    except (TypeError, ValueError):
+        return False
+
+def validar_entradas(canales: list, num_envios_contacto, tipo_cambio, config) -> None:
+    """
+    ValueError si la campaña no se puede calcular: sin líneas, un canal que
+    no está en la config, base o envíos por contacto <= 0, o tasa de cambio
+    <= 0. En la página lo garantizan los widgets; en la CLI no.
+    """
+    if not canales:
+        raise ValueError("La campaña necesita al menos una línea en 'canales'.")
+    for n, linea in enumerate(canales, start=1):
+        canal = linea.get("canal")
+        if canal not in config.channels:
+            raise ValueError(
+                f"Línea {n}: canal desconocido {canal!r} (válidos: {', '.join(config.channels)})."
+            )
+        if not _positivo(linea.get("base")):
+            raise ValueError(f"Línea {n} ({canal}): la base debe ser mayor a 0.")
+    if not _positivo(num_envios_contacto):
+        raise ValueError("Los envíos por contacto deben ser mayores a 0.")
+    if not _positivo(tipo_cambio):
+        raise ValueError("La tasa de cambio debe ser mayor a 0.")
+
+# ------------------ CÁLCULO ------------------ #
+
+def calcular_campania(
+    canales: list,
+    moneda_trabajo: str,
+    tipo_cambio: float,
+    pais: str,
+    proveedor_sms: str,
+    periodo_ppto: str,
+    segmento: str,
+    tipo_funnel: str,
+    num_envios_contacto: float,
+    budget_input: float = 0.0,
+    base_label: str = "",
+    version_precios: str = None,
+) -> dict:
+    """
+    canales: lista de líneas {"canal", "tasa_mql", "tasa_sql", "base"} con
+    base > 0, de cualquier largo. Cada línea puede traer "proveedor_sms" y
+    "segmento" propios; vacíos usan los de la campaña.
+    version_precios: versión publicada de precios / cupos con la que se
+    calcula (None = la vigente); sirve para reproducir estimaciones pasadas.
+    Lanza ValueError si las entradas no son válidas (validar_entradas).
+    """
+    config = precios.version(version_precios) if version_precios else precios.actual()
+    validar_entradas(canales, num_envios_contacto, tipo_cambio, config)
+
+    # ------------------ CÁLCULO POR CANAL ------------------ #
+    plan = pd.DataFrame(canales)
+    plan["pais"] = pais
+    for col, valor in (("proveedor_sms", proveedor_sms), ("segmento", segmento)):
+        if col in plan.columns:
+            plan[col] = plan[col].replace("", None).fillna(valor)
+        else:
+            plan[col] = valor
+    plan["periodo"] = periodo_ppto
+    plan["tipo_funnel"] = tipo_funnel
+    plan["envios_contacto"] = float(num_envios_contacto)
+    plan["tipo_cambio"] = float(tipo_cambio)
+
+    resultado = motor.calcular_canales(plan, config)
+    resultados_canales = motor.filas_detalle(resultado)
+    tot = motor.totales(resultado)
+
+    total_base = tot["total_base"]
+    total_sql = tot["total_sql"]
+    total_costo_cop = tot["total_costo_cop"]
+    cps_calc_cop = tot["costo_por_sql_cop"]
+
+    # Costos en moneda de trabajo (totales)
+    costo_total_calc = cambio.desde_cop(total_costo_cop, moneda_trabajo, tipo_cambio)
+    cps_calc = cambio.desde_cop(cps_calc_cop, moneda_trabajo, tipo_cambio)
+
+    # Budget opcional convertido a COP
+    if budget_input and budget_input > 0:
+        budget_cop = cambio.a_cop(budget_input, moneda_trabajo, tipo_cambio)
+    else:
+        budget_cop = 0.0
+
+    cps_budget = None
+    if budget_cop > 0 and total_sql > 0:
+        cps_budget = cambio.desde_cop(budget_cop / total_sql, moneda_trabajo, tipo_cambio)
+
+    # ------------------ USO DE CUPOS VS PPTOS ------------------ #
+    # Las líneas con la misma clave de BUDGET_ENVIOS comparten cupo (p. ej.
+    # Aliados y Contadores): se suman sus envíos. Las líneas sin clave se
+    # agrupan por su nombre. Si un grupo mezcla nombres se muestra la clave.
+    detalle = pd.DataFrame(resultados_canales)
+    seg_key = detalle["segmento"].map(_segmento_to_budget_key)
+    canal_key = detalle["canal"].map(_canal_to_budget_key)
+    con_clave = seg_key.notna() & canal_key.notna()
+    detalle["grupo_segmento"] = seg_key.where(con_clave, detalle["segmento"])
+    detalle["grupo_canal"] = canal_key.where(con_clave, detalle["canal"])
+    uso = detalle.groupby(["grupo_segmento", "grupo_canal"], sort=False, as_index=False).agg(
+        segmento=("segmento", "first"),
+        segmentos=("segmento", "nunique"),
+        canal=("canal", "first"),
+        canales=("canal", "nunique"),
+        envios=("envios", "sum"),
+    )
+    uso["segmento"] = uso["segmento"].where(uso["segmentos"] == 1, uso["grupo_segmento"])
+    uso["canal"] = uso["canal"].where(uso["canales"] == 1, uso["grupo_canal"])
+    cupos = cupos_envios_vectorizado(
+        pais, periodo_ppto, uso["segmento"].to_numpy(), uso["canal"].to_numpy(), config
+    )
+    envios = uso["envios"].to_numpy()
+    con_cupo = ~np.isnan(cupos)
+    cupos_int = np.where(con_cupo, cupos, 0).astype("int64")
+    pct = np.divide(envios, cupos_int, out=np.zeros(len(uso)), where=cupos_int > 0) * 100.0
+    restantes = np.maximum(cupos_int - envios, 0)
+
+    cap_rows = []
+    alertas_cupo = []
+    for n, (seg, canal, envios_campania) in enumerate(
+        zip(uso["segmento"].tolist(), uso["canal"].tolist(), envios.tolist())
+    ):
+        tiene_cupo = bool(con_cupo[n])
+        cap_max = int(cupos_int[n]) if tiene_cupo else None
+        cap_rows.append(
+            {
+                "pais": pais,
+                "periodo": periodo_ppto,
+                "segmento": seg,
+                "canal": canal,
+                "envios_campaña": envios_campania,
+                "cupo_disponible": cap_max,
+                "%_uso": round(float(pct[n]), 1) if tiene_cupo else None,
+                "envios_restantes": int(restantes[n]) if tiene_cupo else None,
+            }
+        )
+        if tiene_cupo and envios_campania > cap_max:
+            alertas_cupo.append(
+                f"⚠ El canal {canal} en {pais} ({seg}, {periodo_ppto}) "
+                f"supera el cupo de {cap_max:,} envíos (campaña: {envios_campania:,})."
+            )
+
+    # ------------------ OUTPUT FORMATO TEXTO ------------------ #
+    # Budget que mostramos en el texto: si el usuario ingresó uno, ese; si no, el calculado
+    if budget_input and budget_input > 0:
+        budget_out = budget_input
+    else:
+        budget_out = costo_total_calc
+
+    # El output en texto conserva su formato (USD sin separador de miles)
+    if moneda_trabajo == "COP":
+        budget_str = f"{budget_out:,.0f}"
+        costo_total_calc_str = f"{costo_total_calc:,.0f}"
+        cps_calc_str = f"{cps_calc:,.0f}"
+        cps_budget_str = f"{cps_budget:,.0f}" if cps_budget is not None else None
+    else:
+        budget_str = f"{budget_out:.2f}"
+        costo_total_calc_str = f"{costo_total_calc:.2f}"
+        cps_calc_str = f"{cps_calc:.2f}"
+        cps_budget_str = f"{cps_budget:.2f}" if cps_budget is not None else None
+
+    canales_nombres = ", ".join(sorted({r["canal"] for r in resultados_canales}))
+
+    lines = []
+    lines.append(f"Base: {base_label}")
+    lines.append(f"Cantidad: {int(total_base):,}")
+    lines.append(f"Canales: {canales_nombres}")
+    lines.append(f"Cantidad de envíos: {num_envios_contacto:.0f} envío(s)")
+    lines.append(f"Budget: {budget_str} {moneda_trabajo}")
+    lines.append("Funnel * validado por segmentos sin nuestro ok")
+
+    for r in resultados_canales:
+        lines.append(f"{r['segmento']} – {r['canal']}:")
+        lines.append(
+            f"                                                              i.      Base {int(r['base'])} contactos"
+        )
+        lines.append(
+            f"                                                            ii.      Envíos: {int(r['envios'])} {r['canal'].lower()}"
+        )
+        lines.append(
+            f"                                                          iii.      MQLs: {int(r['mql'])}"
+        )
+        lines.append(
+            f"                                                           iv.      SQLs: {int(r['sql'])} -> {r['nota']}"
+        )
+        lines.append("")
+
+    lines.append("Costos:")
+    lines.append(f"SQLs totales: {int(total_sql)}")
+    lines.append(
+        f"Costo total estimado: {costo_total_calc_str} {moneda_trabajo} (~{total_costo_cop:,.0f} COP)"
+    )
+    lines.append(f"Costo por sql: {cps_calc_str} {moneda_trabajo}")
+    if cps_budget_str is not None:
+        lines.append(
+            f"Costo por sql (según budget {budget_str} {moneda_trabajo}): {cps_budget_str} {moneda_trabajo}"
+        )
+
+    return {
+        "resultado": resultado,
+        "resultados_canales": resultados_canales,
+        "total_base": total_base,
+        "total_sql": total_sql,
+        "total_costo_cop": total_costo_cop,
+        "costo_total_calc": costo_total_calc,
+        "cps_calc": cps_calc,
+        "cps_budget": cps_budget,
+        "cap_rows": cap_rows,
+        "alertas_cupo": alertas_cupo,
+        "output_text": "\n".join(lines),
+        "version_precios": config.version,
+    }
+
+def calcular_campania_cacheado(entradas: dict) -> dict:
+    """
+    calcular_campania con caché LRU compartida entre sesiones, usando como
+    clave el hash canónico de las entradas del formulario y la versión de
+    precios (un cambio de precios no sirve resultados viejos). El resultado
+    es compartido: no se debe modificar.
+    """
+    entradas = dict(entradas)
+    entradas.setdefault("version_precios", None)
+    if not entradas["version_precios"]:
+        entradas["version_precios"] = precios.actual().version
+    clave = clave_canonica("calculadora", entradas)
+    return CACHE_CALCULOS.obtener_o_calcular(clave, lambda: calcular_campania(**entradas))
@@ -0,0 +1,350 @@
+"""
+Calendario de envíos (pacing) bajo cupos y límites de proveedores (sin Streamlit).
+
+La Calculadora dice cuántos envíos hace una campaña, no cuándo. Este
+módulo reparte los envíos de cada línea de un plan (mismas columnas que un
+plan masivo: país, segmento, canal, proveedor, base y envíos por contacto)
+en buckets de un día o de una hora durante uno o más meses, respetando:
+
+- los cupos de BUDGET_ENVIOS: el mensual de cada mes y el anual, menos lo
+  ya reservado en cupos.py, compartidos por las líneas con la misma clave
+  de cupo (país / segmento / canal);
+- el throughput de cada canal / proveedor (mensajes por segundo dentro
+  del horario de envío), compartido por todas las líneas que lo usan;
+- un envío por contacto y por día, así los "envíos por contacto" caen en
+  días distintos.
+
+Todo vive en arreglos líneas × buckets. La asignación se hace mes a mes
+(un loop corto, vectorizado sobre las líneas): cada línea pide lo que le
+falta repartido en partes iguales entre los buckets activos que quedan,
+cada restricción escala la demanda de su grupo y lo que no entra pasa al
+mes siguiente. Dentro del mes los envíos se reparten en proporción a los
+segundos de envío de cada bucket, redondeando con el floor de la suma
+acumulada: cada línea suma exactamente lo asignado y ningún bucket supera
+el límite, porque la capacidad por bucket descuenta una unidad por línea
+del grupo (lo máximo que agrega el redondeo).
+
+Uso por consola:
+    python -m mdhub.calendario plan.csv --inicio 2026-01-01 --meses 12 -o calendario.csv
+"""
+
+import argparse
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from . import cupos, precios
+from .costos import (
+    _canal_to_budget_key,
+    _segmento_to_budget_key,
+    get_budget_envios_max,
+    resolver_canal,
+)
+from .importacion import leer_en_chunks
+from .motor import normalizar_plan
+from .precios import Canal
+
+GRANULARIDADES = {"dia": "datetime64[D]", "hora": "datetime64[h]"}
+HORARIO_DEFAULT = (8, 20)  # [desde, hasta) en horas
+DIAS_HABILES = (0, 1, 2, 3, 4)  # lunes a viernes
+TODOS_LOS_DIAS = tuple(range(7))
+
+# Mensajes por segundo por (canal, proveedor SMS; "" fuera de SMS). Son
+# valores de referencia: ajustarlos a lo contratado con cada proveedor.
+LIMITES_MPS = {
+    ("WhatsApp", ""): 80.0,
+    ("SMS", "Masive"): 50.0,
+    ("SMS", "Nua"): 50.0,
+    ("Email", ""): 100.0,
+    ("Call Blasting", ""): 10.0,
+}
+
+RESTRICCIONES = ("envíos por contacto", "cupo mensual", "cupo anual", "throughput")
+
+COLUMNAS_LINEA = ["pais", "segmento", "canal", "proveedor_sms", "base", "envios_contacto"]
+
+# ------------------ BUCKETS ------------------ #
+
+def buckets(
+    inicio,
+    meses: int = 1,
+    granularidad: str = "dia",
+    horario=HORARIO_DEFAULT,
+    dias_semana=DIAS_HABILES,
+) -> dict:
+    """
+    Grilla de tiempo desde `inicio` hasta el fin del mes `meses` - 1 después:
+    inicio de cada bucket, su mes, su día y sus segundos de envío (0 fuera
+    del horario o de los días de envío; 0 = lunes en dias_semana).
+    """
+    if granularidad not in GRANULARIDADES:
+        raise ValueError(f"Granularidad inválida: {granularidad} (válidas: {list(GRANULARIDADES)})")
+    hora_desde, hora_hasta = (int(h) for h in horario)
+    if not 0 <= hora_desde < hora_hasta <= 24:
+        raise ValueError(f"Horario inválido: {horario} (se espera 0 <= desde < hasta <= 24)")
+    if meses < 1:
+        raise ValueError("El calendario debe cubrir al menos un mes.")
+    if not set(dias_semana) & set(TODOS_LOS_DIAS):
+        raise ValueError("Se necesita al menos un día de envío en la semana.")
+
+    desde = np.datetime64(pd.Timestamp(inicio).date(), "D")
+    fin = (desde.astype("datetime64[M]") + int(meses)).astype("datetime64[D]")
+    tipo = GRANULARIDADES[granularidad]
+    inicios = np.arange(desde.astype(tipo), fin.astype(tipo))
+    dias = inicios.astype("datetime64[D]")
+    # 1970-01-01 fue jueves (3 con lunes = 0)
+    habil = np.isin((dias.astype("int64") + 3) % 7, list(dias_semana))
+    if granularidad == "dia":
+        segundos = np.where(habil, (hora_desde - hora_hasta) * -3600, 0)
+    else:
+        hora = (inicios - dias.astype(tipo)).astype("int64")
+        segundos = np.where(habil & (hora >= hora_desde) & (hora < hora_hasta), 3600, 0)
+    return {
+        "inicio": inicios,
+        "mes": inicios.astype("datetime64[M]"),
+        "dia": dias,
+        "segundos": segundos.astype("int64"),
+    }
+
+# ------------------ GRUPOS ------------------ #
+
+def _grupos(claves) -> tuple:
+    """
+    (índice de grupo por línea, claves distintas); las claves None quedan en -1.
+    """
+    distintas = list(dict.fromkeys(c for c in claves if c is not None))
+    posicion = {c: i for i, c in enumerate(distintas)}
+    return np.array([posicion.get(c, -1) for c in claves], dtype="int64"), distintas
+
+def _factor_grupo(grupo, demanda, disponible) -> np.ndarray:
+    """
+    Factor (<= 1) de cada línea para que la demanda de su grupo no supere
+    lo disponible; 1 para las líneas sin grupo.
+    """
+    factor = np.ones(len(demanda))
+    con_grupo = grupo >= 0
+    if not con_grupo.any():
+        return factor
+    total = np.bincount(grupo[con_grupo], weights=demanda[con_grupo], minlength=len(disponible))
+    por_grupo = np.divide(
+        disponible, total, out=np.ones(len(disponible)), where=total > disponible
+    )
+    factor[con_grupo] = np.minimum(por_grupo[grupo[con_grupo]], 1.0)
+    return factor
+
+# ------------------ CALENDARIO ------------------ #
+
+def calendario_envios(
+    plan: pd.DataFrame,
+    inicio,
+    meses: int = 1,
+    granularidad: str = "dia",
+    horario=HORARIO_DEFAULT,
+    dias_semana=DIAS_HABILES,
+    limites_mps=None,
+    descontar_reservas: bool = True,
+    config=None,
+    conn=None,
+) -> tuple:
+    """
+    Reparte los envíos del plan (base × envíos por contacto, truncado) en el
+    calendario. Devuelve (calendario, lineas):
+    - calendario: DataFrame buckets × líneas con los envíos de cada bucket
+      (índice = inicio del bucket, columnas = índice de la línea en `lineas`);
+    - lineas: el plan con envios (pedidos), programados, pendientes,
+      primer_envio, ultimo_envio, max_por_bucket, limite_bucket (mensajes
+      del proveedor por bucket) y limitado_por (restricciones que recortaron
+      la línea en algún mes).
+
+    limites_mps: {(canal, proveedor): mensajes por segundo} sobre LIMITES_MPS
+    (None = sin límite). Los envíos que no entran en el horizonte quedan en
+    `pendientes`. Las líneas sin país o canal, o con base <= 0 (p. ej. filas
+    vacías de un editor), se descartan; cuántas queda en
+    lineas.attrs["descartadas"].
+    config: snapshot de precios (None = precios.actual()).
+    """
+    config = config or precios.actual()
+    validas = pd.Series(True, index=plan.index)
+    for col in ("pais", "canal"):
+        if col in plan.columns:
+            texto = plan[col].astype("string").str.strip()
+            validas &= texto.notna() & (texto != "")
+    if "base" in plan.columns:
+        validas &= pd.to_numeric(plan["base"], errors="coerce").fillna(0) > 0
+    lineas = normalizar_plan(plan[validas], config)[COLUMNAS_LINEA].reset_index(drop=True)
+    lineas.attrs["descartadas"] = int((~validas).sum())
+    grilla = buckets(inicio, meses, granularidad, horario, dias_semana)
+    segundos = grilla["segundos"]
+    activo = segundos > 0
+    n, n_buckets = len(lineas), len(segundos)
+
+    meses_cal, i_mes = np.unique(grilla["mes"], return_inverse=True)
+    n_meses = len(meses_cal)
+    activos_mes = np.bincount(i_mes, weights=activo, minlength=n_meses)
+    segundos_mes = np.bincount(i_mes, weights=segundos, minlength=n_meses)
+    dias_activos = np.unique(grilla["dia"][activo])
+    dias_mes = np.bincount(
+        np.searchsorted(meses_cal, dias_activos.astype("datetime64[M]")), minlength=n_meses
+    )
+    anios, i_anio = np.unique(meses_cal.astype("datetime64[Y]"), return_inverse=True)
+
+    base = lineas["base"].to_numpy(dtype="float64")
+    pedidos = np.floor(base * lineas["envios_contacto"].to_numpy(dtype="float64"))
+    canales = lineas["canal"].to_numpy()
+    es_sms = np.array([resolver_canal(c, config)[0] == Canal.SMS for c in canales], dtype=bool)
+    lineas["proveedor_sms"] = np.where(es_sms, lineas["proveedor_sms"].to_numpy(), "")
+
+    # Cupos: una clave por país / segmento / canal de BUDGET_ENVIOS
+    claves_cupo = [
+        (p, _segmento_to_budget_key(s), _canal_to_budget_key(c))
+        if _segmento_to_budget_key(s) and _canal_to_budget_key(c)
+        else None
+        for p, s, c in zip(lineas["pais"], lineas["segmento"], canales)
+    ]
+    grupo_cupo, distintas = _grupos(claves_cupo)
+    representante = [int(np.flatnonzero(grupo_cupo == g)[0]) for g in range(len(distintas))]
+    cupo_mes = np.full((len(distintas), n_meses), np.inf)
+    cupo_anio = np.full((len(distintas), len(anios)), np.inf)
+    for g, i in enumerate(representante):
+        pais, segmento, canal = lineas.loc[i, ["pais", "segmento", "canal"]]
+        for periodo, cupo, fechas in (
+            ("Mensual", cupo_mes, meses_cal),
+            ("Anual", cupo_anio, anios),
+        ):
+            maximo = get_budget_envios_max(pais, periodo, segmento, canal, config)
+            if maximo is None:
+                continue
+            for j, fecha in enumerate(fechas):
+                reservado = 0
+                if descontar_reservas:
+                    fecha = pd.Timestamp(fecha).date()
+                    reservado = cupos.consumido(
+                        cupos.clave(pais, periodo, segmento, canal, fecha), conn
+                    )
+                cupo[g, j] = max(maximo - reservado, 0)
+
+    # Throughput: un grupo por canal / proveedor
+    limites = dict(LIMITES_MPS)
+    limites.update(limites_mps or {})
+    claves_prov = list(zip(canales, lineas["proveedor_sms"]))
+    grupo_prov, proveedores = _grupos(claves_prov)
+    mps = np.array(
+        [np.inf if limites.get(k) is None else float(limites[k]) for k in proveedores]
+    )
+    lineas_prov = np.bincount(grupo_prov, minlength=len(proveedores))
+    segundos_bucket = segundos.max(initial=0)
+    limite_bucket = np.where(np.isinf(mps), np.inf, np.floor(np.minimum(mps, 1e15) * segundos_bucket))
+    capacidad_bucket = np.maximum(limite_bucket - lineas_prov, 0)
+
+    # Asignación mes a mes
+    asignado = np.zeros((n, n_meses))
+    limitado = np.zeros((n, len(RESTRICCIONES)), dtype=bool)
+    pendiente = pedidos.copy()
+    activos_restantes = activos_mes[::-1].cumsum()[::-1]
+    for m in range(n_meses):
+        if activos_mes[m] == 0:
+            continue
+        demanda = pendiente * activos_mes[m] / activos_restantes[m]
+        for r, (grupo, disponible) in enumerate(
+            (
+                (np.arange(n), base * dias_mes[m]),
+                (grupo_cupo, cupo_mes[:, m]),
+                (grupo_cupo, cupo_anio[:, i_anio[m]]),
+                (grupo_prov, capacidad_bucket * activos_mes[m]),
+            )
+        ):
+            factor = _factor_grupo(grupo, demanda, disponible)
+            limitado[:, r] |= factor < 1.0
+            demanda = demanda * factor
+        asignado[:, m] = np.floor(demanda + 1e-9)
+        pendiente -= asignado[:, m]
+        if len(distintas):
+            con_grupo = grupo_cupo >= 0
+            cupo_anio[:, i_anio[m]] -= np.bincount(
+                grupo_cupo[con_grupo], weights=asignado[con_grupo, m], minlength=len(distintas)
+            )
+
+    # Reparto dentro del mes: floor de la suma acumulada (peso = segundos)
+    acumulado_mes = np.cumsum(segundos) - np.concatenate(([0], np.cumsum(segundos_mes)[:-1]))[i_mes]
+    peso = np.divide(
+        acumulado_mes, segundos_mes[i_mes], out=np.zeros(n_buckets), where=segundos_mes[i_mes] > 0
+    )
+    previos = np.cumsum(asignado, axis=1) - asignado
+    acumulado = previos[:, i_mes] + np.floor(asignado[:, i_mes] * peso)
+    envios = np.diff(acumulado, axis=1, prepend=0.0).astype("int64")
+
+    calendario = pd.DataFrame(
+        envios.T, index=pd.DatetimeIndex(grilla["inicio"], name="inicio"), columns=lineas.index
+    )
+
+    programados = envios.sum(axis=1)
+    con_envios = envios > 0
+    primero = np.where(con_envios.any(axis=1), con_envios.argmax(axis=1), -1)
+    ultimo = np.where(
+        con_envios.any(axis=1), n_buckets - 1 - con_envios[:, ::-1].argmax(axis=1), -1
+    )
+    inicios = pd.DatetimeIndex(grilla["inicio"])
+    lineas["envios"] = pedidos.astype("int64")
+    lineas["programados"] = programados
+    lineas["pendientes"] = (pedidos - programados).astype("int64")
+    lineas["primer_envio"] = inicios[np.maximum(primero, 0)].where(primero >= 0)
+    lineas["ultimo_envio"] = inicios[np.maximum(ultimo, 0)].where(ultimo >= 0)
+    lineas["max_por_bucket"] = envios.max(axis=1, initial=0)
+    # NaN = proveedor sin límite
+    limite_linea = limite_bucket[grupo_prov]
+    lineas["limite_bucket"] = np.where(np.isinf(limite_linea), np.nan, limite_linea)
+    lineas["limitado_por"] = [
+        ", ".join(r for r, f in zip(RESTRICCIONES, fila) if f) for fila in limitado
+    ]
+    return calendario, lineas
+
+def calendario_largo(calendario: pd.DataFrame, lineas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Formato largo (una fila por bucket y línea con envíos) para exportar.
+    """
+    envios = calendario.to_numpy()
+    i_bucket, i_linea = np.nonzero(envios)
+    detalle = lineas[["pais", "segmento", "canal", "proveedor_sms"]].to_numpy()[i_linea]
+    largo = pd.DataFrame(detalle, columns=["pais", "segmento", "canal", "proveedor_sms"])
+    largo.insert(0, "inicio", calendario.index[i_bucket])
+    largo.insert(1, "linea", calendario.columns[i_linea])
+    largo["envios"] = envios[i_bucket, i_linea]
+    return largo
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calendario de envíos de un plan bajo cupos y límites de proveedores."
+    )
+    parser.add_argument("plan", help="Plan (.csv o .parquet, mismas columnas que un plan masivo)")
+    parser.add_argument("-o", "--salida", help="CSV con el calendario en formato largo")
+    parser.add_argument("--formato", choices=["csv", "parquet"], help="Forzar formato")
+    parser.add_argument("--inicio", default=dt.date.today().isoformat(), help="Fecha de inicio")
+    parser.add_argument("--meses", type=int, default=1, help="Meses del calendario")
+    parser.add_argument("--granularidad", choices=list(GRANULARIDADES), default="dia")
+    parser.add_argument(
+        "--horario", default=f"{HORARIO_DEFAULT[0]}-{HORARIO_DEFAULT[1]}", help="Horas de envío (desde-hasta)"
+    )
+    parser.add_argument("--todos-los-dias", action="store_true", help="Enviar también fines de semana")
+    parser.add_argument("--sin-reservas", action="store_true", help="No descontar las reservas de cupos")
+    args = parser.parse_args(argv)
+
+    plan = pd.concat(list(leer_en_chunks(args.plan, args.formato)), ignore_index=True)
+    calendario, lineas = calendario_envios(
+        plan,
+        args.inicio,
+        args.meses,
+        args.granularidad,
+        horario=tuple(int(h) for h in args.horario.split("-")),
+        dias_semana=TODOS_LOS_DIAS if args.todos_los_dias else DIAS_HABILES,
+        descontar_reservas=not args.sin_reservas,
+    )
+    print(lineas.to_string())
+    if args.salida:
+        calendario_largo(calendario, lineas).to_csv(args.salida, index=False)
+        print(f"Calendario: {args.salida}")
+
+if __name__ == "__main__":
+    main()
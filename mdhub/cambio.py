@@ -0,0 +1,177 @@
+"""
+Tasa de cambio USD → COP por fecha y conversión de montos (sin Streamlit).
+
+El historial vive en config/tasas_cambio.csv (o la ruta de MDHUB_FX), CSV o
+Parquet con columnas fecha (YYYY-MM-DD) y usd_cop, una fila por día
+publicado. Se carga una vez en dos arreglos ordenados (fechas
+datetime64[D] y tasas) y se recarga si cambia el archivo. Las búsquedas
+son con searchsorted sobre todas las fechas a la vez: cada fecha toma la
+última tasa publicada ese día o antes (fines de semana y festivos usan la
+del día hábil anterior) y las fechas anteriores al historial toman la
+primera. Sin archivo, todas las búsquedas dan TIPO_CAMBIO_DEFAULT.
+
+También centraliza la conversión entre COP y la moneda de trabajo
+(`a_cop`, `desde_cop`, escalares o arreglos) y el formato de montos.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_DEFAULT = os.path.join(_RAIZ, "config", "tasas_cambio.csv")
+
+TIPO_CAMBIO_DEFAULT = 4000.0
+DECIMALES = {"COP": 0, "USD": 2}
+
+# ------------------ TABLA POR FECHA ------------------ #
+
+@dataclass(frozen=True)
+class TablaFX:
+    """
+    Tasas USD → COP ordenadas por fecha, sin fechas repetidas.
+    """
+
+    fechas: np.ndarray  # datetime64[D]
+    tasas: np.ndarray  # float64
+    ruta: str = None
+
+    def __len__(self) -> int:
+        return len(self.fechas)
+
+    def tasas_en(self, fechas) -> np.ndarray:
+        """
+        Tasa vigente en cada fecha (arreglo, Series o lista; NaT y fechas que
+        no se pueden leer → la última tasa). Una sola búsqueda binaria
+        vectorizada.
+        """
+        try:
+            # Fechas ISO, datetime64 y None (NaT) sin pasar por pandas
+            dias = np.asarray(fechas, dtype="datetime64[D]").ravel()
+        except (TypeError, ValueError):
+            dias = pd.to_datetime(np.asarray(fechas).ravel(), errors="coerce").to_numpy(
+                dtype="datetime64[D]"
+            )
+        if not len(self):
+            return np.full(len(dias), TIPO_CAMBIO_DEFAULT)
+        posicion = np.searchsorted(self.fechas, dias, side="right") - 1
+        posicion = np.where(np.isnat(dias), len(self) - 1, np.maximum(posicion, 0))
+        return self.tasas[posicion]
+
+    def tasa_en(self, fecha) -> float:
+        return float(self.tasas_en([fecha])[0])
+
+    def vigente(self) -> tuple:
+        """
+        (fecha, tasa) de la última tasa publicada; (None, default) sin historial.
+        """
+        if not len(self):
+            return None, TIPO_CAMBIO_DEFAULT
+        return pd.Timestamp(self.fechas[-1]).date(), float(self.tasas[-1])
+
+def leer_tabla(origen, formato=None) -> TablaFX:
+    """
+    Lee un historial de tasas (ruta o file-like). Descarta filas sin fecha
+    o con tasa <= 0; si una fecha se repite queda la última fila. Un archivo
+    sin ninguna fila válida es un error (ValueError).
+    """
+    from .importacion import leer_en_chunks
+
+    df = pd.concat(list(leer_en_chunks(origen, formato, columnas=["fecha", "usd_cop"])))
+    fechas = pd.to_datetime(df["fecha"], errors="coerce")
+    tasas = pd.to_numeric(df["usd_cop"], errors="coerce")
+    validas = fechas.notna() & (tasas > 0)
+    if not validas.any():
+        raise ValueError("no tiene filas válidas (fecha y usd_cop > 0)")
+    serie = (
+        pd.Series(tasas[validas].to_numpy(dtype="float64"), index=fechas[validas].dt.normalize())
+        .groupby(level=0)
+        .last()
+    )
+    ruta = origen if isinstance(origen, (str, os.PathLike)) else getattr(origen, "name", None)
+    return TablaFX(serie.index.to_numpy(dtype="datetime64[D]"), serie.to_numpy(), ruta)
+
+TABLA_VACIA = TablaFX(np.array([], dtype="datetime64[D]"), np.array([], dtype="float64"))
+
+_estado = {"firma": None, "tabla": TABLA_VACIA, "error": None}
+_lock = threading.Lock()
+
+def ruta_tabla() -> str:
+    return os.environ.get("MDHUB_FX", RUTA_DEFAULT)
+
+def tabla() -> TablaFX:
+    """
+    Historial vigente; se relee solo si cambió el archivo (mtime / tamaño).
+    Si el archivo no existe se usa la tabla vacía; si existe pero no es
+    válido (columnas, formato o ninguna fila válida) también, y el error
+    queda en error_tabla().
+    """
+    ruta = ruta_tabla()
+    try:
+        stat = os.stat(ruta)
+        firma = (ruta, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        firma = (ruta, None, None)
+    if firma == _estado["firma"]:
+        return _estado["tabla"]
+
+    with _lock:
+        if firma != _estado["firma"]:
+            tabla_nueva, error = TABLA_VACIA, None
+            if firma[1] is not None:
+                try:
+                    tabla_nueva = leer_tabla(ruta)
+                except (ValueError, KeyError, OSError, ImportError) as exc:
+                    error = f"{ruta}: {exc}"
+            _estado.update(firma=firma, tabla=tabla_nueva, error=error)
+    return _estado["tabla"]
+
+def error_tabla():
+    """
+    Error de la última lectura del archivo de tasas (None si no hubo).
+    """
+    tabla()
+    return _estado["error"]
+
+def tasas_en(fechas) -> np.ndarray:
+    return tabla().tasas_en(fechas)
+
+def tasa_vigente() -> tuple:
+    return tabla().vigente()
+
+# ------------------ CONVERSIÓN ------------------ #
+
+def _salida(valor):
+    return float(valor) if np.ndim(valor) == 0 else valor
+
+def a_cop(valor, moneda: str, fx):
+    """
+    Monto en la moneda de trabajo → COP. valor y fx pueden ser arreglos.
+    """
+    valor = np.asarray(valor, dtype="float64")
+    if moneda != "USD":
+        return _salida(valor)
+    return _salida(valor * np.asarray(fx, dtype="float64"))
+
+def desde_cop(valor_cop, moneda: str, fx):
+    """
+    Monto en COP → moneda de trabajo (0 si la tasa no es positiva).
+    """
+    valor_cop = np.asarray(valor_cop, dtype="float64")
+    if moneda != "USD":
+        return _salida(valor_cop)
+    fx = np.asarray(fx, dtype="float64")
+    return _salida(np.divide(valor_cop, fx, out=np.zeros(np.broadcast(valor_cop, fx).shape), where=fx > 0))
+
+def formatear(valor: float, moneda: str, decimales: int = None) -> str:
+    """
+    Monto con separador de miles: COP sin decimales, USD con 2 (o `decimales`).
+    """
+    if moneda == "COP":
+        decimales = 0
+    elif decimales is None:
+        decimales = DECIMALES.get(moneda, 2)
+    return f"{valor:,.{decimales}f}"
@@ -0,0 +1,17 @@
+"""
+Configuración estática que no depende de precios.
+
+Canales, costos por país y cupos de envíos viven en config/precios.json
+(ver precios.py).
+"""
+
+# ------------------ TELÉFONOS POR PAÍS ------------------ #
+
+# Indicativo internacional y largo del número nacional (sin 0 de marcación)
+TELEFONO_PAISES = {
+    "Colombia": {"indicativo": "57", "largo": 10},
+    "México": {"indicativo": "52", "largo": 10},
+    "Ecuador": {"indicativo": "593", "largo": 9},
+    "Uruguay": {"indicativo": "598", "largo": 8},
+    "Chile": {"indicativo": "56", "largo": 9},
+}
@@ -0,0 +1,223 @@
+"""
+Normalización y deduplicación de bases de contactos por streaming.
+
+Los teléfonos se normalizan a E.164 según TELEFONO_PAISES y se guardan como
+entero (dedup exacto). Los emails se normalizan (trim + minúsculas) y se
+guardan como hash de 64 bits (probabilidad de colisión ~3e-6 con 10M
+emails únicos). Ambos viven en un conjunto compacto de uint64 ordenados:
+8 bytes por contacto único en vez de un set de strings de Python.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .config import TELEFONO_PAISES
+from .importacion import TAMANO_CHUNK, leer_en_chunks
+
+TIPO_TELEFONO = "telefono"
+TIPO_EMAIL = "email"
+
+MEMORIA_MAX_MB = 512
+
+# Nombres de columna que se reconocen automáticamente
+_PISTAS_COLUMNA = {
+    TIPO_TELEFONO: ("telefono", "teléfono", "celular", "movil", "móvil", "phone", "whatsapp", "numero"),
+    TIPO_EMAIL: ("email", "correo", "mail"),
+}
+
+_RE_EMAIL = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+# ------------------ NORMALIZACIÓN ------------------ #
+
+def normalizar_telefonos(telefonos: pd.Series, pais: str) -> pd.Series:
+    """
+    Normaliza teléfonos a E.164 (sin "+") como Int64; <NA> si no es válido.
+
+    Acepta espacios, guiones, paréntesis, "+" o "00" internacional, el 0 de
+    marcación nacional y el "1" antiguo de celulares de México (+52 1).
+    """
+    conf = TELEFONO_PAISES.get(pais)
+    if conf is None:
+        raise ValueError(f"No hay configuración de teléfonos para {pais}")
+    indicativo = conf["indicativo"]
+    largo = conf["largo"]
+
+    digitos = telefonos.astype("string").str.replace(r"\D", "", regex=True)
+    digitos = digitos.str.replace(r"^00", "", regex=True)
+
+    con_indicativo = digitos.str.startswith(indicativo) & (
+        digitos.str.len() == len(indicativo) + largo
+    )
+    nacional = digitos.where(~con_indicativo, digitos.str.slice(len(indicativo)))
+
+    if pais == "México":
+        movil_antiguo = digitos.str.startswith(indicativo + "1") & (
+            digitos.str.len() == len(indicativo) + 1 + largo
+        )
+        nacional = nacional.where(~movil_antiguo, digitos.str.slice(len(indicativo) + 1))
+
+    nacional = nacional.str.replace(r"^0+", "", regex=True)
+    validos = nacional.str.len() == largo
+
+    e164 = (indicativo + nacional).where(validos)
+    return pd.to_numeric(e164, errors="coerce").astype("Int64")
+
+def normalizar_emails(emails: pd.Series) -> pd.Series:
+    """
+    Emails en minúsculas y sin espacios; <NA> si no tienen forma de email.
+    """
+    limpios = emails.astype("string").str.strip().str.lower()
+    return limpios.where(limpios.str.match(_RE_EMAIL, na=False))
+
+def claves_contacto(valores: pd.Series, tipo: str, pais: str = None) -> np.ndarray:
+    """
+    Claves uint64 de los contactos válidos de un chunk.
+    """
+    if tipo == TIPO_TELEFONO:
+        normalizados = normalizar_telefonos(valores, pais).dropna()
+        return normalizados.to_numpy(dtype="uint64")
+    normalizados = normalizar_emails(valores).dropna()
+    return pd.util.hash_pandas_object(normalizados, index=False).to_numpy(dtype="uint64")
+
+# ------------------ CONJUNTO COMPACTO ------------------ #
+
+def _ordenar_unicos(valores: np.ndarray) -> np.ndarray:
+    """
+    Únicos ordenados. El sort estable (timsort) aprovecha los tramos ya
+    ordenados, así que fusionar arreglos únicos es casi lineal.
+    """
+    if len(valores) == 0:
+        return valores
+    ordenados = np.sort(valores, kind="stable")
+    mascara = np.empty(len(ordenados), dtype=bool)
+    mascara[0] = True
+    np.not_equal(ordenados[1:], ordenados[:-1], out=mascara[1:])
+    return ordenados[mascara]
+
+class ConjuntoHash:
+    """
+    Conjunto de claves uint64 guardado como arreglo ordenado + buffer.
+    El buffer se fusiona cuando crece a una fracción del arreglo principal,
+    así el costo amortizado por inserción es O(log n).
+    """
+
+    def __init__(self, memoria_max_mb: float = MEMORIA_MAX_MB):
+        self.memoria_max_bytes = int(memoria_max_mb * 1024 * 1024)
+        self._unicos = np.empty(0, dtype="uint64")
+        self._buffer = []
+        self._en_buffer = 0
+
+    def agregar(self, claves: np.ndarray):
+        if len(claves) == 0:
+            return
+        claves = _ordenar_unicos(np.asarray(claves, dtype="uint64"))
+        self._buffer.append(claves)
+        self._en_buffer += len(claves)
+        if self._en_buffer >= max(len(self._unicos) // 4, TAMANO_CHUNK):
+            self._fusionar()
+        if self.bytes_usados > self.memoria_max_bytes:
+            raise MemoryError(
+                f"La deduplicación supera el presupuesto de memoria "
+                f"({self.memoria_max_bytes / 1024 / 1024:,.0f} MB)."
+            )
+
+    def _fusionar(self):
+        if not self._buffer:
+            return
+        self._unicos = _ordenar_unicos(np.concatenate([self._unicos, *self._buffer]))
+        self._buffer = []
+        self._en_buffer = 0
+
+    @property
+    def bytes_usados(self) -> int:
+        return self._unicos.nbytes + self._en_buffer * 8
+
+    def __len__(self) -> int:
+        self._fusionar()
+        return len(self._unicos)
+
+# ------------------ PROCESO COMPLETO ------------------ #
+
+def detectar_columna(columnas, tipo: str):
+    """
+    Primera columna cuyo nombre sugiere el tipo de contacto, o None.
+    """
+    for col in columnas:
+        nombre = str(col).strip().lower()
+        if any(pista in nombre for pista in _PISTAS_COLUMNA[tipo]):
+            return col
+    return None
+
+def _leer_encabezado(origen, formato=None):
+    """
+    Columnas del archivo sin leer filas (y deja el file-like al inicio).
+    """
+    chunk = next(leer_en_chunks(origen, formato, tamano_chunk=1, como_texto=True))
+    if hasattr(origen, "seek"):
+        origen.seek(0)
+    return list(chunk.columns)
+
+def deduplicar_contactos(
+    origen,
+    tipo: str,
+    pais: str,
+    columna=None,
+    columna_pais=None,
+    formato=None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    memoria_max_mb: float = MEMORIA_MAX_MB,
+    al_avanzar=None,
+) -> dict:
+    """
+    Recorre un archivo de contactos por chunks, normaliza y cuenta únicos.
+
+    columna: columna del teléfono / email (None = se detecta por nombre).
+    columna_pais: columna opcional con el país de cada fila; si no está, se
+    usa `pais` para todos los teléfonos.
+    al_avanzar: callback opcional al_avanzar(filas_procesadas).
+    """
+    if columna is None:
+        columna = detectar_columna(_leer_encabezado(origen, formato), tipo)
+        if columna is None:
+            raise ValueError(f"No se encontró una columna de {tipo} en el archivo.")
+
+    columnas = [columna] + ([columna_pais] if columna_pais else [])
+    conjunto = ConjuntoHash(memoria_max_mb)
+    filas = 0
+    validos = 0
+    inicio = time.perf_counter()
+
+    for chunk in leer_en_chunks(origen, formato, tamano_chunk, columnas=columnas, como_texto=True):
+        filas += len(chunk)
+
+        if tipo == TIPO_TELEFONO and columna_pais:
+            paises = chunk[columna_pais].fillna(pais).str.strip()
+            partes = [
+                claves_contacto(grupo[columna], tipo, p)
+                for p, grupo in chunk.groupby(paises)
+                if p in TELEFONO_PAISES
+            ]
+            claves = np.concatenate(partes) if partes else np.empty(0, dtype="uint64")
+        else:
+            claves = claves_contacto(chunk[columna], tipo, pais)
+
+        validos += len(claves)
+        conjunto.agregar(claves)
+        if al_avanzar is not None:
+            al_avanzar(filas)
+
+    unicos = len(conjunto)
+    segundos = time.perf_counter() - inicio
+    return {
+        "columna": columna,
+        "filas": filas,
+        "validos": validos,
+        "invalidos": filas - validos,
+        "unicos": unicos,
+        "duplicados": validos - unicos,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos > 0 else 0.0,
+        "memoria_mb": conjunto.bytes_usados / 1024 / 1024,
+    }
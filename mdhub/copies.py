@@ -0,0 +1,320 @@
+"""
+Repositorio persistente de copies y sus resultados (SQLite).
+
+Reemplaza el DataFrame que antes vivía en st.session_state: los copies se
+guardan en la tabla `copies`, con índices en canal, pais, segmento y
+es_ganador. Los filtros se resuelven en SQL y la página solo carga la
+página visible (LIMIT / OFFSET), así que el volumen histórico no crece en
+memoria por sesión.
+
+copy_texto se indexa además en una tabla FTS5 (`copies_fts`, mismo rowid
+que `copies`) con el texto ya normalizado por texto.normalizar; el índice se
+actualiza en cada alta, edición y baja.
+"""
+
+import pandas as pd
+
+from . import texto
+from .db import conectar
+
+COLUMNAS = [
+    "campaña",
+    "canal",
+    "pais",
+    "segmento",
+    "objetivo",
+    "copy_texto",
+    "tasa_respuesta",
+    "sql_generados",
+    "es_ganador",
+]
+
+# Columna del DataFrame → columna de la tabla
+_COLUMNA_SQL = {c: ("campania" if c == "campaña" else c) for c in COLUMNAS}
+
+FILTROS = ("canal", "pais", "segmento")
+TAMANO_PAGINA = 50
+MAX_RESULTADOS = 50
+
+# Peso del desempeño en el ranking de búsqueda: la relevancia bm25 se
+# multiplica por (1 + tasa_respuesta) y por (1 + sql / (sql + SQL_MEDIO))
+SQL_MEDIO = 50
+
+CAMPANIA_HISTORICA = {
+    "campaña": "wa_col_pos_850cop_emp_20112025_vn",
+    "canal": "WhatsApp",
+    "pais": "Colombia",
+    "segmento": "Empresarios",
+    "objetivo": (
+        "Push POS $850/día fin de año – directo a SQL. "
+        "Planeado: 5.000 envíos, 150 MQL/SQL (3% leads→SQL). "
+        "Resultado: 4.933 usuarios, 3.996 entregados, 359 respuestas (9% resp). "
+        "Creativo: video Nico."
+    ),
+    "copy_texto": (
+        "¡Hola, {{hubspot_firstname}}! Esta temporada tu negocio puede estar "
+        "*lleno… y bajo control* 🎉\n\n"
+        "Con un POS desde *$850 al día* facturas electrónicamente, manejas "
+        "inventario y evitas errores en caja.\n\n"
+        "Por ser fin de año, te damos una asesoría GRATIS 👉\n\n"
+        "Empieza aquí"
+    ),
+    "tasa_respuesta": 0.09,  # 9% real (359 / 3.996 aprox)
+    # Puedes dejar 150 (objetivo) o 0 para que lo llenes después
+    "sql_generados": 150,
+    "es_ganador": True,
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS copies (
+    id INTEGER PRIMARY KEY,
+    campania TEXT,
+    canal TEXT,
+    pais TEXT,
+    segmento TEXT,
+    objetivo TEXT,
+    copy_texto TEXT,
+    tasa_respuesta REAL,
+    sql_generados INTEGER,
+    es_ganador INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_copies_canal ON copies (canal);
+CREATE INDEX IF NOT EXISTS idx_copies_pais ON copies (pais);
+CREATE INDEX IF NOT EXISTS idx_copies_segmento ON copies (segmento);
+CREATE INDEX IF NOT EXISTS idx_copies_es_ganador ON copies (es_ganador);
+CREATE VIRTUAL TABLE IF NOT EXISTS copies_fts USING fts5 (
+    texto,
+    tokenize = "unicode61 tokenchars '_'"
+);
+"""
+
+_inicializadas = set()
+
+# ------------------ ESQUEMA ------------------ #
+
+def inicializar(conn=None):
+    """
+    Crea la tabla e índices si no existen y carga la campaña histórica
+    solo si la tabla está vacía.
+    """
+    conn = conn or conectar()
+    conn.executescript(_ESQUEMA)
+    with conn:
+        # BEGIN IMMEDIATE: dos sesiones arrancando a la vez no siembran dos veces
+        conn.execute("BEGIN IMMEDIATE")
+        vacia = conn.execute("SELECT NOT EXISTS (SELECT 1 FROM copies)").fetchone()[0]
+        if vacia:
+            _insertar(conn, [CAMPANIA_HISTORICA])
+        # Bases creadas antes del índice de búsqueda
+        desfasado = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM copies) != (SELECT COUNT(*) FROM copies_fts)"
+        ).fetchone()[0]
+        if desfasado:
+            reconstruir_indice(conn)
+    return conn
+
+def reconstruir_indice(conn):
+    """
+    Vuelve a indexar todos los copies (sin commit: corre dentro de la
+    transacción del llamador).
+    """
+    conn.execute("DELETE FROM copies_fts")
+    conn.executemany(
+        "INSERT INTO copies_fts (rowid, texto) VALUES (?, ?)",
+        ((fila[0], texto.normalizar(fila[1])) for fila in conn.execute("SELECT id, copy_texto FROM copies")),
+    )
+
+def _conexion(conn=None):
+    conn = conn or conectar()
+    if id(conn) not in _inicializadas:
+        inicializar(conn)
+        _inicializadas.add(id(conn))
+    return conn
+
+# ------------------ CONSULTAS ------------------ #
+
+def _where(filtros, prefijo: str = "") -> tuple:
+    """
+    Cláusula WHERE y parámetros para {"canal", "pais", "segmento", "solo_ganadores"}.
+    """
+    filtros = filtros or {}
+    condiciones = []
+    params = []
+    for col in FILTROS:
+        valor = filtros.get(col)
+        if valor:
+            condiciones.append(f"{prefijo}{col} = ?")
+            params.append(valor)
+    if filtros.get("solo_ganadores"):
+        condiciones.append(f"{prefijo}es_ganador = 1")
+    where = " WHERE " + " AND ".join(condiciones) if condiciones else ""
+    return where, params
+
+def _a_dataframe(filas) -> pd.DataFrame:
+    df = pd.DataFrame(
+        [tuple(f) for f in filas],
+        columns=["id"] + COLUMNAS,
+    ).set_index("id")
+    df["tasa_respuesta"] = df["tasa_respuesta"].astype("float64")
+    df["sql_generados"] = df["sql_generados"].astype("Int64")
+    df["es_ganador"] = df["es_ganador"].fillna(0).astype(bool)
+    return df
+
+def contar(filtros=None, conn=None) -> int:
+    conn = _conexion(conn)
+    where, params = _where(filtros)
+    return conn.execute(f"SELECT COUNT(*) FROM copies{where}", params).fetchone()[0]
+
+def cargar_pagina(filtros=None, pagina: int = 0, tamano: int = TAMANO_PAGINA, conn=None) -> pd.DataFrame:
+    """
+    Página `pagina` (desde 0) de copies que cumplen los filtros, indexada por id.
+    """
+    conn = _conexion(conn)
+    where, params = _where(filtros)
+    columnas = ", ".join(_COLUMNA_SQL[c] for c in COLUMNAS)
+    filas = conn.execute(
+        f"SELECT id, {columnas} FROM copies{where} ORDER BY id LIMIT ? OFFSET ?",
+        params + [int(tamano), int(pagina) * int(tamano)],
+    ).fetchall()
+    return _a_dataframe(filas)
+
+def valores_distintos(columna: str, conn=None) -> list:
+    """
+    Valores presentes de una columna filtrable (sale del índice, sin leer la tabla).
+    """
+    if columna not in FILTROS:
+        raise ValueError(f"Columna no filtrable: {columna}")
+    conn = _conexion(conn)
+    filas = conn.execute(
+        f"SELECT DISTINCT {columna} FROM copies WHERE {columna} IS NOT NULL ORDER BY {columna}"
+    ).fetchall()
+    return [f[0] for f in filas]
+
+def _consulta_fts(consulta: str) -> str:
+    """
+    Expresión MATCH de FTS5: todos los tokens (AND), el último como prefijo
+    para buscar mientras se escribe.
+    """
+    partes = [f'"{t}"' for t in texto.tokens(consulta)]
+    if partes:
+        partes[-1] += "*"
+    return " ".join(partes)
+
+def buscar(consulta: str, filtros=None, limite: int = MAX_RESULTADOS, conn=None) -> pd.DataFrame:
+    """
+    Copies cuyo copy_texto calza con la consulta, ordenados por relevancia
+    (bm25) ponderada por tasa_respuesta y sql_generados. Incluye la columna
+    "puntaje" (mayor = mejor).
+    """
+    expresion = _consulta_fts(consulta)
+    if not expresion:
+        return _a_dataframe([]).assign(puntaje=pd.Series(dtype="float64"))
+
+    conn = _conexion(conn)
+    where, params = _where(filtros, prefijo="c.")
+    where = where.replace(" WHERE ", " AND ", 1)
+    columnas = ", ".join(f"c.{_COLUMNA_SQL[c]}" for c in COLUMNAS)
+    filas = conn.execute(
+        f"""
+        SELECT c.id, {columnas},
+               -bm25(copies_fts)
+               * (1 + COALESCE(c.tasa_respuesta, 0))
+               * (1 + COALESCE(c.sql_generados, 0) * 1.0 / (COALESCE(c.sql_generados, 0) + ?))
+               AS puntaje
+        FROM copies_fts JOIN copies AS c ON c.id = copies_fts.rowid
+        WHERE copies_fts MATCH ?{where}
+        ORDER BY puntaje DESC
+        LIMIT ?
+        """,
+        [SQL_MEDIO, expresion] + params + [int(limite)],
+    ).fetchall()
+    df = _a_dataframe([f[:-1] for f in filas])
+    df["puntaje"] = [f[-1] for f in filas]
+    return df
+
+# ------------------ ESCRITURA ------------------ #
+
+def _valor_sql(columna: str, valor):
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return 0 if columna == "es_ganador" else None
+    if columna == "es_ganador":
+        return int(bool(valor))
+    if columna == "tasa_respuesta":
+        return float(valor)
+    if columna == "sql_generados":
+        return int(valor)
+    return str(valor)
+
+def _validar_columnas(columnas):
+    desconocidas = set(columnas) - set(COLUMNAS)
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {sorted(desconocidas)}")
+
+def _insertar(conn, filas) -> list:
+    ids = []
+    for fila in filas:
+        _validar_columnas(fila)
+        columnas = [c for c in COLUMNAS if c in fila]
+        cursor = conn.execute(
+            f"INSERT INTO copies ({', '.join(_COLUMNA_SQL[c] for c in columnas)}) "
+            f"VALUES ({', '.join('?' * len(columnas))})",
+            [_valor_sql(c, fila[c]) for c in columnas],
+        )
+        ids.append(cursor.lastrowid)
+        conn.execute(
+            "INSERT INTO copies_fts (rowid, texto) VALUES (?, ?)",
+            (cursor.lastrowid, texto.normalizar(fila.get("copy_texto"))),
+        )
+    return ids
+
+def _actualizar(conn, id_copy: int, cambios: dict):
+    if not cambios:
+        return
+    _validar_columnas(cambios)
+    asignaciones = ", ".join(f"{_COLUMNA_SQL[c]} = ?" for c in cambios)
+    conn.execute(
+        f"UPDATE copies SET {asignaciones} WHERE id = ?",
+        [_valor_sql(c, v) for c, v in cambios.items()] + [int(id_copy)],
+    )
+    if "copy_texto" in cambios:
+        conn.execute(
+            "UPDATE copies_fts SET texto = ? WHERE rowid = ?",
+            (texto.normalizar(cambios["copy_texto"]), int(id_copy)),
+        )
+
+def _eliminar(conn, ids):
+    ids = [(int(i),) for i in ids]
+    conn.executemany("DELETE FROM copies WHERE id = ?", ids)
+    conn.executemany("DELETE FROM copies_fts WHERE rowid = ?", ids)
+
+def insertar(filas, conn=None) -> list:
+    """
+    Inserta copies (dicts con columnas de COLUMNAS) y devuelve sus ids.
+    """
+    conn = _conexion(conn)
+    with conn:
+        return _insertar(conn, filas)
+
+def actualizar(id_copy: int, cambios: dict, conn=None):
+    conn = _conexion(conn)
+    with conn:
+        _actualizar(conn, id_copy, cambios)
+
+def eliminar(ids, conn=None):
+    conn = _conexion(conn)
+    with conn:
+        _eliminar(conn, ids)
+
+def aplicar_ediciones(ids_pagina, ediciones: dict, conn=None):
+    """
+    Aplica en una transacción el delta de st.data_editor
+    ({"edited_rows", "added_rows", "deleted_rows"}) sobre la página mostrada.
+    ids_pagina: ids de la página en el orden en que se mostraron.
+    """
+    conn = _conexion(conn)
+    ids_pagina = list(ids_pagina)
+    with conn:
+        for posicion, cambios in (ediciones.get("edited_rows") or {}).items():
+            _actualizar(conn, ids_pagina[int(posicion)], cambios)
+        _insertar(conn, [f for f in (ediciones.get("added_rows") or []) if f])
+        _eliminar(conn, [ids_pagina[int(p)] for p in (ediciones.get("deleted_rows") or [])])
@@ -0,0 +1,241 @@
+"""
+Helpers de costos unitarios y cupos de envíos (sin Streamlit).
+
+Todas las funciones aceptan `config` (un snapshot de precios.py); por
+defecto usan precios.actual(). Un cálculo que encadena varias funciones
+debe pasar el mismo snapshot a todas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import cambio, precios
+from .precios import Proveedor, canal_canonico
+
+# ------------------ CUPOS DE ENVÍOS ------------------ #
+
+def _segmento_to_budget_key(segmento_ui: str):
+    """
+    Mapea el segmento UI a clave de budget (Empresarios/Aliados).
+    Contadores los mapeo a Aliados.
+    """
+    if segmento_ui == "Empresarios":
+        return "Empresarios"
+    if segmento_ui in ("Contadores", "Aliados"):
+        return "Aliados"
+    return None
+
+def _canal_to_budget_key(canal: str):
+    canal_low = canal.lower()
+    if "whatsapp" in canal_low or "wapp" in canal_low:
+        return "WAPP"
+    if "sms" in canal_low:
+        return "SMS"
+    if "call blasting" in canal_low or canal_low == "cb":
+        return "CB"
+    return None
+
+def get_budget_envios_max(pais: str, periodo: str, segmento_ui: str, canal: str, config=None):
+    """
+    Devuelve el cupo máximo de envíos (int) o None si no hay dato.
+    """
+    seg_key = _segmento_to_budget_key(segmento_ui)
+    canal_key = _canal_to_budget_key(canal)
+
+    if not seg_key or not canal_key:
+        return None
+
+    config = config or precios.actual()
+    pais_dict = config.budget_envios.get(pais)
+    if not pais_dict:
+        return None
+
+    periodo_dict = pais_dict.get(periodo)
+    if not periodo_dict:
+        return None
+
+    seg_dict = periodo_dict.get(seg_key)
+    if not seg_dict:
+        return None
+
+    return seg_dict.get(canal_key)
+
+def cupos_envios_vectorizado(paises, periodos, segmentos, canales, config=None) -> np.ndarray:
+    """
+    Cupo máximo de envíos por fila (float, NaN si no hay dato).
+    Cada combinación distinta se resuelve una sola vez.
+    """
+    claves = pd.DataFrame(
+        {
+            "pais": np.broadcast_to(np.asarray(paises, dtype="object"), (len(canales),)),
+            "periodo": np.broadcast_to(np.asarray(periodos, dtype="object"), (len(canales),)),
+            "segmento": np.broadcast_to(np.asarray(segmentos, dtype="object"), (len(canales),)),
+            "canal": np.asarray(canales, dtype="object"),
+        }
+    )
+    config = config or precios.actual()
+    unicos = claves.drop_duplicates()
+    cupos = [get_budget_envios_max(*fila, config=config) for fila in unicos.itertuples(index=False)]
+    unicos = unicos.assign(cupo=[np.nan if c is None else float(c) for c in cupos])
+    return claves.merge(unicos, on=list(claves.columns), how="left")["cupo"].to_numpy()
+
+def cupos_envios_grilla(paises, periodo: str, segmentos, canales, config=None) -> np.ndarray:
+    """
+    Cupos máximos sobre el producto cruzado países × segmentos × canales,
+    forma (P, S, C), NaN si no hay dato. Segmentos y canales se resuelven a
+    su clave de BUDGET_ENVIOS una vez por eje y el cupo sale de indexar una
+    tabla país × clave de segmento × clave de canal.
+    """
+    config = config or precios.actual()
+    claves_seg = list(precios.SEGMENTOS_CUPO)
+    claves_canal = list(precios.CANALES_CUPO)
+
+    # Última fila / columna: segmentos y canales sin clave de cupo (NaN)
+    tabla = np.full((len(paises), len(claves_seg) + 1, len(claves_canal) + 1), np.nan)
+    for i, pais in enumerate(paises):
+        por_segmento = (config.budget_envios.get(pais) or {}).get(periodo) or {}
+        for j, seg in enumerate(claves_seg):
+            for k, canal in enumerate(claves_canal):
+                cupo = (por_segmento.get(seg) or {}).get(canal)
+                if cupo is not None:
+                    tabla[i, j, k] = float(cupo)
+
+    i_seg = np.array(
+        [
+            claves_seg.index(clave) if clave else len(claves_seg)
+            for clave in map(_segmento_to_budget_key, segmentos)
+        ],
+        dtype="int64",
+    )
+    i_canal = np.array(
+        [
+            claves_canal.index(clave) if clave else len(claves_canal)
+            for clave in map(_canal_to_budget_key, canales)
+        ],
+        dtype="int64",
+    )
+    return tabla[:, i_seg[:, None], i_canal[None, :]]
+
+# ------------------ ÍNDICES EN LAS MATRICES DE COSTOS ------------------ #
+
+def resolver_canal(canal: str, config=None):
+    """
+    Resuelve el nombre libre de un canal a (Canal, fallback).
+    fallback es la posición del nombre exacto entre los canales
+    configurados (1, 2, ...) o 0 si no está: los países sin tabla usan el
+    costo de ese canal, como el fallback original de get_cost_cop.
+    """
+    config = config or precios.actual()
+    return canal_canonico(canal), config.indice_canal.get(canal, 0)
+
+def resolver_proveedor(proveedor_sms) -> Proveedor:
+    prov = (proveedor_sms or "Masive").lower()
+    return Proveedor.NUA if prov == "nua" else Proveedor.MASIVE
+
+def resolver_pais(pais, config=None) -> int:
+    config = config or precios.actual()
+    if not pais:
+        pais = "Colombia"
+    return config.indice_pais.get(pais.strip(), config.pais_sin_tabla)
+
+def indices_costo(canales, paises, proveedores, config=None):
+    """
+    Resuelve columnas de canal / país / proveedor a índices de la matriz.
+    Cada valor distinto se resuelve una sola vez.
+    """
+    config = config or precios.actual()
+    n = len(canales)
+
+    codigos, unicos = pd.factorize(pd.Series(canales, dtype="object"), use_na_sentinel=False)
+    resueltos = [resolver_canal(str(c), config) for c in unicos]
+    i_canal = np.array([r[0] for r in resueltos], dtype="int64")[codigos]
+    i_fallback = np.array([r[1] for r in resueltos], dtype="int64")[codigos]
+
+    if isinstance(paises, str) or paises is None:
+        i_pais = np.full(n, resolver_pais(paises, config), dtype="int64")
+    else:
+        codigos, unicos = pd.factorize(pd.Series(paises, dtype="object"), use_na_sentinel=False)
+        i_pais = np.array(
+            [resolver_pais(p if isinstance(p, str) else None, config) for p in unicos],
+            dtype="int64",
+        )[codigos]
+
+    if isinstance(proveedores, str) or proveedores is None:
+        i_prov = np.full(n, resolver_proveedor(proveedores), dtype="int64")
+    else:
+        codigos, unicos = pd.factorize(pd.Series(proveedores, dtype="object"), use_na_sentinel=False)
+        i_prov = np.array(
+            [resolver_proveedor(p if isinstance(p, str) else None) for p in unicos], dtype="int64"
+        )[codigos]
+
+    return i_pais, i_canal, i_prov, i_fallback
+
+def validar_costos(idx, canales, config) -> None:
+    """
+    ValueError si algún canal no tiene costo: ni tabla por país ni entrada
+    en los canales configurados.
+    """
+    sin_costo = ~np.atleast_1d(config.matriz_costo_ok[idx])
+    if sin_costo.any():
+        faltantes = sorted(set(np.asarray(canales, dtype="object")[sin_costo].tolist()), key=str)
+        raise ValueError(
+            f"Canales sin costo configurado: {', '.join(map(str, faltantes))} "
+            f"(canales válidos: {', '.join(config.channels)})"
+        )
+
+def costo_cop_vectorizado(canales, paises, proveedores, fx, config=None) -> np.ndarray:
+    """
+    Columna de costos por envío en COP para un arreglo de filas.
+    paises / proveedores / fx pueden ser escalares o arreglos del mismo largo.
+    Lanza ValueError si algún canal no tiene costo configurado.
+    """
+    config = config or precios.actual()
+    idx = indices_costo(canales, paises, proveedores, config)
+    validar_costos(idx, canales, config)
+    cop = config.matriz_costo_cop[idx]
+    usd = config.matriz_costo_usd[idx]
+    fx = np.broadcast_to(np.asarray(fx, dtype="float64"), cop.shape)
+    return np.where(usd != 0.0, cop + usd * fx, cop)
+
+# ------------------ HELPERS DE COSTOS ------------------ #
+
+def get_cost_cop(
+    canal: str,
+    fx: float,
+    pais: str,
+    proveedor_sms: str = "Masive",
+    config=None,
+) -> float:
+    """
+    Devuelve el costo por envío en COP para un canal dado,
+    usando primero la tabla por país y, si no existe,
+    la config base de canales (ambas ya compiladas en el snapshot).
+    Lanza ValueError si el canal no tiene costo configurado.
+    """
+    config = config or precios.actual()
+    costo = config.costos_escalares.get((canal, pais, proveedor_sms))
+    if costo is None:
+        # Nombre libre, país sin tabla o sin costo: por la matriz
+        canonico, fallback = resolver_canal(canal, config)
+        idx = (resolver_pais(pais, config), canonico, resolver_proveedor(proveedor_sms), fallback)
+        validar_costos(idx, [canal], config)
+        costo = (float(config.matriz_costo_cop[idx]), float(config.matriz_costo_usd[idx]))
+    cop, usd = costo
+    if usd != 0.0:
+        # USD → COP
+        return usd * fx
+    return cop
+
+def get_cost_display(
+    canal: str,
+    moneda_trabajo: str,
+    fx: float,
+    pais: str,
+    proveedor_sms: str = "Masive",
+    config=None,
+) -> float:
+    """
+    Devuelve el costo unitario en la moneda de trabajo (COP / USD).
+    Internamente siempre parte de COP.
+    """
+    return cambio.desde_cop(get_cost_cop(canal, fx, pais, proveedor_sms, config), moneda_trabajo, fx)
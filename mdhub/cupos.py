@@ -0,0 +1,257 @@
+"""
+Libro de reservas de cupos de envíos (SQLite).
+
+Cada campaña confirmada descuenta sus envíos de contadores por
+país / periodo / ventana / segmento / canal (claves de BUDGET_ENVIOS), así
+el envío restante refleja todo lo ya reservado y no solo la campaña en
+pantalla. Una reserva en una fecha cuenta para todas las ventanas que la
+contienen (el mes en "Mensual" y el año en "Anual").
+
+La reserva es atómica: en una transacción BEGIN IMMEDIATE cada contador se
+incrementa con un UPDATE condicionado a no superar el cupo; si alguno no
+alcanza se hace rollback de todo. Consultar lo consumido es una lectura por
+clave primaria, sin recorrer el historial.
+"""
+
+import datetime as dt
+from collections import defaultdict
+
+import pandas as pd
+
+from .costos import _canal_to_budget_key, _segmento_to_budget_key, get_budget_envios_max
+from .db import conectar
+
+# Formato de la ventana de cada periodo de BUDGET_ENVIOS
+VENTANAS = {"Mensual": "%Y-%m", "Anual": "%Y"}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS reservas (
+    id INTEGER PRIMARY KEY,
+    creada TEXT NOT NULL,
+    campania TEXT,
+    fecha TEXT NOT NULL,
+    cancelada INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS reservas_detalle (
+    reserva_id INTEGER NOT NULL REFERENCES reservas (id),
+    pais TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    ventana TEXT NOT NULL,
+    segmento TEXT NOT NULL,
+    canal TEXT NOT NULL,
+    envios INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservas_detalle_reserva ON reservas_detalle (reserva_id);
+CREATE TABLE IF NOT EXISTS consumo_cupos (
+    pais TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    ventana TEXT NOT NULL,
+    segmento TEXT NOT NULL,
+    canal TEXT NOT NULL,
+    envios INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (pais, periodo, ventana, segmento, canal)
+) WITHOUT ROWID;
+"""
+
+_inicializadas = set()
+
+def _conexion(conn=None):
+    conn = conn or conectar()
+    if id(conn) not in _inicializadas:
+        conn.executescript(_ESQUEMA)
+        _inicializadas.add(id(conn))
+    return conn
+
+# ------------------ CLAVES ------------------ #
+
+def ventana(periodo: str, fecha=None) -> str:
+    """
+    Ventana de un periodo que contiene la fecha: "2025-11" (Mensual), "2025" (Anual).
+    """
+    fecha = fecha or dt.date.today()
+    return fecha.strftime(VENTANAS[periodo])
+
+def clave(pais: str, periodo: str, segmento: str, canal: str, fecha=None):
+    """
+    Clave del contador (pais, periodo, ventana, segmento, canal) en claves de
+    BUDGET_ENVIOS, o None si la combinación no tiene cupo.
+    """
+    if periodo not in VENTANAS or get_budget_envios_max(pais, periodo, segmento, canal) is None:
+        return None
+    return (
+        pais,
+        periodo,
+        ventana(periodo, fecha),
+        _segmento_to_budget_key(segmento),
+        _canal_to_budget_key(canal),
+    )
+
+def _cupo(clave_contador) -> int:
+    pais, periodo, _, segmento, canal = clave_contador
+    return get_budget_envios_max(pais, periodo, segmento, canal)
+
+# ------------------ CONSULTAS ------------------ #
+
+def consumido(clave_contador, conn=None) -> int:
+    """
+    Envíos ya reservados para una clave (0 si no hay reservas).
+    """
+    if clave_contador is None:
+        return 0
+    conn = _conexion(conn)
+    fila = conn.execute(
+        "SELECT envios FROM consumo_cupos "
+        "WHERE pais = ? AND periodo = ? AND ventana = ? AND segmento = ? AND canal = ?",
+        clave_contador,
+    ).fetchone()
+    return fila[0] if fila else 0
+
+def uso_con_reservas(cap_rows: list, fecha=None, ya_reservada: bool = False, conn=None) -> tuple:
+    """
+    Completa las filas de uso de cupos (formato de calculadora) con lo ya
+    reservado en la ventana de la fecha. Devuelve (filas, alertas).
+    ya_reservada: la campaña ya está dentro de lo reservado (no se suma dos veces).
+    """
+    conn = _conexion(conn)
+    filas = []
+    alertas = []
+    for r in cap_rows:
+        fila = dict(r)
+        clave_contador = clave(r["pais"], r["periodo"], r["segmento"], r["canal"], fecha)
+        if clave_contador is None or r["cupo_disponible"] is None:
+            fila["reservados"] = None
+            filas.append(fila)
+            continue
+
+        cap_max = r["cupo_disponible"]
+        reservados = consumido(clave_contador, conn)
+        usados = reservados if ya_reservada else reservados + r["envios_campaña"]
+        fila["reservados"] = reservados
+        fila["%_uso"] = round(usados / cap_max * 100.0, 1) if cap_max > 0 else 0.0
+        fila["envios_restantes"] = max(cap_max - usados, 0)
+        filas.append(fila)
+
+        if reservados and usados > cap_max and not ya_reservada:
+            alertas.append(
+                f"⚠ Con lo ya reservado ({reservados:,} envíos en {clave_contador[2]}), "
+                f"el canal {r['canal']} en {r['pais']} ({r['segmento']}, {r['periodo']}) "
+                f"supera el cupo de {cap_max:,} envíos (campaña: {r['envios_campaña']:,})."
+            )
+    return filas, alertas
+
+def listar_reservas(limite: int = 50, conn=None) -> pd.DataFrame:
+    conn = _conexion(conn)
+    filas = conn.execute(
+        """
+        SELECT r.id, r.creada, r.campania, r.fecha, r.cancelada,
+               d.pais, d.periodo, d.ventana, d.segmento, d.canal, d.envios
+        FROM reservas AS r JOIN reservas_detalle AS d ON d.reserva_id = r.id
+        WHERE r.id IN (SELECT id FROM reservas ORDER BY id DESC LIMIT ?)
+        ORDER BY r.id DESC
+        """,
+        (int(limite),),
+    ).fetchall()
+    return pd.DataFrame(
+        [tuple(f) for f in filas],
+        columns=[
+            "id", "creada", "campaña", "fecha", "cancelada",
+            "pais", "periodo", "ventana", "segmento", "canal", "envios",
+        ],
+    )
+
+# ------------------ RESERVAS ------------------ #
+
+def reservar(campania: str, filas: list, fecha=None, conn=None) -> dict:
+    """
+    Reserva los envíos de una campaña.
+
+    filas: [{"pais", "segmento", "canal", "envios"}]; los canales sin cupo
+    no se registran. Se reserva en todas las ventanas (mes y año) de la
+    fecha. Si alguna clave supera su cupo no se reserva nada.
+
+    Devuelve {"ok", "reserva_id", "excedidos"} con excedidos como
+    [{"clave", "cupo", "reservados", "envios"}].
+    """
+    fecha = fecha or dt.date.today()
+    por_clave = defaultdict(int)
+    for f in filas:
+        envios = int(f["envios"])
+        if envios <= 0:
+            continue
+        for periodo in VENTANAS:
+            clave_contador = clave(f["pais"], periodo, f["segmento"], f["canal"], fecha)
+            if clave_contador is not None:
+                por_clave[clave_contador] += envios
+
+    conn = _conexion(conn)
+    excedidos = []
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for clave_contador, envios in por_clave.items():
+            conn.execute(
+                "INSERT OR IGNORE INTO consumo_cupos "
+                "(pais, periodo, ventana, segmento, canal, envios) VALUES (?, ?, ?, ?, ?, 0)",
+                clave_contador,
+            )
+            cupo = _cupo(clave_contador)
+            cursor = conn.execute(
+                "UPDATE consumo_cupos SET envios = envios + ? "
+                "WHERE pais = ? AND periodo = ? AND ventana = ? AND segmento = ? AND canal = ? "
+                "AND envios + ? <= ?",
+                (envios, *clave_contador, envios, cupo),
+            )
+            if cursor.rowcount == 0:
+                excedidos.append(
+                    {
+                        "clave": clave_contador,
+                        "cupo": cupo,
+                        "reservados": consumido(clave_contador, conn),
+                        "envios": envios,
+                    }
+                )
+
+        if excedidos or not por_clave:
+            conn.rollback()
+            return {"ok": False, "reserva_id": None, "excedidos": excedidos}
+
+        reserva_id = conn.execute(
+            "INSERT INTO reservas (creada, campania, fecha) VALUES (?, ?, ?)",
+            (dt.datetime.now().isoformat(timespec="seconds"), campania, fecha.isoformat()),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO reservas_detalle "
+            "(reserva_id, pais, periodo, ventana, segmento, canal, envios) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(reserva_id, *c, e) for c, e in por_clave.items()],
+        )
+    return {"ok": True, "reserva_id": reserva_id, "excedidos": []}
+
+def cancelar(reserva_id: int, conn=None) -> bool:
+    """
+    Cancela una reserva y devuelve sus envíos a los contadores.
+    False si no existe o ya estaba cancelada.
+    """
+    conn = _conexion(conn)
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.execute(
+            "UPDATE reservas SET cancelada = 1 WHERE id = ? AND cancelada = 0", (int(reserva_id),)
+        )
+        if cursor.rowcount == 0:
+            return False
+        conn.execute(
+            """
+            UPDATE consumo_cupos SET envios = envios - (
+                SELECT SUM(d.envios) FROM reservas_detalle AS d
+                WHERE d.reserva_id = :id AND d.pais = consumo_cupos.pais
+                  AND d.periodo = consumo_cupos.periodo AND d.ventana = consumo_cupos.ventana
+                  AND d.segmento = consumo_cupos.segmento AND d.canal = consumo_cupos.canal
+            )
+            WHERE (pais, periodo, ventana, segmento, canal) IN (
+                SELECT pais, periodo, ventana, segmento, canal
+                FROM reservas_detalle WHERE reserva_id = :id
+            )
+            """,
+            {"id": int(reserva_id)},
+        )
+    return True
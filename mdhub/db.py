@@ -0,0 +1,40 @@
+"""
+Conexión a la base SQLite local del hub.
+
+La ruta se toma de la variable de entorno MDHUB_DB (por defecto
+data/mdhub.sqlite3 en la raíz del repo). Se usa una conexión por hilo
+(cada sesión de Streamlit corre en su hilo) en modo WAL, así las lecturas
+no se bloquean mientras otra sesión escribe.
+"""
+
+import os
+import sqlite3
+import threading
+
+RUTA_DEFAULT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "mdhub.sqlite3")
+
+_local = threading.local()
+
+def ruta_db() -> str:
+    return os.environ.get("MDHUB_DB", RUTA_DEFAULT)
+
+def conectar(ruta=None) -> sqlite3.Connection:
+    """
+    Conexión del hilo actual a la base (se crea al primer uso).
+    """
+    ruta = ruta or ruta_db()
+    conexiones = getattr(_local, "conexiones", None)
+    if conexiones is None:
+        conexiones = _local.conexiones = {}
+
+    conn = conexiones.get(ruta)
+    if conn is None:
+        if ruta != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        conn = sqlite3.connect(ruta, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conexiones[ruta] = conn
+    return conn
@@ -0,0 +1,169 @@
+"""
+Matriz de escenarios: una campaña evaluada en todos los países, segmentos,
+canales y proveedores SMS a la vez (sin Streamlit).
+
+En vez de recalcular la Calculadora por cada país / canal / proveedor, el
+producto cruzado se arma como arreglos con un eje por dimensión (país ×
+segmento × canal × proveedor) y cada pieza se resuelve solo sobre los ejes
+de los que depende: el costo unitario sobre país × canal × proveedor, el
+cupo de BUDGET_ENVIOS y las tasas sobre país × segmento × canal. El funnel
+(motor.funnel, con el mismo floor de la Calculadora) se evalúa con
+broadcasting sobre la grilla completa y recién al final se aplana a una
+tabla ordenada por costo por SQL. Más países o proveedores agrandan los
+ejes, no la cantidad de llamadas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import precios
+from .costos import costo_cop_vectorizado, cupos_envios_grilla, resolver_canal
+from .motor import FUNNEL_DIRECTO, funnel
+from .optimizador import PROVEEDORES_SMS
+from .precios import SEGMENTOS_CUPO, Canal
+
+DIMENSIONES = ["pais", "segmento", "canal", "proveedor_sms"]
+
+COLUMNAS = DIMENSIONES + [
+    "base",
+    "envios",
+    "costo_unit_cop",
+    "tasa_mql",
+    "tasa_sql",
+    "mql",
+    "sql",
+    "costo_total_cop",
+    "costo_por_sql_cop",
+    "cupo",
+    "%_cupo",
+    "excede_cupo",
+]
+
+# ------------------ MATRIZ ------------------ #
+
+def _grilla(*ejes) -> list:
+    """
+    Valores de cada eje repetidos sobre el producto cruzado (aplanados).
+    """
+    indices = np.indices([len(e) for e in ejes]).reshape(len(ejes), -1)
+    return [np.asarray(e, dtype="object")[i] for e, i in zip(ejes, indices)]
+
+def matriz_escenarios(
+    base: int,
+    envios_contacto: float = 1.0,
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    periodo: str = "Mensual",
+    fx: float = 4000.0,
+    paises=None,
+    segmentos=None,
+    canales=None,
+    proveedores=None,
+    tasas=None,
+    ventana: int = None,
+    config=None,
+    conn=None,
+) -> pd.DataFrame:
+    """
+    Una fila por país × segmento × canal × proveedor con envíos, MQL, SQL,
+    costos y uso del cupo de BUDGET_ENVIOS del periodo, ordenada por costo
+    por SQL (las filas sin SQL al final) y con la posición en `ranking`.
+
+    El proveedor solo cambia el costo de SMS: los demás canales quedan en
+    una fila con proveedor_sms vacío.
+    tasas: {canal: {"tasa_mql": x, "tasa_sql": y}} para todos los países y
+    segmentos. Los canales sin `tasas` usan los defaults de la config o,
+    con `ventana` (una de historico.VENTANAS), la media posterior de cada
+    país × segmento × canal, como las tasas por defecto de la Calculadora.
+    config: snapshot de precios (None = precios.actual()).
+    """
+    config = config or precios.actual()
+    channels = config.channels
+    paises = list(paises or config.paises)
+    segmentos = list(segmentos or SEGMENTOS_CUPO)
+    canales = list(canales or channels.keys())
+    proveedores = list(proveedores or PROVEEDORES_SMS)
+    tasas = tasas or {}
+    n_pais, n_seg, n_canal, n_prov = len(paises), len(segmentos), len(canales), len(proveedores)
+    forma = (n_pais, n_seg, n_canal, n_prov)
+    if not all(forma):
+        return pd.DataFrame(columns=["ranking"] + COLUMNAS)
+
+    # Costo unitario: país × canal × proveedor
+    p, c, v = _grilla(paises, canales, proveedores)
+    costo_unit_cop = costo_cop_vectorizado(c, p, v, fx, config).reshape(n_pais, 1, n_canal, n_prov)
+
+    # Cupo y tasas: país × segmento × canal
+    cupo = cupos_envios_grilla(paises, periodo, segmentos, canales, config)[..., None]
+
+    tasa_mql, tasa_sql = (
+        np.array([float(channels.get(k, {}).get(col, 0.0)) for k in canales])
+        for col in ("tasa_mql", "tasa_sql")
+    )
+    tasa_mql = np.broadcast_to(tasa_mql[None, None, :], forma[:3]).copy()
+    tasa_sql = np.broadcast_to(tasa_sql[None, None, :], forma[:3]).copy()
+    if ventana is not None:
+        from . import historico
+
+        claves = zip(*_grilla(paises, segmentos, canales))
+        hist = historico.tasas_claves(claves, tipo_funnel, ventana, config, conn)
+        tasa_mql = hist["tasa_mql"].reshape(forma[:3])
+        tasa_sql = hist["tasa_sql"].reshape(forma[:3])
+    for j, canal in enumerate(canales):
+        if "tasa_mql" in tasas.get(canal, {}):
+            tasa_mql[:, :, j] = float(tasas[canal]["tasa_mql"])
+        if "tasa_sql" in tasas.get(canal, {}):
+            tasa_sql[:, :, j] = float(tasas[canal]["tasa_sql"])
+
+    # Funnel sobre la grilla completa (mismas reglas que la Calculadora)
+    costo_unit_cop, cupo, tasa_mql, tasa_sql = np.broadcast_arrays(
+        costo_unit_cop, cupo, tasa_mql[..., None], tasa_sql[..., None]
+    )
+    salida = funnel(
+        np.full(forma, int(base), dtype="int64"),
+        float(envios_contacto),
+        tasa_mql,
+        tasa_sql,
+        tipo_funnel == FUNNEL_DIRECTO,
+        costo_unit_cop,
+    )
+    envios = np.broadcast_to(salida["envios"], forma)
+    uso_cupo = np.divide(envios, cupo, out=np.full(forma, np.nan), where=cupo > 0) * 100.0
+
+    # Fuera de SMS el proveedor no cambia nada: queda solo el primero.
+    # Se descartan las combinaciones con costo 0.
+    es_sms = np.array([resolver_canal(k, config)[0] == Canal.SMS for k in canales])
+    validas = (
+        es_sms[None, None, :, None] | (np.arange(n_prov) == 0)[None, None, None, :]
+    ) & (costo_unit_cop > 0)
+
+    # Orden: costo por SQL ascendente, filas sin SQL al final
+    sql = salida["sql"]
+    orden_cps = np.where(sql > 0, salida["costo_por_sql_cop"], np.inf)[validas]
+    orden = np.lexsort((-sql[validas], orden_cps))
+    posiciones = np.flatnonzero(validas.ravel())[orden]
+    i_pais, i_seg, i_canal, i_prov = np.unravel_index(posiciones, forma)
+
+    proveedor = np.asarray(proveedores, dtype="object")[i_prov]
+    proveedor[~es_sms[i_canal]] = ""
+    cupo_plano = cupo.ravel()[posiciones]
+    return pd.DataFrame(
+        {
+            "ranking": np.arange(1, len(posiciones) + 1),
+            "pais": np.asarray(paises, dtype="object")[i_pais],
+            "segmento": np.asarray(segmentos, dtype="object")[i_seg],
+            "canal": np.asarray(canales, dtype="object")[i_canal],
+            "proveedor_sms": proveedor,
+            "base": int(base),
+            "envios": envios.ravel()[posiciones],
+            "costo_unit_cop": costo_unit_cop.ravel()[posiciones],
+            "tasa_mql": tasa_mql.ravel()[posiciones],
+            "tasa_sql": tasa_sql.ravel()[posiciones],
+            "mql": salida["mql"].ravel()[posiciones],
+            "sql": sql.ravel()[posiciones],
+            "costo_total_cop": salida["costo_total_cop"].ravel()[posiciones],
+            "costo_por_sql_cop": salida["costo_por_sql_cop"].ravel()[posiciones],
+            "cupo": cupo_plano,
+            "%_cupo": uso_cupo.ravel()[posiciones].round(1),
+            "excede_cupo": envios.ravel()[posiciones] > cupo_plano,
+        }
+    )
@@ -0,0 +1,643 @@
+"""
+Resultados históricos de campañas y tasas calibradas (SQLite).
+
+Los exports de resultados (CSV / Parquet, una fila por campaña o por
+contacto) se leen por chunks y se suman en `resultados_mes`, una fila por
+país × segmento × canal × mes: importar un archivo nuevo solo suma sus
+conteos, no vuelve a leer lo ya importado. Cada archivo se registra por su
+huella (SHA-256) y no se cuenta dos veces; su aporte por mes queda en
+`resultados_importaciones_mes` para poder restarlo si se reimporta.
+
+Después de cada importación se reconstruye `tasas_indice`: los conteos de
+las ventanas móviles (últimos 3 / 6 / 12 meses y todo el historial, hasta
+el último mes con datos) por país × segmento × canal, más los niveles
+agregados país × canal (segmento "*") y canal (país y segmento "*").
+
+Las tasas por defecto de la Calculadora y de Simulaciones son las medias
+posteriores Beta de ese índice (mdhub.posteriores, con los defaults de la
+config como prior) y vienen con su intervalo creíble. El índice y el modelo
+se cargan una vez por proceso y se recargan solo cuando hay una importación
+nueva; un resultado de campaña suelto (`registrar_resultado`) los actualiza
+en su lugar, en O(1).
+
+Uso por consola:
+    python -m mdhub.historico resultados.csv
+"""
+
+import argparse
+import datetime as dt
+import hashlib
+import os
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from . import cambio, posteriores, precios
+from .db import conectar
+from .importacion import TAMANO_CHUNK, leer_en_chunks
+from .motor import FUNNEL_DIRECTO
+
+# Columnas del export y su valor por defecto (None = obligatoria). Sin
+# "contactos", cada fila es un contacto. "costo" está en "moneda"; los
+# costos en USD se pasan a COP con la tasa de cambio del día de cada fila.
+COLUMNAS_RESULTADOS = {
+    "fecha": None,
+    "canal": None,
+    "pais": "Colombia",
+    "segmento": "Otro",
+    "contactos": 1,
+    "entregados": 0,
+    "respuestas": 0,
+    "mql": 0,
+    "sql": 0,
+    "costo": 0.0,
+    "moneda": "COP",
+}
+CONTEOS = ["contactos", "entregados", "respuestas", "mql", "sql"]
+SUMAS = CONTEOS + ["costo_cop"]
+CLAVE = ["pais", "segmento", "canal", "mes"]
+
+VENTANAS = (3, 6, 12, 0)  # meses; 0 = todo el historial
+VENTANA_DEFAULT = 6
+TODOS = posteriores.TODOS
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados_mes (
+    pais TEXT NOT NULL,
+    segmento TEXT NOT NULL,
+    canal TEXT NOT NULL,
+    mes TEXT NOT NULL,
+    contactos INTEGER NOT NULL DEFAULT 0,
+    entregados INTEGER NOT NULL DEFAULT 0,
+    respuestas INTEGER NOT NULL DEFAULT 0,
+    mql INTEGER NOT NULL DEFAULT 0,
+    sql INTEGER NOT NULL DEFAULT 0,
+    costo_cop REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (pais, segmento, canal, mes)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resultados_importaciones (
+    id INTEGER PRIMARY KEY,
+    huella TEXT NOT NULL UNIQUE,
+    nombre TEXT,
+    importada TEXT NOT NULL,
+    filas INTEGER NOT NULL,
+    invalidas INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resultados_importaciones_mes (
+    importacion_id INTEGER NOT NULL,
+    pais TEXT NOT NULL,
+    segmento TEXT NOT NULL,
+    canal TEXT NOT NULL,
+    mes TEXT NOT NULL,
+    contactos INTEGER NOT NULL DEFAULT 0,
+    entregados INTEGER NOT NULL DEFAULT 0,
+    respuestas INTEGER NOT NULL DEFAULT 0,
+    mql INTEGER NOT NULL DEFAULT 0,
+    sql INTEGER NOT NULL DEFAULT 0,
+    costo_cop REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (importacion_id, pais, segmento, canal, mes)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tasas_indice (
+    ventana INTEGER NOT NULL,
+    pais TEXT NOT NULL,
+    segmento TEXT NOT NULL,
+    canal TEXT NOT NULL,
+    desde TEXT NOT NULL,
+    hasta TEXT NOT NULL,
+    contactos INTEGER NOT NULL,
+    entregados INTEGER NOT NULL,
+    respuestas INTEGER NOT NULL,
+    mql INTEGER NOT NULL,
+    sql INTEGER NOT NULL,
+    costo_cop REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (ventana, pais, segmento, canal)
+) WITHOUT ROWID;
+"""
+
+_inicializadas = set()
+
+def _conexion(conn=None):
+    conn = conn or conectar()
+    if id(conn) not in _inicializadas:
+        conn.executescript(_ESQUEMA)
+        _inicializadas.add(id(conn))
+    return conn
+
+# ------------------ IMPORTACIÓN ------------------ #
+
+def _huella(origen) -> str:
+    """
+    SHA-256 del archivo (ruta o file-like; el file-like vuelve al inicio).
+    """
+    if isinstance(origen, (str, os.PathLike)):
+        with open(origen, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    origen.seek(0)
+    huella = hashlib.file_digest(origen, "sha256").hexdigest()
+    origen.seek(0)
+    return huella
+
+def _canales_canonicos(config) -> dict:
+    return {c.lower(): c for c in config.channels}
+
+def agregar_chunk(df: pd.DataFrame, config=None) -> tuple:
+    """
+    Conteos de un chunk por país × segmento × canal × mes.
+    Devuelve (agregado, filas inválidas). Las filas sin fecha o canal
+    válidos se descartan; los canales se llevan al nombre de la config
+    cuando coinciden sin importar mayúsculas.
+    """
+    faltantes = [c for c, d in COLUMNAS_RESULTADOS.items() if d is None and c not in df.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias en los resultados: {', '.join(faltantes)}")
+
+    canonicos = _canales_canonicos(config or precios.actual())
+    datos = pd.DataFrame(index=df.index)
+    # Mes como entero (año * 12 + mes): strftime por fila es lo más caro del
+    # chunk, así que el texto "YYYY-MM" se arma recién sobre el agregado
+    fecha = pd.to_datetime(df["fecha"], errors="coerce")
+    datos["mes"] = fecha.dt.year * 12 + fecha.dt.month - 1
+    canal = df["canal"].astype("string").str.strip()
+    datos["canal"] = canal.str.lower().map(canonicos).fillna(canal)
+    for col in ("pais", "segmento"):
+        valores = df[col].astype("string").str.strip() if col in df.columns else None
+        datos[col] = COLUMNAS_RESULTADOS[col] if valores is None else valores.fillna(
+            COLUMNAS_RESULTADOS[col]
+        ).replace("", COLUMNAS_RESULTADOS[col])
+    for col in CONTEOS:
+        if col in df.columns:
+            valores = pd.to_numeric(df[col].replace({True: 1, False: 0}), errors="coerce")
+            datos[col] = valores.fillna(COLUMNAS_RESULTADOS[col]).clip(lower=0).astype("int64")
+        else:
+            datos[col] = COLUMNAS_RESULTADOS[col]
+
+    # Costos a COP en una pasada, con la tasa del día de cada fila en USD
+    datos["costo_cop"] = 0.0
+    if "costo" in df.columns:
+        costo = pd.to_numeric(df["costo"], errors="coerce").fillna(0.0).clip(lower=0).to_numpy()
+        moneda = (
+            df["moneda"].astype("string").str.strip().str.upper().fillna("COP").to_numpy()
+            if "moneda" in df.columns
+            else np.full(len(df), COLUMNAS_RESULTADOS["moneda"])
+        )
+        usd = moneda == "USD"
+        fx = np.ones(len(df))
+        if usd.any():
+            fx[usd] = cambio.tasas_en(fecha[usd])
+        datos["costo_cop"] = costo * fx
+
+    validas = datos["mes"].notna() & datos["canal"].notna() & (datos["canal"] != "")
+    agregado = datos[validas].groupby(CLAVE, as_index=False)[SUMAS].sum()
+    mes = agregado["mes"].astype("int64")
+    agregado["mes"] = (mes // 12).astype(str).str.zfill(4) + "-" + (mes % 12 + 1).astype(str).str.zfill(2)
+    return agregado, int((~validas).sum())
+
+def importar_resultados(
+    origen,
+    formato=None,
+    nombre: str = None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    al_avanzar=None,
+    forzar: bool = False,
+    conn=None,
+) -> dict:
+    """
+    Suma un export de resultados a `resultados_mes` y reconstruye el índice
+    de tasas, todo en una transacción. Un archivo ya importado (misma
+    huella) se omite salvo con forzar=True, que primero resta lo que sumó
+    la importación anterior.
+    al_avanzar(filas_leidas): callback de progreso opcional.
+    """
+    conn = _conexion(conn)
+    config = precios.actual()
+    huella = _huella(origen)
+    nombre = nombre or getattr(origen, "name", None) or str(origen)
+
+    previa = conn.execute(
+        "SELECT id FROM resultados_importaciones WHERE huella = ?", (huella,)
+    ).fetchone()
+    if previa and not forzar:
+        return {"importado": False, "importacion_id": previa[0], "filas": 0, "invalidas": 0}
+
+    filas = invalidas = 0
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # Id nuevo siempre mayor que todos los anteriores: version() cambia
+        # aunque se borre la importación previa (que puede ser la última)
+        importacion_id = version(conn) + 1
+        if previa:
+            _restar_importacion(previa[0], conn)
+        conn.execute(
+            "INSERT INTO resultados_importaciones (id, huella, nombre, importada, filas, invalidas) "
+            "VALUES (?, ?, ?, ?, 0, 0)",
+            (importacion_id, huella, nombre, dt.datetime.now().isoformat(timespec="seconds")),
+        )
+        for chunk in leer_en_chunks(origen, formato, tamano_chunk):
+            agregado, malas = agregar_chunk(chunk, config)
+            filas_agregado = list(agregado[CLAVE + SUMAS].itertuples(index=False, name=None))
+            for tabla, prefijo, conflicto in (
+                ("resultados_mes", (), CLAVE),
+                ("resultados_importaciones_mes", (importacion_id,), ["importacion_id"] + CLAVE),
+            ):
+                columnas = conflicto + SUMAS
+                conn.executemany(
+                    f"""
+                    INSERT INTO {tabla} ({', '.join(columnas)})
+                    VALUES ({', '.join('?' * len(columnas))})
+                    ON CONFLICT ({', '.join(conflicto)}) DO UPDATE SET
+                    {', '.join(f'{c} = {c} + excluded.{c}' for c in SUMAS)}
+                    """,
+                    [prefijo + fila for fila in filas_agregado],
+                )
+            filas += len(chunk)
+            invalidas += malas
+            if al_avanzar:
+                al_avanzar(filas)
+
+        conn.execute(
+            "UPDATE resultados_importaciones SET filas = ?, invalidas = ? WHERE id = ?",
+            (filas, invalidas, importacion_id),
+        )
+        reconstruir_indice(conn)
+    return {
+        "importado": True,
+        "importacion_id": importacion_id,
+        "filas": filas,
+        "invalidas": invalidas,
+    }
+
+def _restar_importacion(importacion_id: int, conn):
+    """
+    Resta de `resultados_mes` lo que sumó una importación y la borra.
+    Se llama dentro de la transacción de importar_resultados.
+    """
+    conn.execute(
+        f"""
+        UPDATE resultados_mes AS r SET
+        {', '.join(f'{c} = r.{c} - d.{c}' for c in SUMAS)}
+        FROM resultados_importaciones_mes AS d
+        WHERE d.importacion_id = ? AND {' AND '.join(f'r.{c} = d.{c}' for c in CLAVE)}
+        """,
+        (importacion_id,),
+    )
+    # Los meses que quedan en cero no cuentan como meses con datos
+    conn.execute(
+        f"DELETE FROM resultados_mes WHERE {' AND '.join(f'{c} = 0' for c in CONTEOS)} "
+        "AND ABS(costo_cop) < 1e-6"
+    )
+    conn.execute("DELETE FROM resultados_importaciones_mes WHERE importacion_id = ?", (importacion_id,))
+    conn.execute("DELETE FROM resultados_importaciones WHERE id = ?", (importacion_id,))
+
+# ------------------ ÍNDICE DE TASAS ------------------ #
+
+def _mes_menos(mes: str, meses: int) -> str:
+    anio, m = map(int, mes.split("-"))
+    total = anio * 12 + (m - 1) - meses
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+def _desde(ultimo: str, ventana: int) -> str:
+    """
+    Primer mes de la ventana que termina en `ultimo` (0 = todo el historial).
+    """
+    return _mes_menos(ultimo, ventana - 1) if ventana else "0000-00"
+
+def _niveles(pais: str, segmento: str, canal: str) -> tuple:
+    return ((pais, segmento, canal), (pais, TODOS, canal), (TODOS, TODOS, canal))
+
+def reconstruir_indice(conn=None):
+    """
+    Recalcula `tasas_indice` desde `resultados_mes` (O(claves × meses), no
+    O(filas importadas)). Lo llama importar_resultados.
+    """
+    conn = _conexion(conn)
+    ultimo = conn.execute("SELECT MAX(mes) FROM resultados_mes").fetchone()[0]
+    conn.execute("DELETE FROM tasas_indice")
+    if ultimo is None:
+        return
+
+    sumas = ", ".join(f"SUM({c})" for c in SUMAS)
+    niveles = (
+        ("pais", "segmento", "pais, segmento, canal"),
+        ("pais", f"'{TODOS}'", "pais, canal"),
+        (f"'{TODOS}'", f"'{TODOS}'", "canal"),
+    )
+    for ventana in VENTANAS:
+        for pais, segmento, grupo in niveles:
+            conn.execute(
+                f"""
+                INSERT INTO tasas_indice
+                SELECT ?, {pais}, {segmento}, canal, MIN(mes), MAX(mes), {sumas}
+                FROM resultados_mes WHERE mes >= ? GROUP BY {grupo}
+                """,
+                (ventana, _desde(ultimo, ventana)),
+            )
+
+# ------------------ CACHÉ DEL ÍNDICE Y DEL MODELO ------------------ #
+
+_cache = {"clave": None, "indice": {}, "modelos": {}}
+_cache_lock = threading.Lock()
+
+def version(conn=None) -> int:
+    """
+    Id de la última importación (0 sin datos); cambia con cada importación.
+    """
+    conn = _conexion(conn)
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM resultados_importaciones").fetchone()[0]
+
+def _clave_cache(conn) -> tuple:
+    # Por archivo y no por conexión: cada hilo de Streamlit tiene la suya
+    archivo = conn.execute("PRAGMA database_list").fetchone()[2]
+    return archivo, version(conn)
+
+def _vigente(conn):
+    """
+    Vacía la caché si los datos cambiaron desde que se cargó. Llamar con
+    _cache_lock tomado.
+    """
+    clave = _clave_cache(conn)
+    if _cache["clave"] != clave:
+        _cache.update(clave=clave, indice={}, modelos={})
+
+def _cargar_indice(ventana: int, conn) -> dict:
+    por_ventana = _cache["indice"].get(ventana)
+    if por_ventana is None:
+        filas = conn.execute(
+            f"SELECT pais, segmento, canal, desde, hasta, {', '.join(SUMAS)} "
+            "FROM tasas_indice WHERE ventana = ?",
+            (ventana,),
+        ).fetchall()
+        por_ventana = _cache["indice"][ventana] = {
+            tuple(f[:3]): dict(zip(["desde", "hasta"] + SUMAS, f[3:])) for f in filas
+        }
+    return por_ventana
+
+def indice(ventana: int = VENTANA_DEFAULT, conn=None) -> dict:
+    """
+    {(pais, segmento, canal): conteos} de una ventana, cacheado por proceso
+    y por versión de los datos.
+    """
+    conn = _conexion(conn)
+    with _cache_lock:
+        _vigente(conn)
+        return _cargar_indice(ventana, conn)
+
+def modelo(ventana: int = VENTANA_DEFAULT, config=None, conn=None) -> posteriores.PosterioresTasas:
+    """
+    Posteriores Beta del índice de una ventana con los defaults de `config`
+    como prior, cacheadas por versión de los datos y de los precios.
+    """
+    conn = _conexion(conn)
+    config = config or precios.actual()
+    with _cache_lock:
+        _vigente(conn)
+        clave = (ventana, config.version)
+        modelo_ventana = _cache["modelos"].get(clave)
+        if modelo_ventana is None:
+            modelo_ventana = _cache["modelos"][clave] = posteriores.PosterioresTasas.desde_conteos(
+                _cargar_indice(ventana, conn), config
+            )
+    return modelo_ventana
+
+# ------------------ RESULTADO DE UNA CAMPAÑA ------------------ #
+
+def registrar_resultado(
+    pais: str,
+    segmento: str,
+    canal: str,
+    fecha,
+    contactos: int,
+    entregados: int = 0,
+    respuestas: int = 0,
+    mql: int = 0,
+    sql: int = 0,
+    costo: float = 0.0,
+    moneda: str = "COP",
+    nombre: str = None,
+    conn=None,
+) -> int:
+    """
+    Suma el resultado de una campaña sin reconstruir nada: actualiza su fila
+    de `resultados_mes`, las filas del índice de las ventanas que contienen
+    su mes (tres niveles) y, en memoria, el índice y las posteriores
+    cacheadas. Si el mes es posterior al último con datos las ventanas se
+    corren y el índice se reconstruye. Un costo en USD se pasa a COP con
+    la tasa de cambio de `fecha`. Devuelve el id de la importación.
+    """
+    conn = _conexion(conn)
+    canal = _canales_canonicos(precios.actual()).get(str(canal).strip().lower(), str(canal).strip())
+    mes = pd.Timestamp(fecha).strftime("%Y-%m")
+    valores = dict(zip(CONTEOS, (int(contactos), int(entregados), int(respuestas), int(mql), int(sql))))
+    valores["costo_cop"] = cambio.a_cop(costo, moneda, cambio.tabla().tasa_en(fecha))
+    if min(valores.values()) < 0:
+        raise ValueError("Los conteos y el costo del resultado no pueden ser negativos.")
+
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        clave_previa = _clave_cache(conn)
+        ultimo = conn.execute("SELECT MAX(mes) FROM resultados_mes").fetchone()[0]
+        conn.execute(
+            f"""
+            INSERT INTO resultados_mes ({', '.join(CLAVE + SUMAS)})
+            VALUES ({', '.join('?' * len(CLAVE + SUMAS))})
+            ON CONFLICT ({', '.join(CLAVE)}) DO UPDATE SET
+            {', '.join(f'{c} = {c} + excluded.{c}' for c in SUMAS)}
+            """,
+            (pais, segmento, canal, mes, *valores.values()),
+        )
+        cursor = conn.execute(
+            "INSERT INTO resultados_importaciones (huella, nombre, importada, filas, invalidas) "
+            "VALUES (?, ?, ?, 1, 0)",
+            (f"resultado:{uuid.uuid4().hex}", nombre or f"{canal} {pais} {mes}",
+             dt.datetime.now().isoformat(timespec="seconds")),
+        )
+        incremental = ultimo is not None and mes <= ultimo
+        ventanas = [v for v in VENTANAS if incremental and mes >= _desde(ultimo, v)]
+        if not incremental:
+            reconstruir_indice(conn)
+        for ventana in ventanas:
+            conn.executemany(
+                f"""
+                INSERT INTO tasas_indice VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * len(SUMAS))})
+                ON CONFLICT (ventana, pais, segmento, canal) DO UPDATE SET
+                desde = MIN(desde, excluded.desde), hasta = MAX(hasta, excluded.hasta),
+                {', '.join(f'{c} = {c} + excluded.{c}' for c in SUMAS)}
+                """,
+                [(ventana, *nivel, mes, mes, *valores.values()) for nivel in _niveles(pais, segmento, canal)],
+            )
+
+    # La caché en memoria se actualiza igual que la base si estaba al día
+    with _cache_lock:
+        if not incremental or _cache["clave"] != clave_previa:
+            return cursor.lastrowid
+        _cache["clave"] = _clave_cache(conn)
+        for ventana, por_clave in _cache["indice"].items():
+            if ventana not in ventanas:
+                continue
+            for nivel in _niveles(pais, segmento, canal):
+                datos = por_clave.setdefault(nivel, {"desde": mes, "hasta": mes, **dict.fromkeys(SUMAS, 0)})
+                datos["desde"], datos["hasta"] = min(datos["desde"], mes), max(datos["hasta"], mes)
+                for c in SUMAS:
+                    datos[c] += valores[c]
+        for (ventana, _), modelo_ventana in _cache["modelos"].items():
+            if ventana in ventanas:
+                modelo_ventana.actualizar(pais, segmento, canal, valores["contactos"], valores["mql"], valores["sql"])
+    return cursor.lastrowid
+
+# ------------------ TASAS POR DEFECTO ------------------ #
+
+def tasas_default(
+    canal: str,
+    pais: str,
+    segmento: str = TODOS,
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    ventana: int = VENTANA_DEFAULT,
+    credibilidad: float = posteriores.CREDIBILIDAD,
+    config=None,
+    conn=None,
+) -> dict:
+    """
+    Tasas por defecto de un canal con su intervalo creíble.
+    Con resultados: media posterior del nivel más específico con datos
+    (país × segmento × canal → país × canal → canal), que ya viene
+    encogida hacia su nivel superior. Sin resultados del canal: las tasas
+    de la config, con el intervalo de su prior.
+    tasa_mql = MQL / contactos; tasa_sql = SQL / contactos en funnel
+    directo y SQL / MQL en MQL → SQL (misma semántica que los inputs).
+    """
+    config = config or precios.actual()
+    modelo_ventana = modelo(ventana, config, conn)
+    por_clave = indice(ventana, conn)
+    nombre_sql = "tasa_sql_directo" if tipo_funnel == FUNNEL_DIRECTO else "tasa_sql_mql"
+
+    for clave in _niveles(pais, segmento, canal):
+        datos = por_clave.get(clave)
+        if not datos or datos["contactos"] <= 0:
+            continue
+        post = modelo_ventana.posteriores([clave], credibilidad)
+        return {
+            "tasa_mql": float(post["tasa_mql"]["media"][0]),
+            "tasa_sql": float(post[nombre_sql]["media"][0]),
+            "intervalo_mql": (float(post["tasa_mql"]["inferior"][0]), float(post["tasa_mql"]["superior"][0])),
+            "intervalo_sql": (float(post[nombre_sql]["inferior"][0]), float(post[nombre_sql]["superior"][0])),
+            "credibilidad": credibilidad,
+            "fuente": "historico",
+            "nivel": clave[:2],
+            "contactos": datos["contactos"],
+            "desde": datos["desde"],
+            "hasta": datos["hasta"],
+        }
+
+    prior = modelo_ventana.prior(canal, credibilidad)
+    return {
+        "tasa_mql": prior["tasa_mql"]["media"],
+        "tasa_sql": prior[nombre_sql]["media"],
+        "intervalo_mql": (prior["tasa_mql"]["inferior"], prior["tasa_mql"]["superior"]),
+        "intervalo_sql": (prior[nombre_sql]["inferior"], prior[nombre_sql]["superior"]),
+        "credibilidad": credibilidad,
+        "fuente": "config",
+    }
+
+def tasas_claves(
+    claves,
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    ventana: int = VENTANA_DEFAULT,
+    config=None,
+    conn=None,
+) -> dict:
+    """
+    tasas_default (solo las medias) para muchas claves (pais, segmento,
+    canal) a la vez: cada clave se resuelve a su nivel con datos y las
+    posteriores de los niveles distintos se calculan en una sola pasada.
+    Devuelve {"tasa_mql", "tasa_sql"} como arreglos alineados con `claves`.
+    """
+    config = config or precios.actual()
+    modelo_ventana = modelo(ventana, config, conn)
+    por_clave = indice(ventana, conn)
+    nombre_sql = "tasa_sql_directo" if tipo_funnel == FUNNEL_DIRECTO else "tasa_sql_mql"
+
+    claves = [tuple(c) for c in claves]
+    channels = config.channels
+    tasa_mql, tasa_sql = (
+        np.array([channels.get(c[2], {}).get(col, 0.0) for c in claves], dtype="float64")
+        for col in ("tasa_mql", "tasa_sql")
+    )
+
+    niveles = [
+        next((n for n in _niveles(*clave) if por_clave.get(n, {}).get("contactos", 0) > 0), None)
+        for clave in claves
+    ]
+    distintos = list(dict.fromkeys(n for n in niveles if n is not None))
+    if distintos:
+        post = modelo_ventana.posteriores(distintos)
+        fila = {n: i for i, n in enumerate(distintos)}
+        con_datos = np.array([n is not None for n in niveles])
+        filas = np.array([fila[n] for n in niveles if n is not None], dtype="int64")
+        tasa_mql[con_datos] = post["tasa_mql"]["media"][filas]
+        tasa_sql[con_datos] = post[nombre_sql]["media"][filas]
+    return {"tasa_mql": tasa_mql, "tasa_sql": tasa_sql}
+
+# ------------------ CONSULTAS ------------------ #
+
+def tabla_indice(ventana: int = VENTANA_DEFAULT, conn=None) -> pd.DataFrame:
+    """
+    El índice de una ventana con sus tasas (para mostrar).
+    """
+    conn = _conexion(conn)
+    tabla = pd.read_sql_query(
+        f"SELECT pais, segmento, canal, desde, hasta, {', '.join(SUMAS)} "
+        "FROM tasas_indice WHERE ventana = ? ORDER BY pais, segmento, canal",
+        conn,
+        params=(ventana,),
+    )
+    contactos = tabla["contactos"].to_numpy(dtype="float64")
+    for col, num, den in (
+        ("tasa_entrega", "entregados", contactos),
+        ("tasa_respuesta", "respuestas", tabla["entregados"].to_numpy(dtype="float64")),
+        ("tasa_mql", "mql", contactos),
+        ("tasa_sql_directo", "sql", contactos),
+        ("tasa_sql_mql", "sql", tabla["mql"].to_numpy(dtype="float64")),
+        ("costo_por_sql_cop", "costo_cop", tabla["sql"].to_numpy(dtype="float64")),
+    ):
+        tabla[col] = np.divide(
+            tabla[num].to_numpy(dtype="float64"), den, out=np.full(len(tabla), np.nan), where=den > 0
+        )
+    return tabla
+
+def listar_importaciones(conn=None) -> pd.DataFrame:
+    conn = _conexion(conn)
+    return pd.read_sql_query(
+        "SELECT id, nombre, importada, filas, invalidas FROM resultados_importaciones ORDER BY id DESC",
+        conn,
+    )
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa resultados históricos y calibra tasas.")
+    parser.add_argument("resultados", help="Archivo de resultados (.csv o .parquet)")
+    parser.add_argument("--formato", choices=list(("csv", "parquet")), help="Forzar formato")
+    parser.add_argument("--chunk", type=int, default=TAMANO_CHUNK, help="Filas por chunk")
+    parser.add_argument("--forzar", action="store_true", help="Reimportar aunque ya esté (reemplaza lo que sumó antes)")
+    parser.add_argument("--ventana", type=int, default=VENTANA_DEFAULT, choices=VENTANAS)
+    args = parser.parse_args(argv)
+
+    res = importar_resultados(
+        args.resultados,
+        formato=args.formato,
+        tamano_chunk=args.chunk,
+        al_avanzar=lambda n: print(f"\rFilas leídas: {n:,}", end="", flush=True),
+        forzar=args.forzar,
+    )
+    print()
+    if not res["importado"]:
+        print(f"El archivo ya estaba importado (importación #{res['importacion_id']}).")
+    else:
+        print(f"Importación #{res['importacion_id']}: {res['filas']:,} filas ({res['invalidas']:,} inválidas).")
+    tabla = tabla_indice(args.ventana)
+    if not tabla.empty:
+        print(tabla.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Importación masiva de planes de campaña (CSV / Parquet) por chunks.
+
+Cada chunk pasa por el motor vectorizado y se descarta después de
+escribirlo al archivo de salida; solo se acumulan los totales y el uso
+de cupos por país / período / segmento / canal.
+
+Uso por consola:
+    python -m mdhub.importacion plan.csv -o resultados.csv
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+from . import motor, precios
+from .costos import _canal_to_budget_key, _segmento_to_budget_key, get_budget_envios_max
+
+TAMANO_CHUNK = 100_000
+
+FORMATOS = ("csv", "parquet")
+
+# Columnas que se escriben al archivo de resultados
+COLUMNAS_RESULTADO = list(motor.COLUMNAS_ENTRADA) + motor.COLUMNAS_SALIDA
+
+# ------------------ LECTURA POR CHUNKS ------------------ #
+
+def _inferir_formato(origen, formato=None) -> str:
+    if formato:
+        formato = formato.lower()
+    else:
+        nombre = origen if isinstance(origen, (str, os.PathLike)) else getattr(origen, "name", "")
+        formato = os.path.splitext(str(nombre))[1].lstrip(".").lower() or "csv"
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato} (usa {' / '.join(FORMATOS)})")
+    return formato
+
+def leer_en_chunks(
+    origen,
+    formato=None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    columnas=None,
+    como_texto: bool = False,
+):
+    """
+    Genera DataFrames de a lo sumo tamano_chunk filas a partir de un
+    archivo CSV o Parquet (ruta o file-like), sin cargarlo completo.
+    columnas: lee solo esas columnas (None = todas).
+    como_texto: en CSV lee todo como texto (conserva ceros y "+" de teléfonos).
+    """
+    formato = _inferir_formato(origen, formato)
+
+    if formato == "csv":
+        with pd.read_csv(
+            origen,
+            chunksize=tamano_chunk,
+            usecols=columnas,
+            dtype=str if como_texto else None,
+        ) as lector:
+            yield from lector
+        return
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Leer Parquet requiere pyarrow (pip install pyarrow)."
+        ) from exc
+
+    archivo = pq.ParquetFile(origen)
+    for lote in archivo.iter_batches(batch_size=tamano_chunk, columns=columnas):
+        yield lote.to_pandas()
+
+# ------------------ ACUMULADOR ------------------ #
+
+class AcumuladorPlan:
+    """
+    Acumula totales y uso de cupos de los chunks ya calculados.
+    El estado es O(#combinaciones país/período/segmento/canal), no O(#filas).
+    """
+
+    def __init__(self, config=None):
+        self.config = config
+        self.filas = 0
+        self.total_base = 0
+        self.total_envios = 0.0
+        self.total_mql = 0
+        self.total_sql = 0
+        self.total_costo_cop = 0.0
+        self.envios_por_cupo = {}
+
+    def agregar(self, resultado: pd.DataFrame):
+        tot = motor.totales(resultado)
+        self.filas += len(resultado)
+        self.total_base += tot["total_base"]
+        self.total_envios += tot["total_envios"]
+        self.total_mql += tot["total_mql"]
+        self.total_sql += tot["total_sql"]
+        self.total_costo_cop += tot["total_costo_cop"]
+
+        # Claves de budget resueltas una vez por valor distinto
+        seg_keys = resultado["segmento"].map(
+            {s: _segmento_to_budget_key(s) for s in resultado["segmento"].unique()}
+        )
+        canal_keys = resultado["canal"].map(
+            {c: _canal_to_budget_key(c) for c in resultado["canal"].unique()}
+        )
+        envios = pd.DataFrame(
+            {
+                "pais": resultado["pais"],
+                "periodo": resultado["periodo"],
+                "segmento": seg_keys,
+                "canal": canal_keys,
+                "envios": resultado["envios"],
+            }
+        ).dropna(subset=["segmento", "canal"])
+
+        agrupado = envios.groupby(["pais", "periodo", "segmento", "canal"])["envios"].sum()
+        for clave, valor in agrupado.items():
+            self.envios_por_cupo[clave] = self.envios_por_cupo.get(clave, 0.0) + float(valor)
+
+    def resumen(self) -> dict:
+        return {
+            "filas": self.filas,
+            "total_base": self.total_base,
+            "total_envios": self.total_envios,
+            "total_mql": self.total_mql,
+            "total_sql": self.total_sql,
+            "total_costo_cop": self.total_costo_cop,
+            "costo_por_sql_cop": (
+                self.total_costo_cop / self.total_sql if self.total_sql > 0 else 0.0
+            ),
+        }
+
+    def uso_cupos(self) -> pd.DataFrame:
+        """
+        Tabla de uso de cupos (mismas columnas que la Calculadora).
+        """
+        filas = []
+        for (pais, periodo, segmento, canal), envios in sorted(self.envios_por_cupo.items()):
+            envios = int(envios)
+            cap_max = get_budget_envios_max(pais, periodo, segmento, canal, self.config)
+            if cap_max is None:
+                restante = None
+                pct = None
+            else:
+                restante = max(cap_max - envios, 0)
+                pct = round(envios / cap_max * 100.0, 1) if cap_max > 0 else 0.0
+            filas.append(
+                {
+                    "pais": pais,
+                    "periodo": periodo,
+                    "segmento": segmento,
+                    "canal": canal,
+                    "envios_campaña": envios,
+                    "cupo_disponible": cap_max,
+                    "%_uso": pct,
+                    "envios_restantes": restante,
+                }
+            )
+        return pd.DataFrame(
+            filas,
+            columns=[
+                "pais",
+                "periodo",
+                "segmento",
+                "canal",
+                "envios_campaña",
+                "cupo_disponible",
+                "%_uso",
+                "envios_restantes",
+            ],
+        )
+
+# ------------------ PROCESO COMPLETO ------------------ #
+
+def procesar_plan(
+    origen,
+    destino=None,
+    formato=None,
+    tamano_chunk: int = TAMANO_CHUNK,
+    al_avanzar=None,
+) -> AcumuladorPlan:
+    """
+    Procesa un plan completo por chunks.
+
+    destino: ruta o file-like de texto donde se escriben los resultados en
+    CSV a medida que se calculan (None = no se escriben).
+    al_avanzar: callback opcional al_avanzar(filas_procesadas).
+    Todo el plan se calcula con el mismo snapshot de precios, aunque la
+    configuración se recargue a mitad del proceso.
+    """
+    config = precios.actual()
+    acumulador = AcumuladorPlan(config)
+
+    propio = isinstance(destino, (str, os.PathLike))
+    salida = open(destino, "w", newline="", encoding="utf-8") if propio else destino
+    try:
+        for i, chunk in enumerate(leer_en_chunks(origen, formato, tamano_chunk)):
+            resultado = motor.calcular_canales(chunk, config)
+            acumulador.agregar(resultado)
+            if salida is not None:
+                resultado[COLUMNAS_RESULTADO].to_csv(salida, header=(i == 0), index=False)
+            if al_avanzar is not None:
+                al_avanzar(acumulador.filas)
+    finally:
+        if propio:
+            salida.close()
+
+    return acumulador
+
+# ------------------ CLI ------------------ #
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcula un plan de campañas (CSV / Parquet) por chunks."
+    )
+    parser.add_argument("plan", help="Archivo del plan (.csv o .parquet)")
+    parser.add_argument("-o", "--salida", help="CSV de resultados por fila")
+    parser.add_argument("--formato", choices=FORMATOS, help="Forzar formato de entrada")
+    parser.add_argument("--chunk", type=int, default=TAMANO_CHUNK, help="Filas por chunk")
+    args = parser.parse_args(argv)
+
+    acumulador = procesar_plan(args.plan, args.salida, args.formato, args.chunk)
+    resumen = acumulador.resumen()
+
+    print(f"Filas: {resumen['filas']:,}")
+    print(f"Base total: {resumen['total_base']:,}")
+    print(f"Envíos totales: {resumen['total_envios']:,.0f}")
+    print(f"SQL totales: {resumen['total_sql']:,}")
+    print(f"Costo total: {resumen['total_costo_cop']:,.0f} COP")
+    print(f"Costo por SQL: {resumen['costo_por_sql_cop']:,.0f} COP")
+
+    cupos = acumulador.uso_cupos()
+    if not cupos.empty:
+        print()
+        print(cupos.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
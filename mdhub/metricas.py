@@ -0,0 +1,195 @@
+"""
+Métricas de tiempo por fase (sin Streamlit).
+
+`medir("fase")` cronometra un bloque con perf_counter y:
+- acumula la duración en el registro del proceso (conteo, total, máximo y
+  las últimas MUESTRAS duraciones para P50 / P95), compartido por sesiones;
+- la agrega a la traza del rerun en curso (ver `contexto`);
+- si MDHUB_METRICAS_LOG apunta a un archivo, escribe una línea JSON por
+  medición ({"ts", "fase", "ms", ...etiquetas}) para agregarlas después.
+
+Las etiquetas de `contexto` (sesión, rerun, página…) viajan en un
+ContextVar, así que cada hilo de Streamlit ve solo las suyas.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MUESTRAS = 500  # duraciones recientes por fase para los percentiles
+
+_LOG = logging.getLogger("mdhub.metricas")
+_LOG.addHandler(logging.NullHandler())
+_LOG.propagate = False
+_log_configurado = False
+_log_lock = threading.Lock()
+
+_CONTEXTO = contextvars.ContextVar("mdhub_metricas_contexto", default=None)
+
+# ------------------ LOG JSON ------------------ #
+
+def ruta_log():
+    return os.environ.get("MDHUB_METRICAS_LOG") or None
+
+def configurar_log(ruta: str = None):
+    """
+    Agrega un FileHandler de líneas JSON al logger "mdhub.metricas".
+    Sin ruta ni MDHUB_METRICAS_LOG no hace nada (el log queda apagado).
+    """
+    global _log_configurado
+    with _log_lock:
+        _log_configurado = True
+        ruta = ruta or ruta_log()
+        if not ruta:
+            return
+        handler = logging.FileHandler(ruta, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _LOG.addHandler(handler)
+        _LOG.setLevel(logging.INFO)
+
+def _escribir_log(registro: dict):
+    if not _log_configurado:
+        configurar_log()
+    if _LOG.isEnabledFor(logging.INFO):
+        _LOG.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+# ------------------ REGISTRO ------------------ #
+
+class RegistroTiempos:
+    """
+    Agregado de duraciones por fase, seguro para varios hilos.
+    """
+
+    def __init__(self, muestras: int = MUESTRAS):
+        self.muestras = muestras
+        self._fases = {}
+        self._lock = threading.Lock()
+
+    def agregar(self, fase: str, ms: float):
+        with self._lock:
+            datos = self._fases.get(fase)
+            if datos is None:
+                datos = self._fases[fase] = {
+                    "conteo": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "recientes": deque(maxlen=self.muestras),
+                }
+            datos["conteo"] += 1
+            datos["total_ms"] += ms
+            datos["max_ms"] = max(datos["max_ms"], ms)
+            datos["recientes"].append(ms)
+
+    def resumen(self) -> list:
+        """
+        Una fila por fase (orden alfabético) con conteo, P50 / P95 de las
+        mediciones recientes, máximo y total.
+        """
+        with self._lock:
+            copia = {f: (d, sorted(d["recientes"])) for f, d in self._fases.items()}
+        filas = []
+        for fase in sorted(copia):
+            datos, recientes = copia[fase]
+            filas.append(
+                {
+                    "fase": fase,
+                    "conteo": datos["conteo"],
+                    "p50_ms": _percentil(recientes, 0.50),
+                    "p95_ms": _percentil(recientes, 0.95),
+                    "max_ms": datos["max_ms"],
+                    "total_ms": datos["total_ms"],
+                }
+            )
+        return filas
+
+    def limpiar(self):
+        with self._lock:
+            self._fases.clear()
+
+def _percentil(ordenados: list, q: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+REGISTRO = RegistroTiempos()
+
+# ------------------ MEDICIÓN ------------------ #
+
+@contextmanager
+def contexto(**etiquetas):
+    """
+    Etiquetas que se agregan a cada medición del bloque. Devuelve la traza
+    (lista de mediciones) del contexto más externo: los contextos anidados
+    suman etiquetas pero comparten la traza.
+    """
+    padre = _CONTEXTO.get()
+    if padre is None:
+        estado = {"etiquetas": dict(etiquetas), "traza": []}
+    else:
+        estado = {"etiquetas": {**padre["etiquetas"], **etiquetas}, "traza": padre["traza"]}
+    token = _CONTEXTO.set(estado)
+    try:
+        yield estado["traza"]
+    finally:
+        _CONTEXTO.reset(token)
+
+def registrar(fase: str, ms: float, **etiquetas):
+    """
+    Registra una duración ya medida (en milisegundos).
+    """
+    REGISTRO.agregar(fase, ms)
+    estado = _CONTEXTO.get()
+    medicion = {"fase": fase, "ms": round(ms, 3), **etiquetas}
+    if estado is not None:
+        estado["traza"].append(medicion)
+        medicion = {**estado["etiquetas"], **medicion}
+    _escribir_log({"ts": round(time.time(), 3), **medicion})
+
+@contextmanager
+def medir(fase: str, **etiquetas):
+    """
+    Cronometra el bloque y lo registra como `fase`, aunque levante excepción.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(fase, (time.perf_counter() - inicio) * 1000.0, **etiquetas)
+
+def estadisticas() -> list:
+    return REGISTRO.resumen()
+
+# ------------------ MEMORIA ------------------ #
+
+def tamano_profundo(obj, _vistos=None) -> int:
+    """
+    Bytes aproximados de `obj` y lo que contiene. DataFrames y Series con
+    memory_usage(deep=True), arreglos NumPy con nbytes, contenedores de
+    forma recursiva; cada objeto se cuenta una sola vez.
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+
+    uso = getattr(obj, "memory_usage", None)
+    if callable(uso) and hasattr(obj, "dtypes"):
+        total = uso(deep=True)
+        return int(total.sum() if hasattr(total, "sum") else total)
+    if hasattr(obj, "nbytes") and hasattr(obj, "dtype"):
+        return int(obj.nbytes)
+
+    total = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        for clave, valor in obj.items():
+            total += tamano_profundo(clave, vistos) + tamano_profundo(valor, vistos)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for valor in obj:
+            total += tamano_profundo(valor, vistos)
+    return total
@@ -0,0 +1,147 @@
+"""
+Motor Monte Carlo de resultados del funnel.
+
+Para cada canal se simulan entregas, MQL y SQL como binomiales encadenadas
+(opcionalmente con tasas Beta para reflejar la incertidumbre de las tasas),
+en bloques de simulaciones con draws de NumPy por lotes. Cada bloque usa su
+propia semilla derivada de la semilla principal (SeedSequence.spawn), así
+que el resultado es el mismo corriendo en serie o en un pool de procesos.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .motor import FUNNEL_DIRECTO
+
+SEMILLA = 42
+TAMANO_BLOQUE = 50_000           # simulaciones por bloque
+UMBRAL_PROCESOS = 2_000_000      # muestras (simulaciones × canales) para usar procesos
+PERCENTILES = (10, 50, 90)
+
+# ------------------ SIMULACIÓN DE UN BLOQUE ------------------ #
+
+def _tasas(rng, tasa, n_sim, concentracion):
+    """
+    Tasas por simulación: fijas, o Beta con media `tasa` y
+    concentración κ = α + β (mayor κ = menos incertidumbre).
+    """
+    tasa = np.broadcast_to(tasa, (n_sim, len(tasa)))
+    if not concentracion:
+        return tasa
+    a = np.clip(tasa * concentracion, 1e-12, None)
+    b = np.clip((1.0 - tasa) * concentracion, 1e-12, None)
+    muestras = rng.beta(a, b)
+    # Tasas 0 o 1 se mantienen exactas (sin incertidumbre)
+    return np.where((tasa <= 0.0) | (tasa >= 1.0), tasa, muestras)
+
+def _simular_bloque(args):
+    (
+        semilla,
+        n_sim,
+        base,
+        costo_envio_cop,
+        envios_contacto,
+        tasa_mql,
+        tasa_sql,
+        directo,
+        tasa_entrega,
+        concentracion,
+        cobro_por_entrega,
+    ) = args
+    rng = np.random.default_rng(semilla)
+    forma = (n_sim, len(base))
+
+    entregados = rng.binomial(base, tasa_entrega, size=forma)
+    p_sql = _tasas(rng, tasa_sql, n_sim, concentracion)
+    p_mql = _tasas(rng, tasa_mql, n_sim, concentracion)
+
+    # Directo: SQL ~ Bin(entregados, tasa_sql) y MQL = SQL
+    # MQL → SQL: MQL ~ Bin(entregados, tasa_mql), SQL ~ Bin(MQL, tasa_sql)
+    mql = np.where(directo, 0, rng.binomial(entregados, np.where(directo, 0.0, p_mql)))
+    sql = rng.binomial(np.where(directo, entregados, mql), p_sql)
+    mql = np.where(directo, sql, mql)
+
+    if cobro_por_entrega:
+        costo = (entregados * envios_contacto * costo_envio_cop).sum(axis=1)
+    else:
+        costo = np.full(n_sim, float((base * envios_contacto * costo_envio_cop).sum()))
+
+    return sql.astype("int32"), mql.sum(axis=1), costo
+
+# ------------------ API ------------------ #
+
+def simular(
+    resultado,
+    n_sim: int = 10_000,
+    semilla: int = SEMILLA,
+    tasa_entrega: float = 1.0,
+    concentracion=None,
+    cobro_por_entrega: bool = False,
+    procesos=None,
+) -> dict:
+    """
+    Simula n_sim veces los canales de un resultado de motor.calcular_canales.
+
+    tasa_entrega: probabilidad de que un contacto reciba el mensaje.
+    concentracion: κ de las tasas Beta (None = tasas fijas).
+    cobro_por_entrega: si True el costo se cobra solo por entregados.
+    procesos: workers del pool (None = os.cpu_count()); el pool solo se usa
+    si simulaciones × canales supera UMBRAL_PROCESOS.
+    """
+    base = resultado["base"].to_numpy(dtype="int64")
+    envios = resultado["envios"].to_numpy(dtype="float64")
+    envios_contacto = np.divide(envios, base, out=np.zeros(len(base)), where=base > 0)
+    parametros = (
+        base,
+        resultado["costo_unit_cop"].to_numpy(dtype="float64"),
+        envios_contacto,
+        resultado["tasa_mql"].to_numpy(dtype="float64"),
+        resultado["tasa_sql"].to_numpy(dtype="float64"),
+        (resultado["tipo_funnel"] == FUNNEL_DIRECTO).to_numpy(),
+        float(tasa_entrega),
+        concentracion,
+        cobro_por_entrega,
+    )
+
+    tamanos = [TAMANO_BLOQUE] * (n_sim // TAMANO_BLOQUE)
+    if n_sim % TAMANO_BLOQUE:
+        tamanos.append(n_sim % TAMANO_BLOQUE)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [(s, n) + parametros for s, n in zip(semillas, tamanos)]
+
+    usar_procesos = n_sim * len(base) >= UMBRAL_PROCESOS and len(tareas) > 1
+    if usar_procesos:
+        workers = min(procesos or os.cpu_count() or 1, len(tareas))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            bloques = list(pool.map(_simular_bloque, tareas))
+    else:
+        bloques = [_simular_bloque(t) for t in tareas]
+
+    sql_canal = np.concatenate([b[0] for b in bloques])
+    mql_total = np.concatenate([b[1] for b in bloques])
+    costo_total = np.concatenate([b[2] for b in bloques])
+    sql_total = sql_canal.sum(axis=1, dtype="int64")
+
+    return resumir(sql_canal, sql_total, mql_total, costo_total, usar_procesos)
+
+def resumir(sql_canal, sql_total, mql_total, costo_total, usar_procesos=False) -> dict:
+    """
+    Percentiles P10/P50/P90 de SQL, MQL, costo y costo por SQL.
+    El costo por SQL se calcula solo sobre simulaciones con SQL > 0.
+    """
+    con_sql = sql_total > 0
+    cps = costo_total[con_sql] / sql_total[con_sql]
+    return {
+        "simulaciones": len(sql_total),
+        "procesos": usar_procesos,
+        "sql": np.percentile(sql_total, PERCENTILES),
+        "mql": np.percentile(mql_total, PERCENTILES),
+        "costo_cop": np.percentile(costo_total, PERCENTILES),
+        "costo_por_sql_cop": (
+            np.percentile(cps, PERCENTILES) if len(cps) else np.full(len(PERCENTILES), np.nan)
+        ),
+        "prob_sin_sql": float(1.0 - con_sql.mean()),
+        "sql_por_canal": np.percentile(sql_canal, PERCENTILES, axis=0).T,
+    }
@@ -0,0 +1,299 @@
+"""
+Motor vectorizado del funnel de campañas.
+
+Evalúa miles de filas de campaña (país, canal, proveedor, segmento, funnel,
+base, envíos por contacto, tasas, FX) en una sola pasada de NumPy/pandas,
+con los mismos resultados que el cálculo por canal de la Calculadora.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import cambio, precios
+from .costos import costo_cop_vectorizado
+
+FUNNEL_DIRECTO = "Directo a SQL"
+FUNNEL_MQL_SQL = "MQL → SQL"
+
+NOTA_DIRECTO = "todos los contactos efectivos pasan directo a comercial (paso MQL-SQL 100%)"
+NOTA_MQL_SQL = "MQL → SQL según tasas configuradas para el canal"
+
+# Columnas de entrada y su valor por defecto (None = obligatoria).
+# Las tasas vacías se completan con los defaults del canal en la config de precios
+# y el tipo de cambio vacío con la tabla de cambio.py: la tasa del día de la
+# columna opcional "fecha" o, sin fecha, la última publicada.
+COLUMNAS_ENTRADA = {
+    "pais": "Colombia",
+    "canal": None,
+    "proveedor_sms": "Masive",
+    "segmento": "Otro",
+    "periodo": "Mensual",
+    "tipo_funnel": FUNNEL_DIRECTO,
+    "base": None,
+    "envios_contacto": 1.0,
+    "tasa_mql": np.nan,
+    "tasa_sql": np.nan,
+    "tipo_cambio": np.nan,
+}
+
+COLUMNAS_SALIDA = [
+    "envios",
+    "costo_unit_cop",
+    "mql",
+    "sql",
+    "costo_total_cop",
+    "costo_por_sql_cop",
+    "nota",
+]
+
+# ------------------ NORMALIZACIÓN ------------------ #
+
+def normalizar_plan(df: pd.DataFrame, config=None) -> pd.DataFrame:
+    """
+    Devuelve una copia del plan con todas las columnas de entrada,
+    defaults aplicados y tipos numéricos consistentes.
+    """
+    faltantes = [
+        col for col, default in COLUMNAS_ENTRADA.items()
+        if default is None and col not in df.columns
+    ]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias en el plan: {', '.join(faltantes)}")
+
+    plan = pd.DataFrame(index=df.index)
+    for col, default in COLUMNAS_ENTRADA.items():
+        if col in df.columns:
+            plan[col] = df[col]
+            if default is not None and not (isinstance(default, float) and np.isnan(default)):
+                plan[col] = plan[col].fillna(default)
+        else:
+            plan[col] = default
+
+    for col in ("pais", "canal", "proveedor_sms", "segmento", "periodo", "tipo_funnel"):
+        plan[col] = plan[col].astype(str).str.strip()
+
+    plan["base"] = pd.to_numeric(plan["base"]).fillna(0).astype("int64")
+    for col in ("envios_contacto", "tasa_mql", "tasa_sql", "tipo_cambio"):
+        plan[col] = pd.to_numeric(plan[col]).astype("float64")
+
+    vacias = plan["tipo_cambio"].isna()
+    if vacias.any():
+        if "fecha" in df.columns:
+            plan.loc[vacias, "tipo_cambio"] = cambio.tasas_en(df.loc[vacias, "fecha"])
+        else:
+            plan.loc[vacias, "tipo_cambio"] = cambio.tasa_vigente()[1]
+
+    # Tasas vacías → defaults del canal en la config de precios
+    channels = (config or precios.actual()).channels
+    for col in ("tasa_mql", "tasa_sql"):
+        vacias = plan[col].isna()
+        if vacias.any():
+            defaults = plan.loc[vacias, "canal"].map(
+                lambda c: channels.get(c, {}).get(col, 0.0)
+            )
+            plan.loc[vacias, col] = defaults.astype("float64")
+
+    return plan
+
+# ------------------ CÁLCULO VECTORIZADO ------------------ #
+
+def funnel(base, envios_contacto, tasa_mql, tasa_sql, directo, costo_unit_cop) -> dict:
+    """
+    Núcleo NumPy del funnel sobre arreglos ya normalizados (sin pandas):
+    - envíos = base * envíos por contacto
+    - Directo a SQL: MQL = SQL = floor(base * tasa_sql)
+    - MQL → SQL: MQL = floor(base * tasa_mql), SQL = floor(MQL * tasa_sql)
+    - costo_total_cop = envíos * costo unitario en COP
+    """
+    envios = base * envios_contacto
+    costo_total_cop = envios * costo_unit_cop
+
+    mql = np.where(directo, np.floor(base * tasa_sql), np.floor(base * tasa_mql))
+    sql = np.where(directo, mql, np.floor(mql * tasa_sql))
+
+    costo_por_sql_cop = np.divide(
+        costo_total_cop,
+        sql,
+        out=np.zeros_like(costo_total_cop),
+        where=sql > 0,
+    )
+    return {
+        "envios": envios,
+        "mql": mql.astype("int64"),
+        "sql": sql.astype("int64"),
+        "costo_total_cop": costo_total_cop,
+        "costo_por_sql_cop": costo_por_sql_cop,
+    }
+
+def calcular_canales(df: pd.DataFrame, config=None) -> pd.DataFrame:
+    """
+    Calcula envíos, MQL, SQL y costos para cada fila del plan.
+
+    Misma semántica que el loop por canal de la Calculadora:
+    - envíos = base * envíos por contacto
+    - Directo a SQL: MQL = SQL = floor(base * tasa_sql)
+    - MQL → SQL: MQL = floor(base * tasa_mql), SQL = floor(MQL * tasa_sql)
+    - costo_total_cop = envíos * costo unitario en COP
+
+    config: snapshot de precios (None = precios.actual()).
+    """
+    config = config or precios.actual()
+    plan = normalizar_plan(df, config)
+
+    directo = (plan["tipo_funnel"] == FUNNEL_DIRECTO).to_numpy()
+    costo_unit_cop = costo_cop_vectorizado(
+        plan["canal"].to_numpy(),
+        plan["pais"].to_numpy(),
+        plan["proveedor_sms"].to_numpy(),
+        plan["tipo_cambio"].to_numpy(dtype="float64"),
+        config,
+    )
+    salida = funnel(
+        plan["base"].to_numpy(dtype="int64"),
+        plan["envios_contacto"].to_numpy(dtype="float64"),
+        plan["tasa_mql"].to_numpy(dtype="float64"),
+        plan["tasa_sql"].to_numpy(dtype="float64"),
+        directo,
+        costo_unit_cop,
+    )
+
+    resultado = plan.copy()
+    resultado["envios"] = salida["envios"]
+    resultado["costo_unit_cop"] = costo_unit_cop
+    resultado["mql"] = salida["mql"]
+    resultado["sql"] = salida["sql"]
+    resultado["costo_total_cop"] = salida["costo_total_cop"]
+    resultado["costo_por_sql_cop"] = salida["costo_por_sql_cop"]
+    resultado["nota"] = np.where(directo, NOTA_DIRECTO, NOTA_MQL_SQL)
+    return resultado
+
+def totales(resultado: pd.DataFrame) -> dict:
+    """
+    Totales de un resultado de calcular_canales (base, envíos, MQL, SQL,
+    costo total y costo por SQL en COP).
+    """
+    total_sql = int(resultado["sql"].sum())
+    total_costo_cop = float(resultado["costo_total_cop"].sum())
+    return {
+        "total_base": int(resultado["base"].sum()),
+        "total_envios": float(resultado["envios"].sum()),
+        "total_mql": int(resultado["mql"].sum()),
+        "total_sql": total_sql,
+        "total_costo_cop": total_costo_cop,
+        "costo_por_sql_cop": total_costo_cop / total_sql if total_sql > 0 else 0.0,
+    }
+
+def filas_detalle(resultado: pd.DataFrame) -> list:
+    """
+    Convierte el resultado al formato de filas de "Detalle de la campaña"
+    (enteros truncados y costo por SQL redondeado como en la página).
+    """
+    sql = resultado["sql"].to_numpy()
+    detalle = pd.DataFrame(
+        {
+            "segmento": resultado["segmento"].to_numpy(),
+            "canal": resultado["canal"].to_numpy(),
+            "base": resultado["base"].to_numpy(),
+            "envios": np.trunc(resultado["envios"].to_numpy()).astype("int64"),
+            "mql": resultado["mql"].to_numpy(),
+            "sql": sql,
+            "costo_total_cop": np.trunc(resultado["costo_total_cop"].to_numpy()).astype("int64"),
+            "costo_por_sql_cop": np.where(
+                sql > 0, np.round(resultado["costo_por_sql_cop"].to_numpy()), 0
+            ).astype("int64"),
+            "nota": resultado["nota"].to_numpy(),
+        }
+    )
+    return [
+        {k: (v.item() if hasattr(v, "item") else v) for k, v in fila.items()}
+        for fila in detalle.to_dict("records")
+    ]
+
+# ------------------ BARRIDO DE SENSIBILIDAD ------------------ #
+
+def barrido_sensibilidad(
+    canal: str,
+    pais: str,
+    proveedor_sms: str,
+    tipo_funnel: str,
+    moneda_trabajo: str,
+    budgets,
+    tasas_sql,
+    tasas_mql=(0.0,),
+    fxs=(4000.0,),
+    config=None,
+) -> dict:
+    """
+    Simulación 1 (budget → envíos → MQL / SQL) evaluada sobre la grilla
+    budgets × tasas_sql × tasas_mql × fxs con broadcasting de NumPy.
+
+    Devuelve arreglos de forma (len(budgets), len(tasas_sql), len(tasas_mql), len(fxs)):
+    budget_cop, envios, mql, sql, costo_por_sql_cop (0 si SQL = 0).
+    """
+    budgets = np.asarray(budgets, dtype="float64")[:, None, None, None]
+    tasas_sql = np.asarray(tasas_sql, dtype="float64")[None, :, None, None]
+    tasas_mql = np.asarray(tasas_mql, dtype="float64")[None, None, :, None]
+    fxs = np.asarray(fxs, dtype="float64")
+
+    # Costo unitario por FX (solo cambia si el canal cae al fallback en USD)
+    costo_unit_cop = costo_cop_vectorizado(
+        np.full(len(fxs), canal, dtype="object"), pais, proveedor_sms, fxs, config
+    )[None, None, None, :]
+    fxs = fxs[None, None, None, :]
+
+    budget_cop = cambio.a_cop(budgets, moneda_trabajo, fxs)
+    budget_cop = np.broadcast_to(budget_cop, np.broadcast(budgets, fxs).shape)
+    envios = np.floor(
+        np.divide(
+            budget_cop,
+            costo_unit_cop,
+            out=np.zeros(budget_cop.shape),
+            where=costo_unit_cop > 0,
+        )
+    )
+
+    # base = envíos (1 envío por contacto, como en la simulación 1)
+    if tipo_funnel == FUNNEL_DIRECTO:
+        mql = np.floor(envios * tasas_sql)
+        sql = mql
+    else:
+        mql = np.floor(envios * tasas_mql)
+        sql = np.floor(mql * tasas_sql)
+
+    forma = (budgets.shape[0], tasas_sql.shape[1], tasas_mql.shape[2], fxs.shape[3])
+    budget_cop = np.broadcast_to(budget_cop, forma)
+    sql = np.broadcast_to(sql, forma)
+    costo_por_sql_cop = np.divide(budget_cop, sql, out=np.zeros(forma), where=sql > 0)
+
+    return {
+        "budget_cop": budget_cop,
+        "envios": np.broadcast_to(envios, forma),
+        "mql": np.broadcast_to(mql, forma),
+        "sql": sql,
+        "costo_por_sql_cop": costo_por_sql_cop,
+    }
+
+def barrido_a_tabla(barrido: dict, budgets, tasas_sql, tasas_mql, fxs) -> pd.DataFrame:
+    """
+    Aplana un barrido a formato largo (una fila por celda) para exportar.
+    """
+    ejes = np.meshgrid(
+        np.asarray(budgets, dtype="float64"),
+        np.asarray(tasas_sql, dtype="float64"),
+        np.asarray(tasas_mql, dtype="float64"),
+        np.asarray(fxs, dtype="float64"),
+        indexing="ij",
+    )
+    return pd.DataFrame(
+        {
+            "budget": ejes[0].ravel(),
+            "tasa_sql": ejes[1].ravel(),
+            "tasa_mql": ejes[2].ravel(),
+            "tipo_cambio": ejes[3].ravel(),
+            "budget_cop": barrido["budget_cop"].ravel(),
+            "envios": barrido["envios"].ravel().astype("int64"),
+            "mql": barrido["mql"].ravel().astype("int64"),
+            "sql": barrido["sql"].ravel().astype("int64"),
+            "costo_por_sql_cop": barrido["costo_por_sql_cop"].ravel(),
+        }
+    )
@@ -0,0 +1,153 @@
+"""
+Optimizador de asignación de envíos entre países, canales, segmentos y meses.
+
+El problema es lineal: cada combinación país / segmento / canal / mes tiene
+un costo por envío, un SQL esperado por envío y un cupo de BUDGET_ENVIOS.
+Con una sola restricción de presupuesto (o de SQL objetivo) y cupos por
+combinación, ordenar por costo por SQL marginal y llenar en ese orden es
+la solución óptima del LP (mochila fraccional), así que se resuelve con
+un sort + cumsum en vez de un solver.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import precios
+from .costos import costo_cop_vectorizado, cupos_envios_vectorizado
+from .motor import FUNNEL_DIRECTO
+
+SEGMENTOS_CUPO = ["Empresarios", "Aliados"]
+PROVEEDORES_SMS = ["Masive", "Nua"]
+
+# ------------------ ITEMS ------------------ #
+
+def construir_items(
+    paises=None,
+    canales=None,
+    segmentos=None,
+    meses: int = 12,
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    envios_contacto: float = 1.0,
+    tasas=None,
+    fx: float = 4000.0,
+    cupo_sin_presupuesto=None,
+    config=None,
+) -> pd.DataFrame:
+    """
+    Una fila por país × segmento × canal × mes con costo, SQL por envío y cupo.
+
+    Para SMS se deja solo el proveedor más barato de cada país (ambos
+    comparten cupo y tasas, así que el caro nunca entra en el óptimo).
+    tasas: {canal: {"tasa_mql": x, "tasa_sql": y}} para sobreescribir los
+    defaults de los canales.
+    cupo_sin_presupuesto: cupo mensual para combinaciones sin dato en
+    BUDGET_ENVIOS (None = se excluyen).
+    config: snapshot de precios (None = precios.actual()).
+    """
+    config = config or precios.actual()
+    channels = config.channels
+    paises = list(paises or config.paises)
+    canales = list(canales or channels.keys())
+    segmentos = list(segmentos or SEGMENTOS_CUPO)
+    tasas = tasas or {}
+
+    combos = pd.MultiIndex.from_product(
+        [paises, segmentos, canales, PROVEEDORES_SMS],
+        names=["pais", "segmento", "canal", "proveedor_sms"],
+    ).to_frame(index=False)
+
+    combos["costo_unit_cop"] = costo_cop_vectorizado(
+        combos["canal"].to_numpy(),
+        combos["pais"].to_numpy(),
+        combos["proveedor_sms"].to_numpy(),
+        fx,
+        config,
+    )
+    combos = combos.loc[
+        combos.groupby(["pais", "segmento", "canal"])["costo_unit_cop"].idxmin()
+    ].reset_index(drop=True)
+
+    tasa_mql = combos["canal"].map(
+        lambda c: tasas.get(c, {}).get("tasa_mql", channels.get(c, {}).get("tasa_mql", 0.0))
+    ).to_numpy(dtype="float64")
+    tasa_sql = combos["canal"].map(
+        lambda c: tasas.get(c, {}).get("tasa_sql", channels.get(c, {}).get("tasa_sql", 0.0))
+    ).to_numpy(dtype="float64")
+    tasa_base = tasa_sql if tipo_funnel == FUNNEL_DIRECTO else tasa_mql * tasa_sql
+    combos["sql_por_envio"] = tasa_base / envios_contacto if envios_contacto > 0 else 0.0
+
+    cupo = cupos_envios_vectorizado(
+        combos["pais"].to_numpy(),
+        "Mensual",
+        combos["segmento"].to_numpy(),
+        combos["canal"].to_numpy(),
+        config,
+    )
+    if cupo_sin_presupuesto is not None:
+        cupo = np.where(np.isnan(cupo), float(cupo_sin_presupuesto), cupo)
+    combos["cupo"] = cupo
+
+    combos = combos[
+        (combos["sql_por_envio"] > 0) & (combos["costo_unit_cop"] > 0) & combos["cupo"].notna()
+    ]
+
+    items = combos.loc[combos.index.repeat(meses)].reset_index(drop=True)
+    items.insert(3, "mes", np.tile(np.arange(1, meses + 1), len(combos)))
+    items["costo_por_sql_cop"] = items["costo_unit_cop"] / items["sql_por_envio"]
+    return items
+
+# ------------------ ASIGNACIÓN ------------------ #
+
+def _ordenar(items: pd.DataFrame) -> pd.DataFrame:
+    return items.sort_values("costo_por_sql_cop", kind="stable").reset_index(drop=True)
+
+def _resultado(items: pd.DataFrame, envios: np.ndarray) -> tuple:
+    asignacion = items.assign(envios=envios.astype("int64"))
+    asignacion = asignacion[asignacion["envios"] > 0].reset_index(drop=True)
+    asignacion["costo_total_cop"] = asignacion["envios"] * asignacion["costo_unit_cop"]
+    asignacion["sql_esperados"] = asignacion["envios"] * asignacion["sql_por_envio"]
+    asignacion["%_cupo"] = (asignacion["envios"] / asignacion["cupo"] * 100.0).round(1)
+
+    costo = float(asignacion["costo_total_cop"].sum())
+    sql = float(asignacion["sql_esperados"].sum())
+    resumen = {
+        "envios": int(asignacion["envios"].sum()),
+        "costo_total_cop": costo,
+        "sql_esperados": sql,
+        "costo_por_sql_cop": costo / sql if sql > 0 else 0.0,
+    }
+    return asignacion, resumen
+
+def maximizar_sql(items: pd.DataFrame, presupuesto_cop: float) -> tuple:
+    """
+    Asignación de envíos que maximiza el SQL esperado con un presupuesto en COP.
+    Devuelve (asignacion, resumen).
+    """
+    items = _ordenar(items)
+    costo = items["costo_unit_cop"].to_numpy()
+    cupo = np.floor(items["cupo"].to_numpy())
+
+    costo_lleno = np.cumsum(cupo * costo)
+    previo = np.concatenate(([0.0], costo_lleno[:-1]))
+    restante = np.clip(presupuesto_cop - previo, 0.0, None)
+    envios = np.minimum(cupo, np.floor(restante / costo))
+    return _resultado(items, envios)
+
+def minimizar_costo(items: pd.DataFrame, sql_objetivo: float) -> tuple:
+    """
+    Asignación de envíos de menor costo que alcanza el SQL esperado objetivo.
+    Devuelve (asignacion, resumen); si los cupos no alcanzan, se asigna todo
+    el cupo útil y resumen["alcanzado"] queda en False.
+    """
+    items = _ordenar(items)
+    sql_envio = items["sql_por_envio"].to_numpy()
+    cupo = np.floor(items["cupo"].to_numpy())
+
+    sql_lleno = np.cumsum(cupo * sql_envio)
+    previo = np.concatenate(([0.0], sql_lleno[:-1]))
+    faltante = np.clip(sql_objetivo - previo, 0.0, None)
+    envios = np.minimum(cupo, np.ceil(faltante / sql_envio))
+
+    asignacion, resumen = _resultado(items, envios)
+    resumen["alcanzado"] = resumen["sql_esperados"] >= sql_objetivo - 1e-9
+    return asignacion, resumen
@@ -0,0 +1,239 @@
+"""
+Plan multicanal de menor costo para un objetivo de SQL o MQL (sin Streamlit).
+
+Versión multicanal de la simulación 2: en vez de un canal a la vez, reparte
+contactos entre todos los canales (y proveedores SMS) de una campaña
+país / periodo / segmento, respetando el cupo de BUDGET_ENVIOS y la base
+disponible de cada canal, y devuelve el mix más barato que alcanza el
+objetivo.
+
+Mismas reglas que la Calculadora: el resultado de cada línea se calcula
+con motor.funnel (MQL / SQL con floor), así que el plan se puede copiar al
+mix de canales y da exactamente los mismos números. Como en el optimizador,
+se llenan los canales en orden de costo por SQL (o MQL) y solo la última
+línea queda parcial, con la base mínima que alcanza lo que falta. El orden
+usa el costo real de cada línea llena (con lo que se pierde en el floor),
+así que el plan queda a pocos puntos de la cota del LP sin redondeo.
+
+`opciones_canales` resuelve costos, tasas y límites una vez; `planificar`
+trabaja sobre esos arreglos y tarda unos milisegundos, así que se puede
+recalcular en cada movimiento de un slider.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import precios
+from .costos import costo_cop_vectorizado, cupos_envios_vectorizado
+from .motor import FUNNEL_DIRECTO, funnel
+from .optimizador import PROVEEDORES_SMS
+from .simulaciones import OBJETIVOS
+
+# ------------------ OPCIONES ------------------ #
+
+def opciones_canales(
+    pais: str,
+    periodo: str = "Mensual",
+    segmento: str = "Empresarios",
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    envios_contacto: float = 1.0,
+    fx: float = 4000.0,
+    canales=None,
+    bases=None,
+    tasas=None,
+    config=None,
+) -> pd.DataFrame:
+    """
+    Una fila por canal con su proveedor más barato (los proveedores SMS
+    comparten cupo, base y tasas: el caro nunca entra), costo, tasas y
+    contactos máximos = min(base disponible, cupo / envíos por contacto).
+
+    bases: {canal: contactos disponibles} (sin dato = sin límite de base).
+    tasas: {canal: {"tasa_mql": x, "tasa_sql": y}} sobre los defaults.
+    Se descartan los canales con costo 0.
+    """
+    config = config or precios.actual()
+    channels = config.channels
+    canales = list(canales or channels.keys())
+    bases = bases or {}
+    tasas = tasas or {}
+
+    opciones = pd.MultiIndex.from_product(
+        [canales, PROVEEDORES_SMS], names=["canal", "proveedor_sms"]
+    ).to_frame(index=False)
+    opciones["costo_unit_cop"] = costo_cop_vectorizado(
+        opciones["canal"].to_numpy(), pais, opciones["proveedor_sms"].to_numpy(), fx, config
+    )
+    opciones = opciones.loc[
+        opciones.groupby("canal", sort=False)["costo_unit_cop"].idxmin()
+    ].reset_index(drop=True)
+    opciones.loc[~opciones["canal"].str.lower().str.contains("sms"), "proveedor_sms"] = ""
+
+    for col in ("tasa_mql", "tasa_sql"):
+        opciones[col] = opciones["canal"].map(
+            lambda c: float(tasas.get(c, {}).get(col, channels.get(c, {}).get(col, 0.0)))
+        )
+
+    opciones["cupo"] = cupos_envios_vectorizado(
+        pais, periodo, segmento, opciones["canal"].to_numpy(), config
+    )
+    opciones["base_disponible"] = opciones["canal"].map(
+        lambda c: np.nan if bases.get(c) is None else float(bases[c])
+    )
+    por_cupo = np.floor(opciones["cupo"].to_numpy() / envios_contacto)
+    max_contactos = np.fmin(por_cupo, opciones["base_disponible"].to_numpy())
+    opciones["max_contactos"] = np.where(np.isnan(max_contactos), np.inf, max_contactos)
+
+    opciones["directo"] = tipo_funnel == FUNNEL_DIRECTO
+    opciones["envios_contacto"] = float(envios_contacto)
+    return opciones[opciones["costo_unit_cop"] > 0].reset_index(drop=True)
+
+# ------------------ BASE MÍNIMA (FLOOR) ------------------ #
+
+def _minimo_con_floor(faltante, tasa):
+    """
+    Menor entero n con floor(n * tasa) >= faltante (tasa > 0). El ceil de
+    la división puede quedar corto o pasarse en una unidad por el redondeo
+    del float; se corrige con la misma multiplicación que usa motor.funnel.
+    """
+    # Las filas con tasa 0 (rama descartada de un np.where) dan inf sin avisar
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.ceil(faltante / tasa)
+        n = np.where(np.floor(n * tasa) < faltante, n + 1, n)
+        return np.where((n > 0) & (np.floor((n - 1) * tasa) >= faltante), n - 1, n)
+
+def _base_minima(faltante, objetivo: str, tasa_mql, tasa_sql, directo):
+    """
+    Contactos mínimos para que la línea dé `faltante` MQL o SQL.
+    """
+    if objetivo == "mql":
+        return np.where(
+            directo, _minimo_con_floor(faltante, tasa_sql), _minimo_con_floor(faltante, tasa_mql)
+        )
+    mql = _minimo_con_floor(faltante, np.where(directo, 1.0, tasa_sql))
+    return np.where(
+        directo, _minimo_con_floor(faltante, tasa_sql), _minimo_con_floor(mql, tasa_mql)
+    )
+
+def _unidades(base, objetivo: str, tasa_mql, tasa_sql, directo):
+    mql = np.where(directo, np.floor(base * tasa_sql), np.floor(base * tasa_mql))
+    if objetivo == "mql":
+        return mql
+    return np.where(directo, mql, np.floor(mql * tasa_sql))
+
+def _lleno(opciones: pd.DataFrame, objetivo: str) -> np.ndarray:
+    """
+    Unidades (SQL o MQL) de cada línea usada al máximo, ya con floor
+    (inf si la línea no tiene cupo ni base y su tasa es > 0).
+    """
+    maximo = opciones["max_contactos"].to_numpy()
+    finito = np.isfinite(maximo)
+    args = (
+        objetivo,
+        opciones["tasa_mql"].to_numpy(),
+        opciones["tasa_sql"].to_numpy(),
+        opciones["directo"].to_numpy(),
+    )
+    sin_limite = np.where(_unidades(np.full(len(maximo), 1e12), *args) > 0, np.inf, 0.0)
+    return np.where(finito, _unidades(np.where(finito, maximo, 0.0), *args), sin_limite)
+
+# ------------------ PLAN ------------------ #
+
+def capacidad(opciones: pd.DataFrame, objetivo: str) -> float:
+    """
+    Máximo de SQL o MQL alcanzable con todos los cupos y bases (inf si algún
+    canal útil no tiene límite).
+    """
+    return float(_lleno(opciones, objetivo).sum())
+
+def planificar(opciones: pd.DataFrame, objetivo: str, cantidad: int) -> tuple:
+    """
+    Mix de menor costo que alcanza `cantidad` SQL o MQL.
+    Devuelve (plan, resumen): una fila por canal usado con contactos,
+    envíos, MQL, SQL y costos (mismas columnas que motor.funnel) y los
+    totales. Si los cupos / bases no alcanzan se usa todo lo disponible y
+    resumen["alcanzado"] queda en False.
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: {objetivo} (usa {' / '.join(OBJETIVOS)})")
+
+    tasa_mql = opciones["tasa_mql"].to_numpy()
+    tasa_sql = opciones["tasa_sql"].to_numpy()
+    directo = opciones["directo"].to_numpy()
+    maximo = opciones["max_contactos"].to_numpy()
+    costo_contacto = opciones["costo_unit_cop"].to_numpy() * opciones["envios_contacto"].to_numpy()
+    finito = np.isfinite(maximo)
+    lleno = _lleno(opciones, objetivo)
+
+    # Orden por costo por unidad: el real de la línea llena (incluye lo que se
+    # pierde en el floor) o el nominal por tasa si no tiene límite
+    tasa = np.where(directo, tasa_sql, tasa_mql if objetivo == "mql" else tasa_mql * tasa_sql)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        costo_unidad = np.where(finito, costo_contacto * maximo / lleno, costo_contacto / tasa)
+    util = lleno > 0
+    orden = np.argsort(np.where(util, costo_unidad, np.inf), kind="stable")
+    orden = orden[util[orden]]
+    tasa_mql, tasa_sql, directo = tasa_mql[orden], tasa_sql[orden], directo[orden]
+    maximo, lleno, costo_contacto = maximo[orden], lleno[orden], costo_contacto[orden]
+
+    def base_minima(faltante, filas=slice(None)):
+        return _base_minima(faltante, objetivo, tasa_mql[filas], tasa_sql[filas], directo[filas])
+
+    # Líneas llenas en orden; la última solo con la base mínima para lo que falta
+    previo = np.concatenate(([0.0], np.cumsum(lleno)[:-1]))
+    faltante = np.clip(cantidad - previo, 0.0, None)
+    base = np.where(faltante > 0, np.fmin(base_minima(np.maximum(faltante, 1.0)), maximo), 0.0)
+
+    # Lo que falta al llegar a la última línea puede salir más barato de una
+    # línea posterior que lo cubra sola (en objetivos chicos pesa más el
+    # redondeo que el costo por unidad)
+    usadas = np.flatnonzero(base > 0)
+    if len(usadas) and faltante[usadas[-1]] <= lleno[usadas[-1]]:
+        ultima = usadas[-1]
+        resto = faltante[ultima]
+        candidatas = ultima + np.flatnonzero(lleno[ultima:] >= resto)
+        bases_cand = base_minima(np.full(len(candidatas), resto), candidatas)
+        mejor = np.argmin(costo_contacto[candidatas] * bases_cand)
+        base[ultima] = 0.0
+        base[candidatas[mejor]] = bases_cand[mejor]
+    base = base.astype("int64")
+
+    columnas = ["canal", "proveedor_sms", "costo_unit_cop", "tasa_mql", "tasa_sql", "cupo"]
+    plan = opciones.iloc[orden][columnas]
+    plan = plan.assign(base=base).reset_index(drop=True)
+    salida = funnel(
+        base, opciones["envios_contacto"].to_numpy()[orden], tasa_mql, tasa_sql, directo,
+        plan["costo_unit_cop"].to_numpy(),
+    )
+    plan = plan.assign(**salida)
+    plan["limite"] = np.where(
+        base >= maximo,
+        np.where(opciones["base_disponible"].to_numpy()[orden] == maximo, "base", "cupo"),
+        "",
+    )
+    plan = plan[plan["base"] > 0].reset_index(drop=True)
+    plan["%_cupo"] = (plan["envios"] / plan["cupo"] * 100.0).round(1)
+
+    costo = float(plan["costo_total_cop"].sum())
+    sql = int(plan["sql"].sum())
+    logrado = int(plan[objetivo].sum())
+    resumen = {
+        "objetivo": objetivo,
+        "cantidad": int(cantidad),
+        "logrado": logrado,
+        "alcanzado": logrado >= cantidad,
+        "base": int(plan["base"].sum()),
+        "envios": float(plan["envios"].sum()),
+        "mql": int(plan["mql"].sum()),
+        "sql": sql,
+        "costo_total_cop": costo,
+        "costo_por_sql_cop": costo / sql if sql > 0 else 0.0,
+        "maximo": float(lleno.sum()),
+    }
+    return plan, resumen
+
+def plan_minimo_costo(objetivo: str, cantidad: int, pais: str, **kwargs) -> tuple:
+    """
+    opciones_canales + planificar en una llamada (para scripts y la CLI).
+    """
+    return planificar(opciones_canales(pais, **kwargs), objetivo, cantidad)
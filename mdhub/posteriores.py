@@ -0,0 +1,288 @@
+"""
+Tasas bayesianas (Beta-binomial) por país × segmento × canal (sin Streamlit).
+
+Cada clave guarda sus conteos (contactos, MQL, SQL) y de ellos salen tres
+posteriores Beta: tasa MQL (MQL / contactos), tasa SQL directa (SQL /
+contactos) y tasa SQL sobre MQL (SQL / MQL). El prior de cada nivel es la
+media posterior del nivel superior sin los datos de la propia clave (cada
+resultado cuenta una sola vez), con concentración κ (contactos
+equivalentes): config.channels → canal (país y segmento "*") → país × canal
+→ país × segmento × canal. Así una campaña chica mueve poco la tasa y una
+clave sin datos hereda la de su país o canal.
+
+Sumar un resultado es O(1) (suma conteos en la clave y sus dos niveles
+superiores). Las posteriores de todas las claves se recalculan de una vez
+con NumPy solo cuando se consultan después de un cambio, y los intervalos
+creíbles se calculan solo para las claves pedidas (CDF numérica en una
+grilla alrededor de la media, sin SciPy).
+"""
+
+import threading
+
+import numpy as np
+
+TODOS = "*"
+CONCENTRACION_PRIOR = 200.0  # κ: peso del prior en contactos equivalentes
+CREDIBILIDAD = 0.90
+PUNTOS_GRILLA = 128
+_MINIMO = 1e-9  # α / β mínimos (tasas por defecto 0 o 1)
+
+# tasa: (éxitos, ensayos, tasa de la config que hace de prior raíz)
+TASAS = {
+    "tasa_mql": ("mql", "contactos", "tasa_mql"),
+    "tasa_sql_directo": ("sql", "contactos", "tasa_sql"),
+    "tasa_sql_mql": ("sql", "mql", "tasa_sql"),
+}
+CONTEOS = ("contactos", "mql", "sql")
+
+# ------------------ INTERVALOS BETA ------------------ #
+
+def _log_1_menos(log_y):
+    """
+    log(1 - y) a partir de log(y), preciso tanto con y ≈ 0 como con y ≈ 1.
+    """
+    y = np.exp(log_y)
+    with np.errstate(divide="ignore"):
+        return np.where(y < 0.5, np.log1p(-y), np.log(-np.expm1(log_y)))
+
+def _grilla_beta(lo, hi, ancho, q, log_1_tp):
+    """
+    x = lo + ancho · u y 1 - x, con 1 - u = (1 - t ** p) ** q calculado en
+    logaritmos: cerca de los bordes singulares 1 - (1 - ε) se redondea a 0.
+    """
+    log_1_u = q * log_1_tp
+    if np.ndim(log_1_u) > np.ndim(lo):
+        lo, hi = lo[:, None], hi[:, None]
+    return lo - ancho * np.expm1(log_1_u), (1.0 - hi) + ancho * np.exp(log_1_u)
+
+def intervalo_beta(a, b, credibilidad: float = CREDIBILIDAD, puntos: int = PUNTOS_GRILLA):
+    """
+    Intervalo creíble central de Beta(a, b), vectorizado sobre a y b.
+    Integra la densidad en una grilla de `puntos` celdas sobre media ± 10 σ
+    e interpola los cuantiles en la CDF acumulada. Con a < 1 (o b < 1) la
+    densidad es infinita en 0 (o 1): la grilla x = u(t) llega a cada borde
+    singular con celdas cada vez más finas (t ** (1 / a) hacia 0,
+    (1 - t) ** (1 / b) hacia 1, también los dos a la vez) y se integra en t,
+    donde la densidad por du/dt ya no es singular, así la masa del borde no
+    se pierde. Devuelve (inferior, superior).
+    """
+    a = np.atleast_1d(np.asarray(a, dtype="float64"))
+    b = np.atleast_1d(np.asarray(b, dtype="float64"))
+    total = a + b
+    media = a / total
+    sd = np.sqrt(a * b / (total * total * (total + 1.0)))
+    lo = np.where(a < 1.0, 0.0, np.clip(media - 10.0 * sd, 0.0, 1.0))
+    hi = np.where(b < 1.0, 1.0, np.clip(media + 10.0 * sd, 0.0, 1.0))
+    ancho = np.maximum(hi - lo, 1e-15)[:, None]
+
+    # u(t) = 1 - (1 - t ** p) ** q en [0, 1], comprimida hacia los lados singulares
+    p = np.clip(1.0 / a, 1.0, 50.0)[:, None]
+    q = np.clip(1.0 / b, 1.0, 50.0)[:, None]
+    t = np.linspace(0.0, 1.0, puntos + 1)[None, :]
+    log_t = np.log((t[:, 1:] + t[:, :-1]) / 2.0)  # centros de las celdas, nunca 0 ni 1
+    log_1_tp = _log_1_menos(p * log_t)
+    x, resto = _grilla_beta(lo, hi, ancho, q, log_1_tp)  # x y 1 - x
+    log_du = np.log(p * q) + (p - 1.0) * log_t + (q - 1.0) * log_1_tp
+
+    log_pdf = (
+        (a[:, None] - 1.0) * np.log(np.maximum(x, 1e-300))
+        + (b[:, None] - 1.0) * np.log(np.maximum(resto, 1e-300))
+        + log_du
+    )
+    masa = np.exp(log_pdf - log_pdf.max(axis=1, keepdims=True))
+    cdf = np.cumsum(masa, axis=1)
+    cdf /= cdf[:, -1:]
+
+    filas = np.arange(len(a))
+    cola = (1.0 - credibilidad) / 2.0
+    limites = []
+    for cuantil in (cola, 1.0 - cola):
+        celda = np.minimum((cdf < cuantil).sum(axis=1), puntos - 1)
+        previo = np.where(celda > 0, cdf[filas, np.maximum(celda - 1, 0)], 0.0)
+        fraccion = (cuantil - previo) / np.maximum(cdf[filas, celda] - previo, 1e-300)
+        # Se interpola en t y se vuelve a x con u(t)
+        tc = np.maximum((celda + np.clip(fraccion, 0.0, 1.0)) / puntos, 1e-300)
+        x, _ = _grilla_beta(lo, hi, ancho[:, 0], q[:, 0], _log_1_menos(p[:, 0] * np.log(tc)))
+        limites.append(np.clip(x, 0.0, 1.0))
+    return limites[0], limites[1]
+
+# ------------------ MODELO ------------------ #
+
+class PosterioresTasas:
+    """
+    Conteos y posteriores Beta por (pais, segmento, canal), incluidos los
+    niveles (pais, "*", canal) y ("*", "*", canal). Seguro para varios hilos.
+    """
+
+    def __init__(self, config, concentracion: float = CONCENTRACION_PRIOR, capacidad: int = 64):
+        self.config = config
+        self.concentracion = float(concentracion)
+        self._filas = {}
+        self._claves = []
+        self._conteos = np.zeros((capacidad, len(CONTEOS)))
+        self._padre = np.full(capacidad, -1, dtype="int64")
+        self._nivel = np.zeros(capacidad, dtype="int8")
+        self._prior = np.zeros((capacidad, len(TASAS)))
+        self._posterior = None  # (alfa, beta) de todas las filas, o None si cambió algo
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_conteos(cls, conteos: dict, config, concentracion: float = CONCENTRACION_PRIOR):
+        """
+        Modelo a partir de {(pais, segmento, canal): {"contactos", "mql", "sql", ...}}
+        (p. ej. historico.indice). Si incluye los niveles "*" se usan tal cual;
+        los que falten se completan sumando.
+        """
+        modelo = cls(config, concentracion, capacidad=max(64, 2 * len(conteos)))
+        agregados = {clave: d for clave, d in conteos.items() if TODOS in clave[:2]}
+        for (pais, segmento, canal), datos in conteos.items():
+            if TODOS in (pais, segmento):
+                continue
+            fila = modelo._fila((pais, segmento, canal))
+            modelo._conteos[fila] += [datos[c] for c in CONTEOS]
+            for padre in ((pais, TODOS, canal), (TODOS, TODOS, canal)):
+                if padre not in agregados:
+                    modelo._conteos[modelo._fila(padre)] += [datos[c] for c in CONTEOS]
+        for clave, datos in agregados.items():
+            modelo._conteos[modelo._fila(clave)] = [datos[c] for c in CONTEOS]
+        return modelo
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def _fila(self, clave: tuple) -> int:
+        """
+        Fila de la clave (la crea con sus niveles superiores si no existe).
+        """
+        fila = self._filas.get(clave)
+        if fila is not None:
+            return fila
+        pais, segmento, canal = clave
+        if segmento != TODOS:
+            padre = self._fila((pais, TODOS, canal))
+        elif pais != TODOS:
+            padre = self._fila((TODOS, TODOS, canal))
+        else:
+            padre = -1
+
+        fila = len(self._claves)
+        if fila == len(self._padre):
+            capacidad = 2 * fila
+            self._conteos = np.resize(self._conteos, (capacidad, len(CONTEOS)))
+            self._conteos[fila:] = 0.0
+            self._padre = np.resize(self._padre, capacidad)
+            self._nivel = np.resize(self._nivel, capacidad)
+            self._prior = np.resize(self._prior, (capacidad, len(TASAS)))
+        info = self.config.channels.get(canal, {})
+        self._prior[fila] = [float(info.get(col, 0.0)) for _, _, col in TASAS.values()]
+        self._padre[fila] = padre
+        self._nivel[fila] = (segmento != TODOS) + (pais != TODOS)
+        self._filas[clave] = fila
+        self._claves.append(clave)
+        self._posterior = None
+        return fila
+
+    def actualizar(self, pais: str, segmento: str, canal: str, contactos=0, mql=0, sql=0):
+        """
+        Suma el resultado de una campaña a la clave y a sus niveles superiores.
+        O(1): las posteriores se recalculan al próximo pedido.
+        """
+        with self._lock:
+            fila = self._fila((pais, segmento, canal))
+            while fila >= 0:
+                self._conteos[fila] += (contactos, mql, sql)
+                fila = self._padre[fila]
+            self._posterior = None
+
+    def _alfa_beta(self):
+        """
+        (alfa, beta) de las tres tasas para todas las filas. La media del
+        prior se arma bajando desde la config por los ancestros de la fila;
+        en cada paso se suman los conteos del ancestro menos los del nivel
+        de abajo, para no contar dos veces los datos de la fila.
+        """
+        if self._posterior is not None:
+            return self._posterior
+        n = len(self._claves)
+        conteos = dict(zip(CONTEOS, self._conteos[:n].T))
+        padre = self._padre[:n]
+        # Cadena de cada fila desde la raíz: [raíz, país, fila] (según nivel)
+        cadena = [np.arange(n)]
+        while True:
+            arriba = np.where(cadena[0] >= 0, padre[np.maximum(cadena[0], 0)], -1)
+            if (arriba < 0).all():
+                break
+            cadena.insert(0, arriba)
+        cadena = np.vstack(cadena)
+
+        k = self.concentracion
+        alfa = np.empty((n, len(TASAS)))
+        beta = np.empty((n, len(TASAS)))
+        for j, (exitos, ensayos, _) in enumerate(TASAS.values()):
+            ensayos_ = conteos[ensayos]
+            exitos_ = np.minimum(conteos[exitos], ensayos_)
+            m = self._prior[:n, j].copy()
+            for anc, hijo in zip(cadena[:-1], cadena[1:]):
+                activa = (anc >= 0) & (hijo >= 0)
+                a, h = np.maximum(anc, 0), np.maximum(hijo, 0)
+                dn = np.clip(ensayos_[a] - ensayos_[h], 0.0, None)
+                ds = np.clip(exitos_[a] - exitos_[h], 0.0, dn)
+                m = np.where(activa, (k * m + ds) / (k + dn), m)
+            alfa[:, j] = np.maximum(m * k, _MINIMO) + exitos_
+            beta[:, j] = np.maximum((1.0 - m) * k, _MINIMO) + ensayos_ - exitos_
+        self._posterior = (alfa, beta)
+        return self._posterior
+
+    def filas(self, claves) -> np.ndarray:
+        """
+        Fila de cada clave (-1 si no está).
+        """
+        return np.array([self._filas.get(tuple(c), -1) for c in claves], dtype="int64")
+
+    def posteriores(self, claves=None, credibilidad: float = CREDIBILIDAD) -> dict:
+        """
+        Media e intervalo creíble de las tres tasas para `claves` (None =
+        todas). Devuelve {"claves", "contactos", tasa: {"media", "inferior",
+        "superior"}}; las claves desconocidas quedan en NaN.
+        """
+        with self._lock:
+            alfa, beta = self._alfa_beta()
+            claves = list(self._claves) if claves is None else [tuple(c) for c in claves]
+            filas = self.filas(claves)
+            conocidas = filas >= 0
+            contactos = np.where(conocidas, self._conteos[np.maximum(filas, 0), 0], np.nan)
+
+        resultado = {"claves": claves, "contactos": contactos}
+        for j, nombre in enumerate(TASAS):
+            a = alfa[filas[conocidas], j]
+            b = beta[filas[conocidas], j]
+            media = np.full(len(claves), np.nan)
+            inferior = np.full(len(claves), np.nan)
+            superior = np.full(len(claves), np.nan)
+            media[conocidas] = a / (a + b)
+            if len(a):
+                inferior[conocidas], superior[conocidas] = intervalo_beta(a, b, credibilidad)
+            resultado[nombre] = {"media": media, "inferior": inferior, "superior": superior}
+        return resultado
+
+    def prior(self, canal: str, credibilidad: float = CREDIBILIDAD) -> dict:
+        """
+        Tasas de la config de un canal con el intervalo de su prior (κ).
+        """
+        info = self.config.channels.get(canal, {})
+        resultado = {}
+        for nombre, (_, _, col) in TASAS.items():
+            m = float(info.get(col, 0.0))
+            a = max(m * self.concentracion, _MINIMO)
+            b = max((1.0 - m) * self.concentracion, _MINIMO)
+            inferior, superior = intervalo_beta(a, b, credibilidad)
+            resultado[nombre] = {"media": m, "inferior": float(inferior[0]), "superior": float(superior[0])}
+        return resultado
+
+def dentro_intervalo(valor: float, intervalo: tuple, decimales: int = 4) -> bool:
+    """
+    Si `valor` cae en el intervalo a la precisión de los inputs de tasas
+    (una tasa 0 no queda "fuera" de un intervalo que empieza en 1e-20).
+    """
+    inferior, superior = (round(float(x), decimales) for x in intervalo)
+    return inferior <= round(float(valor), decimales) <= superior
@@ -0,0 +1,407 @@
+"""
+Configuración versionada de canales, costos por país y cupos de envíos.
+
+Los datos viven en config/precios.json (o la ruta de MDHUB_PRECIOS). El
+archivo se valida y se compila una vez en un snapshot inmutable
+(ConfigPrecios): diccionarios de solo lectura y las matrices densas de
+costos país × canal × proveedor × fallback, más un diccionario con el costo
+de cada canal / país / proveedor configurado para las consultas escalares.
+
+actual() devuelve el snapshot vigente sin tomar locks: solo lee una
+referencia global. Cada INTERVALO_REVISION segundos revisa el mtime del
+archivo; si cambió, lo recompila y reemplaza la referencia (las sesiones
+que ya tenían el snapshot anterior lo siguen usando sin problema). Si el
+archivo nuevo no es válido se sigue sirviendo el anterior y el error queda
+en estado().
+
+Cada versión cargada se archiva en data/precios/<version>.json (o la ruta
+de MDHUB_PRECIOS_HISTORIAL) para poder reproducir estimaciones pasadas con
+version(<version>). Una versión publicada no se puede cambiar: si el
+contenido cambia, también debe cambiar "version".
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_DEFAULT = os.path.join(_RAIZ, "config", "precios.json")
+RUTA_HISTORIAL_DEFAULT = os.path.join(_RAIZ, "data", "precios")
+
+INTERVALO_REVISION = 2.0  # segundos entre revisiones del mtime
+
+MONEDAS = ("COP", "USD")
+PERIODOS = ("Mensual", "Anual")
+SEGMENTOS_CUPO = ("Empresarios", "Aliados")
+CANALES_CUPO = ("WAPP", "SMS", "CB")
+
+# ------------------ CANALES CANÓNICOS ------------------ #
+
+class Canal(IntEnum):
+    WHATSAPP = 0
+    EMAIL = 1
+    CALL_BLASTING = 2
+    SMS = 3
+    OTRO = 4
+
+class Proveedor(IntEnum):
+    MASIVE = 0
+    NUA = 1
+
+@lru_cache(maxsize=1024)
+def canal_canonico(canal: str) -> Canal:
+    canal_low = canal.lower()
+    if "whatsapp" in canal_low:
+        return Canal.WHATSAPP
+    if canal_low.startswith("email") or "correo" in canal_low:
+        return Canal.EMAIL
+    if "call blasting" in canal_low or canal_low == "cb":
+        return Canal.CALL_BLASTING
+    if "sms" in canal_low:
+        return Canal.SMS
+    return Canal.OTRO
+
+# Tabla de "costos_cop" para cada canal / proveedor
+TABLAS_COSTO = {
+    (Canal.WHATSAPP, Proveedor.MASIVE): "whatsapp",
+    (Canal.WHATSAPP, Proveedor.NUA): "whatsapp",
+    (Canal.EMAIL, Proveedor.MASIVE): "email",
+    (Canal.EMAIL, Proveedor.NUA): "email",
+    (Canal.CALL_BLASTING, Proveedor.MASIVE): "call_blasting",
+    (Canal.CALL_BLASTING, Proveedor.NUA): "call_blasting",
+    (Canal.SMS, Proveedor.MASIVE): "sms_masive",
+    (Canal.SMS, Proveedor.NUA): "sms_nua",
+}
+
+# ------------------ SNAPSHOT ------------------ #
+
+@dataclass(frozen=True)
+class ConfigPrecios:
+    version: str
+    huella: str
+    channels: MappingProxyType
+    paises: tuple
+    costos_cop: MappingProxyType
+    budget_envios: MappingProxyType
+    indice_pais: MappingProxyType
+    indice_canal: MappingProxyType
+    matriz_costo_cop: np.ndarray
+    matriz_costo_usd: np.ndarray
+    matriz_costo_ok: np.ndarray
+    costos_escalares: MappingProxyType
+
+    @property
+    def pais_sin_tabla(self) -> int:
+        """
+        Último índice de país en las matrices: "país sin tabla".
+        """
+        return len(self.paises)
+
+# ------------------ VALIDACIÓN ------------------ #
+
+def _error(ruta: str, mensaje: str):
+    raise ValueError(f"Configuración de precios inválida en {ruta}: {mensaje}")
+
+def _numero(valor, ruta: str, minimo=0.0, maximo=None) -> float:
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        _error(ruta, f"se esperaba un número y llegó {valor!r}")
+    if valor < minimo or (maximo is not None and valor > maximo):
+        rango = f"[{minimo}, {maximo}]" if maximo is not None else f">= {minimo}"
+        _error(ruta, f"{valor} fuera de rango {rango}")
+    return valor
+
+def _dict(valor, ruta: str) -> dict:
+    if not isinstance(valor, dict):
+        _error(ruta, "se esperaba un objeto")
+    return valor
+
+def validar(datos: dict):
+    """
+    Valida la estructura y los rangos del archivo; lanza ValueError con la
+    ruta del primer campo inválido.
+    """
+    _dict(datos, "$")
+    faltantes = {"version", "canales", "paises", "costos_cop", "budget_envios"} - set(datos)
+    if faltantes:
+        _error("$", f"faltan las claves {sorted(faltantes)}")
+    if not isinstance(datos["version"], str) or not datos["version"].strip():
+        _error("version", "debe ser un texto no vacío")
+
+    for nombre, info in _dict(datos["canales"], "canales").items():
+        ruta = f"canales.{nombre}"
+        _dict(info, ruta)
+        if info.get("moneda") not in MONEDAS:
+            _error(f"{ruta}.moneda", f"debe ser una de {MONEDAS}")
+        _numero(info.get("costo"), f"{ruta}.costo")
+        _numero(info.get("tasa_mql"), f"{ruta}.tasa_mql", 0.0, 1.0)
+        _numero(info.get("tasa_sql"), f"{ruta}.tasa_sql", 0.0, 1.0)
+
+    paises = datos["paises"]
+    if not isinstance(paises, list) or not paises or not all(isinstance(p, str) for p in paises):
+        _error("paises", "debe ser una lista no vacía de textos")
+    if len(set(paises)) != len(paises):
+        _error("paises", "hay países repetidos")
+
+    tablas_validas = set(TABLAS_COSTO.values())
+    for tabla, costos in _dict(datos["costos_cop"], "costos_cop").items():
+        if tabla not in tablas_validas:
+            _error(f"costos_cop.{tabla}", f"tabla desconocida (válidas: {sorted(tablas_validas)})")
+        for pais, costo in _dict(costos, f"costos_cop.{tabla}").items():
+            if pais not in paises:
+                _error(f"costos_cop.{tabla}.{pais}", "país no listado en 'paises'")
+            _numero(costo, f"costos_cop.{tabla}.{pais}")
+
+    for pais, periodos in _dict(datos["budget_envios"], "budget_envios").items():
+        if pais not in paises:
+            _error(f"budget_envios.{pais}", "país no listado en 'paises'")
+        for periodo, segmentos in _dict(periodos, f"budget_envios.{pais}").items():
+            if periodo not in PERIODOS:
+                _error(f"budget_envios.{pais}.{periodo}", f"periodo debe ser uno de {PERIODOS}")
+            for segmento, canales in _dict(segmentos, f"budget_envios.{pais}.{periodo}").items():
+                ruta = f"budget_envios.{pais}.{periodo}.{segmento}"
+                if segmento not in SEGMENTOS_CUPO:
+                    _error(ruta, f"segmento debe ser uno de {SEGMENTOS_CUPO}")
+                for canal, cupo in _dict(canales, ruta).items():
+                    if canal not in CANALES_CUPO:
+                        _error(f"{ruta}.{canal}", f"canal debe ser uno de {CANALES_CUPO}")
+                    if not isinstance(cupo, int) or isinstance(cupo, bool):
+                        _error(f"{ruta}.{canal}", "el cupo debe ser un entero")
+                    _numero(cupo, f"{ruta}.{canal}")
+
+# ------------------ COMPILACIÓN ------------------ #
+
+def _congelar(valor):
+    if isinstance(valor, dict):
+        return MappingProxyType({k: _congelar(v) for k, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+def _compilar_matrices_costo(channels, paises, costos_cop):
+    """
+    Matrices densas país × canal canónico × proveedor × canal configurado.
+    El último eje es el fallback: 0 = nombre que no está en "canales",
+    1 + i = i-ésimo canal de "canales" (su propio costo, como CHANNELS.get(canal)).
+    El costo final es COSTO_COP + COSTO_USD * fx: COSTO_USD solo es distinto
+    de 0 cuando el fallback de "canales" está en USD. COSTO_OK marca las
+    celdas con costo resuelto (tabla por país o canal configurado).
+    """
+    nombres = list(channels)
+    forma = (len(paises) + 1, len(Canal), len(Proveedor), len(nombres) + 1)
+    costo_cop = np.zeros(forma, dtype="float64")
+    costo_usd = np.zeros(forma, dtype="float64")
+    costo_ok = np.zeros(forma, dtype=bool)
+
+    # Fallback: "canales", por nombre exacto, para los países sin tabla
+    for i, nombre in enumerate(nombres, start=1):
+        info = channels[nombre]
+        destino = costo_cop if info["moneda"] == "COP" else costo_usd
+        destino[..., i] = float(info["costo"])
+        costo_ok[..., i] = True
+
+    for i_pais, pais in enumerate(paises):
+        for (canal, prov), tabla in TABLAS_COSTO.items():
+            base_cop = costos_cop.get(tabla, {}).get(pais)
+            if base_cop is not None:
+                costo_cop[i_pais, canal, prov, :] = float(base_cop)
+                costo_usd[i_pais, canal, prov, :] = 0.0
+                costo_ok[i_pais, canal, prov, :] = True
+
+    for matriz in (costo_cop, costo_usd, costo_ok):
+        matriz.setflags(write=False)
+    return costo_cop, costo_usd, costo_ok
+
+def _compilar_costos_escalares(channels, paises, matriz_cop, matriz_usd, matriz_ok) -> dict:
+    """
+    (canal, pais, proveedor_sms) → (cop, usd) para los canales configurados
+    en sus países, con los proveedores tal como llegan de la UI ("Masive",
+    "Nua" o None). Sale de las mismas matrices; los nombres libres, países
+    sin tabla o canales sin costo se resuelven por las matrices.
+    """
+    proveedores = {"Masive": Proveedor.MASIVE, "Nua": Proveedor.NUA, None: Proveedor.MASIVE}
+    costos = {}
+    for i_nombre, canal in enumerate(channels, start=1):
+        canonico = canal_canonico(canal)
+        for i_pais, pais in enumerate(paises):
+            for proveedor, i_prov in proveedores.items():
+                idx = (i_pais, canonico, i_prov, i_nombre)
+                if matriz_ok[idx]:
+                    costos[(canal, pais, proveedor)] = (float(matriz_cop[idx]), float(matriz_usd[idx]))
+    return costos
+
+def compilar(datos: dict, huella: str = "") -> ConfigPrecios:
+    """
+    Valida y compila los datos del archivo en un snapshot inmutable.
+    """
+    validar(datos)
+    paises = tuple(datos["paises"])
+    matriz_cop, matriz_usd, matriz_ok = _compilar_matrices_costo(
+        datos["canales"], paises, datos["costos_cop"]
+    )
+    return ConfigPrecios(
+        version=datos["version"],
+        huella=huella,
+        channels=_congelar(datos["canales"]),
+        paises=paises,
+        costos_cop=_congelar(datos["costos_cop"]),
+        budget_envios=_congelar(datos["budget_envios"]),
+        indice_pais=MappingProxyType({p: i for i, p in enumerate(paises)}),
+        indice_canal=MappingProxyType({c: i for i, c in enumerate(datos["canales"], start=1)}),
+        matriz_costo_cop=matriz_cop,
+        matriz_costo_usd=matriz_usd,
+        matriz_costo_ok=matriz_ok,
+        costos_escalares=MappingProxyType(
+            _compilar_costos_escalares(datos["canales"], paises, matriz_cop, matriz_usd, matriz_ok)
+        ),
+    )
+
+def _leer(ruta: str) -> tuple:
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    try:
+        datos = json.loads(contenido.decode("utf-8"))
+    except ValueError as e:
+        raise ValueError(f"{ruta} no es un JSON válido: {e}") from None
+    return datos, hashlib.sha256(contenido).hexdigest()
+
+def cargar(ruta: str) -> ConfigPrecios:
+    datos, huella = _leer(ruta)
+    return compilar(datos, huella)
+
+# ------------------ REGISTRO DE VERSIONES ------------------ #
+
+def ruta_config() -> str:
+    return os.environ.get("MDHUB_PRECIOS", RUTA_DEFAULT)
+
+def ruta_historial() -> str:
+    return os.environ.get("MDHUB_PRECIOS_HISTORIAL", RUTA_HISTORIAL_DEFAULT)
+
+_actual = None
+_versiones = {}
+_firma = None
+_proxima_revision = 0.0
+_ultimo_error = None
+_cargada_en = None
+_lock_recarga = threading.Lock()
+
+def _archivar(config: ConfigPrecios, ruta_origen: str):
+    """
+    Copia la versión al historial si no estaba (las versiones no se reescriben).
+    """
+    carpeta = ruta_historial()
+    destino = os.path.join(carpeta, f"{config.version}.json")
+    if os.path.exists(destino):
+        return
+    os.makedirs(carpeta, exist_ok=True)
+    with open(ruta_origen, "rb") as f:
+        contenido = f.read()
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(contenido)
+    os.replace(temporal, destino)
+
+def _registrar(config: ConfigPrecios):
+    conocida = _versiones.get(config.version)
+    if conocida is None:
+        conocida = version(config.version, None)
+    if conocida is not None and conocida.huella != config.huella:
+        raise ValueError(
+            f"La versión {config.version} ya existe con otro contenido; "
+            "cambia 'version' al modificar precios o cupos."
+        )
+    _versiones[config.version] = config
+
+def recargar(forzar: bool = False) -> ConfigPrecios:
+    """
+    Recompila el archivo si su mtime / tamaño cambió (o siempre con forzar).
+    Si falla y ya hay un snapshot, se conserva el anterior.
+    """
+    global _actual, _firma, _proxima_revision, _ultimo_error, _cargada_en
+
+    ruta = ruta_config()
+    with _lock_recarga:
+        _proxima_revision = time.monotonic() + INTERVALO_REVISION
+        firma = None
+        try:
+            stat = os.stat(ruta)
+            firma = (ruta, stat.st_mtime_ns, stat.st_size)
+            if firma == _firma and not forzar and _actual is not None:
+                return _actual
+            nueva = cargar(ruta)
+            _registrar(nueva)
+        except (OSError, ValueError) as e:
+            _ultimo_error = str(e)
+            if _actual is None:
+                raise
+            # No se vuelve a intentar hasta que el archivo cambie otra vez
+            _firma = firma or _firma
+            return _actual
+
+        _firma = firma
+        _actual = nueva
+        _ultimo_error = None
+        _cargada_en = time.time()
+        try:
+            _archivar(nueva, ruta)
+        except OSError as e:
+            # Sin historial la versión igual se sirve; solo no queda archivada
+            _ultimo_error = f"No se pudo archivar la versión {nueva.version}: {e}"
+        return nueva
+
+def actual() -> ConfigPrecios:
+    """
+    Snapshot vigente. Sin locks en el camino normal: la revisión del
+    archivo solo corre cada INTERVALO_REVISION segundos.
+    """
+    config = _actual
+    if config is None or time.monotonic() >= _proxima_revision:
+        if _lock_recarga.locked() and config is not None:
+            # Otra sesión está recargando: se sirve el snapshot vigente
+            return config
+        config = recargar()
+    return config
+
+_SIN_VERSION = object()
+
+def version(nombre: str, default=_SIN_VERSION) -> ConfigPrecios:
+    """
+    Snapshot de una versión publicada (en memoria o en el historial).
+    """
+    config = _versiones.get(nombre)
+    if config is not None:
+        return config
+    ruta = os.path.join(ruta_historial(), f"{nombre}.json")
+    if not os.path.exists(ruta):
+        if default is _SIN_VERSION:
+            raise KeyError(f"No existe la versión de precios {nombre}")
+        return default
+    config = cargar(ruta)
+    return _versiones.setdefault(nombre, config)
+
+def versiones() -> list:
+    """
+    Versiones disponibles (cargadas en el proceso o archivadas).
+    """
+    nombres = set(_versiones)
+    carpeta = ruta_historial()
+    if os.path.isdir(carpeta):
+        nombres.update(f[: -len(".json")] for f in os.listdir(carpeta) if f.endswith(".json"))
+    return sorted(nombres)
+
+def estado() -> dict:
+    config = actual()
+    return {
+        "version": config.version,
+        "ruta": ruta_config(),
+        "cargada_en": _cargada_en,
+        "ultimo_error": _ultimo_error,
+        "versiones": versiones(),
+    }
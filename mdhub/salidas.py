@@ -0,0 +1,70 @@
+"""
+Archivos de salida de la app (resultados de planes masivos, ZIP de briefs).
+
+Viven en una carpeta administrada, MDHUB_SALIDAS (por defecto
+data/salidas en la raíz del repo), y no en el /tmp del sistema: la sesión
+de Streamlit guarda solo la clave (el nombre del archivo) y el contenido
+queda en disco. Cada archivo vence TTL_SEGUNDOS después de escrito; los
+vencidos se borran cada vez que se crea uno nuevo, así los de sesiones ya
+cerradas no se acumulan.
+"""
+
+import os
+import time
+import uuid
+
+RUTA_DEFAULT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "salidas")
+TTL_SEGUNDOS = 2 * 60 * 60
+
+def carpeta() -> str:
+    return os.environ.get("MDHUB_SALIDAS", RUTA_DEFAULT)
+
+def limpiar(ttl_segundos: float = TTL_SEGUNDOS) -> int:
+    """
+    Borra los archivos vencidos; devuelve cuántos borró.
+    """
+    limite = time.time() - ttl_segundos
+    borrados = 0
+    try:
+        entradas = list(os.scandir(carpeta()))
+    except FileNotFoundError:
+        return 0
+    for entrada in entradas:
+        try:
+            if entrada.is_file() and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+                borrados += 1
+        except FileNotFoundError:  # otra sesión lo borró primero
+            pass
+    return borrados
+
+def nueva(prefijo: str, sufijo: str) -> tuple:
+    """
+    (clave, ruta) de un archivo de salida nuevo, después de limpiar los
+    vencidos. El archivo lo escribe quien llama.
+    """
+    limpiar()
+    os.makedirs(carpeta(), exist_ok=True)
+    clave = f"{prefijo}{uuid.uuid4().hex}{sufijo}"
+    return clave, os.path.join(carpeta(), clave)
+
+def ruta(clave) -> str:
+    """
+    Ruta de una salida vigente, o None si no existe o ya venció.
+    """
+    if not clave or os.path.basename(clave) != clave:
+        return None
+    destino = os.path.join(carpeta(), clave)
+    try:
+        vigente = os.stat(destino).st_mtime >= time.time() - TTL_SEGUNDOS
+    except FileNotFoundError:
+        return None
+    return destino if vigente else None
+
+def borrar(clave) -> None:
+    destino = ruta(clave)
+    if destino is not None:
+        try:
+            os.remove(destino)
+        except FileNotFoundError:
+            pass
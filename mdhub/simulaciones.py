@@ -0,0 +1,206 @@
+"""
+Simulaciones de un canal (sin Streamlit).
+
+- Simulación 1: con este presupuesto, ¿cuántos envíos, MQL y SQL?
+- Simulación 2: para X MQL / SQL objetivo, ¿qué base y qué budget?
+
+Mismas reglas que la página "Simulaciones": 1 envío por contacto, MQL /
+SQL con floor y bases necesarias con ceil. Los casos sin solución (budget
+0, costo 0, tasas 0) levantan ValueError con el mensaje para el usuario.
+"""
+
+import math
+
+import numpy as np
+
+from . import cambio, precios
+from .costos import get_cost_cop
+from .motor import FUNNEL_DIRECTO
+
+OBJETIVOS = ("sql", "mql")
+
+# ------------------ HELPERS ------------------ #
+
+def _tasas(canal: str, tasa_mql, tasa_sql, config) -> tuple:
+    """
+    Tasas None → defaults del canal en la config de precios.
+    """
+    info = config.channels.get(canal, {})
+    if tasa_mql is None:
+        tasa_mql = info.get("tasa_mql", 0.0)
+    if tasa_sql is None:
+        tasa_sql = info.get("tasa_sql", 0.0)
+    return float(tasa_mql), float(tasa_sql)
+
+# ------------------ SIMULACIÓN 1 ------------------ #
+
+def simulacion_presupuesto(
+    budget: float,
+    canal: str,
+    pais: str,
+    proveedor_sms: str = "Masive",
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    tasa_mql: float = None,
+    tasa_sql: float = None,
+    moneda_trabajo: str = "COP",
+    tipo_cambio: float = 4000.0,
+    config=None,
+) -> dict:
+    """
+    Envíos, MQL y SQL alcanzables con `budget` (en la moneda de trabajo).
+    """
+    config = config or precios.actual()
+    tasa_mql, tasa_sql = _tasas(canal, tasa_mql, tasa_sql, config)
+    costo_unit_cop = get_cost_cop(canal, tipo_cambio, pais, proveedor_sms, config)
+
+    if budget <= 0:
+        raise ValueError("Ingresa un budget mayor a 0.")
+    if costo_unit_cop <= 0:
+        raise ValueError("El costo unitario del canal es 0; no se puede simular.")
+
+    budget_cop = cambio.a_cop(budget, moneda_trabajo, tipo_cambio)
+    envios = math.floor(budget_cop / costo_unit_cop)
+    base = envios  # asumimos 1 envío por contacto
+    if envios <= 0:
+        raise ValueError("Con ese budget no alcanzas ni un envío.")
+
+    if tipo_funnel == FUNNEL_DIRECTO:
+        mql = math.floor(base * tasa_sql)
+        sql = mql
+    else:
+        mql = math.floor(base * tasa_mql)
+        sql = math.floor(mql * tasa_sql)
+
+    cps_cop = budget_cop / sql if sql > 0 else 0.0
+    return {
+        "canal": canal,
+        "costo_unit_cop": costo_unit_cop,
+        "budget": budget,
+        "budget_cop": budget_cop,
+        "envios": envios,
+        "base": base,
+        "mql": mql,
+        "sql": sql,
+        "costo_por_sql_cop": cps_cop,
+        "costo_por_sql": cambio.desde_cop(cps_cop, moneda_trabajo, tipo_cambio),
+        "moneda_trabajo": moneda_trabajo,
+    }
+
+# ------------------ SIMULACIÓN 2 ------------------ #
+
+def simulacion_objetivo(
+    objetivo: str,
+    cantidad: int,
+    canal: str,
+    pais: str,
+    proveedor_sms: str = "Masive",
+    tipo_funnel: str = FUNNEL_DIRECTO,
+    tasa_mql: float = None,
+    tasa_sql: float = None,
+    moneda_trabajo: str = "COP",
+    tipo_cambio: float = 4000.0,
+    config=None,
+) -> dict:
+    """
+    Base, envíos y budget necesarios para `cantidad` MQL o SQL.
+    objetivo: "sql" o "mql".
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: {objetivo} (usa {' / '.join(OBJETIVOS)})")
+    config = config or precios.actual()
+    tasa_mql, tasa_sql = _tasas(canal, tasa_mql, tasa_sql, config)
+    costo_unit_cop = get_cost_cop(canal, tipo_cambio, pais, proveedor_sms, config)
+
+    if costo_unit_cop <= 0:
+        raise ValueError("El costo unitario del canal es 0; no se puede simular.")
+    if cantidad <= 0:
+        raise ValueError("Ingresa al menos un objetivo (MQL o SQL) para esta simulación.")
+
+    directo = tipo_funnel == FUNNEL_DIRECTO
+    if objetivo == "sql":
+        if directo:
+            if tasa_sql <= 0:
+                raise ValueError("Tasa SQL = 0. No se puede calcular base para el SQL objetivo.")
+            base = math.ceil(cantidad / tasa_sql)
+            mql = cantidad  # en directo, MQL=SQL
+        else:
+            if tasa_mql <= 0 or tasa_sql <= 0:
+                raise ValueError(
+                    "Tasa MQL o SQL = 0. No se puede calcular base para el SQL objetivo."
+                )
+            base = math.ceil(cantidad / (tasa_mql * tasa_sql))
+            mql = math.ceil(base * tasa_mql)
+        sql = cantidad
+    else:
+        if directo:
+            # En directo, MQL = SQL efectivos
+            if tasa_sql <= 0:
+                raise ValueError(
+                    "Tasa SQL = 0. No se puede calcular base para el MQL objetivo en funnel directo."
+                )
+            base = math.ceil(cantidad / tasa_sql)
+            sql = cantidad
+        else:
+            if tasa_mql <= 0:
+                raise ValueError("Tasa MQL = 0. No se puede calcular base para el MQL objetivo.")
+            base = math.ceil(cantidad / tasa_mql)
+            sql = math.floor(cantidad * tasa_sql)
+        mql = cantidad
+
+    envios = base
+    budget_cop = envios * costo_unit_cop
+    return {
+        "canal": canal,
+        "objetivo": objetivo,
+        "cantidad": cantidad,
+        "costo_unit_cop": costo_unit_cop,
+        "base": base,
+        "envios": envios,
+        "mql": mql,
+        "sql": sql,
+        "budget_cop": budget_cop,
+        "budget": cambio.desde_cop(budget_cop, moneda_trabajo, tipo_cambio),
+        "moneda_trabajo": moneda_trabajo,
+    }
+
+# ------------------ VERSIÓN VECTORIZADA ------------------ #
+
+def objetivo_vectorizado(objetivo: str, cantidades, tasa_mql, tasa_sql, directo, costo_unit_cop) -> dict:
+    """
+    Simulación 2 sobre arreglos (misma regla que simulacion_objetivo).
+    Las filas sin solución (tasas 0) quedan con base = -1 y budget NaN.
+    Devuelve arreglos base, envios, mql, sql y budget_cop.
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: {objetivo} (usa {' / '.join(OBJETIVOS)})")
+    cantidades = np.asarray(cantidades, dtype="int64")
+    tasa_mql, tasa_sql, directo, costo_unit_cop = np.broadcast_arrays(
+        np.asarray(tasa_mql, dtype="float64"),
+        np.asarray(tasa_sql, dtype="float64"),
+        np.asarray(directo, dtype=bool),
+        np.asarray(costo_unit_cop, dtype="float64"),
+    )
+
+    if objetivo == "sql":
+        tasa = np.where(directo, tasa_sql, tasa_mql * tasa_sql)
+        valida = np.where(directo, tasa_sql > 0, (tasa_mql > 0) & (tasa_sql > 0))
+    else:
+        tasa = np.where(directo, tasa_sql, tasa_mql)
+        valida = tasa > 0
+    base = np.ceil(np.divide(cantidades, tasa, out=np.zeros(tasa.shape), where=valida))
+    base = np.where(valida, base, -1).astype("int64")
+
+    if objetivo == "sql":
+        mql = np.where(directo, cantidades, np.ceil(base * tasa_mql)).astype("int64")
+        sql = np.broadcast_to(cantidades, base.shape)
+    else:
+        mql = np.broadcast_to(cantidades, base.shape)
+        sql = np.where(directo, cantidades, np.floor(cantidades * tasa_sql)).astype("int64")
+
+    return {
+        "base": base,
+        "envios": base,
+        "mql": np.where(valida, mql, -1),
+        "sql": np.where(valida, sql, -1),
+        "budget_cop": np.where(valida, base * costo_unit_cop, np.nan),
+    }
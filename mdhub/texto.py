@@ -0,0 +1,64 @@
+"""
+Normalización de texto para la búsqueda de copies.
+
+El mismo normalizador se aplica a los copies al indexarlos y a la consulta:
+minúsculas, sin tildes, placeholders {{hubspot_*}} como un solo token,
+números sin símbolos ni separadores de miles ("$850" → "850",
+"5.000" → "5000") y un stemmer liviano de español (plurales y sufijos
+comunes), para que "negocios" encuentre "negocio" y "electrónica" encuentre
+"electrónicamente".
+"""
+
+import re
+import unicodedata
+
+_RE_PLACEHOLDER = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+_RE_MILES = re.compile(r"(?<=\d)[.,](?=\d{3}\b)")
+_RE_TOKEN = re.compile(r"[a-z0-9_]+")
+
+# Sufijos de más largo a más corto; se quita el primero que calce
+_SUFIJOS = (
+    "amientos", "imientos", "amiento", "imiento",
+    "aciones", "uciones", "acion", "ucion",
+    "mente", "idades", "idad",
+    "ables", "ibles", "able", "ible",
+    "istas", "ista",
+    "osos", "osas", "oso", "osa",
+    "ivos", "ivas", "ivo", "iva",
+    "es", "s",
+)
+_VOCALES_FINALES = "aeo"
+_MIN_RAIZ = 3
+
+def sin_tildes(texto: str) -> str:
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+def raiz(palabra: str) -> str:
+    """
+    Stem liviano: quita un sufijo común y la vocal final. Números y
+    placeholders se dejan tal cual.
+    """
+    if "_" in palabra or palabra.isdigit() or len(palabra) <= _MIN_RAIZ:
+        return palabra
+    for sufijo in _SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= _MIN_RAIZ:
+            palabra = palabra[: -len(sufijo)]
+            break
+    if palabra[-1] in _VOCALES_FINALES and len(palabra) > _MIN_RAIZ:
+        palabra = palabra[:-1]
+    return palabra
+
+def tokens(texto) -> list:
+    """
+    Tokens normalizados de un texto (vacío si es None).
+    """
+    if not texto:
+        return []
+    texto = _RE_PLACEHOLDER.sub(lambda m: f" {m.group(1)} ", str(texto))
+    texto = sin_tildes(texto.lower())
+    texto = _RE_MILES.sub("", texto)
+    return [raiz(t) for t in _RE_TOKEN.findall(texto)]
+
+def normalizar(texto) -> str:
+    return " ".join(tokens(texto))
@@ -0,0 +1,6 @@
+"""
+Páginas de la app Streamlit (una por módulo).
+
+app.py importa cada página recién cuando se navega a ella; la lógica sin
+Streamlit está en `mdhub`.
+"""
@@ -0,0 +1,779 @@
+"""
+Página Calculadora: formulario de campaña, resultado, reserva de cupos,
+deduplicación de bases de contactos y planes masivos.
+"""
+
+import os
+import tempfile
+import zipfile
+
+import pandas as pd
+import streamlit as st
+
+from mdhub import calculadora, cambio, cupos, importacion, metricas, posteriores, precios, salidas
+from mdhub.cache import CACHE_CALCULOS, clave_canonica
+from mdhub.costos import costo_cop_vectorizado
+from mdhub.motor import FUNNEL_DIRECTO
+
+# ------------------ PÁGINA: CALCULADORA ------------------ #
+
+PROVEEDORES_SMS = ["Masive", "Nua"]
+SEGMENTOS = ["Contadores", "Empresarios", "Empresarios y Contadores", "Aliados", "Otro"]
+COLUMNAS_MIX = ["canal", "proveedor_sms", "segmento", "base", "tasa_mql", "tasa_sql"]
+# Claves de lineas_mix que son solo para la UI (no van a calcular_campania)
+CLAVES_UI = ("linea", "estimacion")
+
+def page_calculadora():
+    st.header("Calculadora de Marketing Directo (SQL y costos)")
+    config = precios.actual()
+    if "calc_mix" not in st.session_state:
+        st.session_state.calc_mix = mix_inicial(config)
+
+    with metricas.medir("calculadora.base_contactos"):
+        seccion_base_contactos()
+
+    with st.form("calc_form"), metricas.medir("calculadora.formulario"):
+        # Moneda, tasa de cambio y país
+        colm1, colm2, colm3 = st.columns(3)
+        moneda_trabajo = colm1.selectbox(
+            "Moneda de trabajo (visualización)",
+            ["COP", "USD"],
+            help="Si eliges USD, igualmente todos los cálculos internos se hacen en COP.",
+        )
+        fecha_fx, tasa_fx = cambio.tasa_vigente()
+        tipo_cambio = colm2.number_input(
+            "Tasa de cambio USD → COP",
+            min_value=1.0,
+            value=tasa_fx,
+            step=50.0,
+            help=(
+                f"Última tasa publicada ({fecha_fx})." if fecha_fx
+                else "Sin tabla de tasas (config/tasas_cambio.csv): ejemplo 1 USD = 4000 COP."
+            ),
+        )
+        pais = colm3.selectbox(
+            "País de la campaña",
+            config.paises,
+        )
+
+        colp1, colp2 = st.columns(2)
+        proveedor_sms = colp1.selectbox(
+            "Proveedor SMS para esta campaña",
+            PROVEEDORES_SMS,
+            index=0,
+            help="Solo afecta el costo del canal SMS según país. Aplica a las líneas sin proveedor propio.",
+        )
+        periodo_ppto = colp2.selectbox(
+            "Período de presupuesto para validar envíos",
+            ["Mensual", "Anual"],
+            index=0,
+        )
+
+        # Datos generales de la base / campaña
+        st.markdown("### Datos de la campaña")
+
+        base_label = st.text_input(
+            "Descripción de la base",
+            "MQLs abiertos de Empresarios y Contadores",
+        )
+
+        colA, colB = st.columns(2)
+        num_envios_contacto = colA.number_input(
+            "Cantidad de envíos por contacto",
+            min_value=0.0,
+            value=1.0,
+            step=0.5,
+            help="1 envío = un solo push por contacto.",
+        )
+        budget_input = colB.number_input(
+            f"Budget total (opcional) en {moneda_trabajo}",
+            min_value=0.0,
+            value=0.0,
+            step=10.0,
+            help="Si lo dejas en 0, el costo se calcula solo con costos unitarios.",
+        )
+
+        col1, col2 = st.columns(2)
+        tipo_funnel = col1.radio(
+            "Tipo de funnel de la campaña",
+            ["Directo a SQL", "MQL → SQL"],
+            index=0,
+            help=(
+                "Directo a SQL: la tasa SQL aplica sobre la base y MQL=SQL.\n"
+                "MQL → SQL: primero tasa MQL sobre base y luego tasa SQL sobre MQL."
+            ),
+            horizontal=True,
+        )
+        segmento = col2.radio(
+            "Segmento",
+            SEGMENTOS,
+            index=2,
+            horizontal=True,
+            help="Aplica a las líneas del mix sin segmento propio.",
+        )
+
+        # --- Mix de canales: una línea por canal / proveedor / segmento --- #
+        st.markdown("### Mix de canales")
+        mix = editor_mix(config)
+        lineas = lineas_mix(mix, config, pais, segmento, tipo_funnel)
+        if lineas:
+            costos_cop = costo_cop_vectorizado(
+                [l["canal"] for l in lineas],
+                pais,
+                [l.get("proveedor_sms") or proveedor_sms for l in lineas],
+                float(tipo_cambio),
+                config,
+            )
+            costos_fmt = [
+                cambio.formatear(c, moneda_trabajo, 4)
+                for c in cambio.desde_cop(costos_cop, moneda_trabajo, tipo_cambio)
+            ]
+            st.info(
+                f"Costo unitario estimado ({moneda_trabajo}): "
+                + " · ".join(
+                    f"{l['linea']}. {l['canal']} **{c}**" for l, c in zip(lineas, costos_fmt)
+                )
+            )
+            st.caption(nota_tasas(lineas, tipo_funnel))
+
+        with st.expander("Simulación Monte Carlo (opcional)"):
+            from .montecarlo import opciones_montecarlo
+
+            mc_config = opciones_montecarlo("calc")
+
+        submitted = st.form_submit_button("Calcular")
+
+    with metricas.medir("calculadora.plan_masivo"):
+        seccion_plan_masivo()
+
+    with metricas.medir("calculadora.matriz_escenarios"):
+        seccion_matriz_escenarios(
+            config, moneda_trabajo, float(tipo_cambio), periodo_ppto, tipo_funnel,
+            float(num_envios_contacto), sum(l["base"] for l in lineas),
+        )
+
+    if submitted:
+        # Líneas con canal y base > 0; las claves de CLAVES_UI son solo para la UI
+        canales_config = [
+            {k: v for k, v in l.items() if k not in CLAVES_UI}
+            for l in lineas_mix(mix, config, pais, segmento, tipo_funnel)
+        ]
+
+        st.session_state.calc_entradas = None
+        if not canales_config:
+            st.warning("Configura al menos un canal con base > 0.")
+            return
+
+        if num_envios_contacto <= 0:
+            st.warning("La cantidad de envíos por contacto debe ser mayor a 0.")
+            return
+
+        st.session_state.calc_entradas = {
+            "canales": canales_config,
+            "moneda_trabajo": moneda_trabajo,
+            "tipo_cambio": float(tipo_cambio),
+            "pais": pais,
+            "proveedor_sms": proveedor_sms,
+            "periodo_ppto": periodo_ppto,
+            "segmento": segmento,
+            "tipo_funnel": tipo_funnel,
+            "num_envios_contacto": float(num_envios_contacto),
+            "budget_input": float(budget_input),
+            "base_label": base_label,
+            "version_precios": config.version,
+        }
+        st.session_state.calc_mc = mc_config
+
+    # Los resultados se mantienen entre reruns y se sirven desde la caché
+    entradas = st.session_state.get("calc_entradas")
+    if not entradas:
+        return
+    mostrar_calculo(entradas, st.session_state.get("calc_mc"))
+
+def mostrar_calculo(entradas: dict, mc_config=None):
+    with metricas.medir("calculadora.calculo"):
+        calc = calculadora.calcular_campania_cacheado(entradas)
+
+    moneda_trabajo = entradas["moneda_trabajo"]
+    tipo_cambio = entradas["tipo_cambio"]
+    budget_input = entradas["budget_input"]
+    total_base = calc["total_base"]
+    total_sql = calc["total_sql"]
+    total_costo_cop = calc["total_costo_cop"]
+    costo_total_calc = calc["costo_total_calc"]
+    cps_calc = calc["cps_calc"]
+    cps_budget = calc["cps_budget"]
+
+    # ------------------ MÉTRICAS ARRIBA ------------------ #
+    cps_metric_fmt = cambio.formatear(cps_calc, moneda_trabajo) if total_sql > 0 else "N/A"
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Base total", f"{int(total_base):,}")
+    col2.metric("SQL totales", f"{int(total_sql):,}")
+    col3.metric("Costo por SQL (calculado)", f"{cps_metric_fmt} {moneda_trabajo}")
+
+    # ------------------ RESUMEN DE COSTOS ------------------ #
+    costo_total_fmt = cambio.formatear(costo_total_calc, moneda_trabajo)
+
+    st.markdown("#### Resumen de costos")
+    st.write(
+        f"- Costo total estimado (calculado): **{costo_total_fmt} {moneda_trabajo}** "
+        f"(~{total_costo_cop:,.0f} COP)"
+    )
+    if cps_budget is not None:
+        cps_budget_fmt = cambio.formatear(cps_budget, moneda_trabajo)
+        st.write(
+            f"- Costo por SQL según budget ({budget_input:.2f} {moneda_trabajo}): "
+            f"**{cps_budget_fmt} {moneda_trabajo}**"
+        )
+
+    # ------------------ USO DE CUPOS VS PPTOS ------------------ #
+    st.markdown("#### Uso de cupos de envíos vs presupuesto")
+
+    with metricas.medir("calculadora.cupos"):
+        for alerta in calc["alertas_cupo"]:
+            st.error(alerta)
+
+        if calc["cap_rows"]:
+            seccion_reserva_cupos(entradas, calc)
+
+    # ------------------ OUTPUT FORMATO TEXTO ------------------ #
+    output_text = calc["output_text"]
+    resultados_canales = calc["resultados_canales"]
+    resultado = calc["resultado"]
+
+    st.markdown("### Output en formato texto para copiar")
+    with metricas.medir("calculadora.texto"):
+        st.text_area("Formato calculado", value=output_text, height=360)
+
+    # fpdf2 es de los imports más pesados: se carga con el primer cálculo
+    with metricas.medir("calculadora.brief"):
+        from mdhub import briefs
+
+        brief_pdf = CACHE_CALCULOS.obtener_o_calcular(
+            clave_canonica("brief", entradas),
+            lambda: briefs.render_pdf(briefs.contenido_calculadora(calc, entradas)),
+        )
+    st.download_button(
+        "Descargar brief (PDF)",
+        data=brief_pdf,
+        file_name=briefs.nombre_archivo(entradas.get("base_label") or "brief_campania"),
+        mime="application/pdf",
+        key="btn_descargar_brief",
+    )
+
+    st.markdown("### Detalle de la campaña (por canal)")
+    with metricas.medir("calculadora.detalle"):
+        st.dataframe(
+            pd.DataFrame(resultados_canales),
+            use_container_width=True,
+        )
+
+    if mc_config and mc_config["activo"]:
+        st.markdown("### Simulación Monte Carlo")
+        with metricas.medir("calculadora.montecarlo"):
+            from .montecarlo import mostrar_montecarlo
+
+            mostrar_montecarlo(resultado, mc_config, moneda_trabajo, tipo_cambio)
+
+def seccion_reserva_cupos(entradas: dict, calc: dict):
+    """
+    Reserva de los envíos de la campaña en el libro de cupos y tabla de uso
+    con lo ya reservado por otras campañas.
+    """
+    col_r1, col_r2 = st.columns(2)
+    fecha = col_r1.date_input("Fecha de la campaña", key="calc_reserva_fecha")
+    nombre = col_r2.text_input(
+        "Nombre de la campaña", value=entradas["base_label"], key="calc_reserva_nombre"
+    )
+
+    # Si esta misma campaña ya se reservó, sus envíos ya están en los contadores
+    clave_reserva = clave_canonica("reserva", [entradas, fecha.isoformat()])
+    reservada = st.session_state.get("calc_reserva")
+    ya_reservada = bool(reservada) and reservada[0] == clave_reserva
+
+    if st.button("Reservar envíos", key="btn_reservar_cupos", disabled=ya_reservada):
+        filas = [
+            {
+                "pais": entradas["pais"],
+                "segmento": r["segmento"],
+                "canal": r["canal"],
+                "envios": r["envios"],
+            }
+            for r in calc["resultados_canales"]
+        ]
+        reserva = cupos.reservar(nombre, filas, fecha)
+        if reserva["ok"]:
+            reservada = st.session_state.calc_reserva = (clave_reserva, reserva["reserva_id"])
+            ya_reservada = True
+            st.success(f"Reserva #{reserva['reserva_id']} registrada.")
+        elif not reserva["excedidos"]:
+            st.info("La campaña no usa canales con cupo: no hay nada que reservar.")
+        else:
+            for e in reserva["excedidos"]:
+                pais, periodo, ventana, segmento, canal = e["clave"]
+                st.error(
+                    f"No se reservó: {canal} en {pais} ({segmento}, {periodo} {ventana}) "
+                    f"tiene {e['reservados']:,} de {e['cupo']:,} envíos reservados "
+                    f"y la campaña pide {e['envios']:,}."
+                )
+
+    if ya_reservada:
+        st.caption(f"Esta campaña ya está reservada (reserva #{reservada[1]}).")
+
+    cap_rows, alertas = cupos.uso_con_reservas(calc["cap_rows"], fecha, ya_reservada)
+    for alerta in alertas:
+        st.error(alerta)
+    st.dataframe(pd.DataFrame(cap_rows), use_container_width=True)
+
+    with st.expander("Reservas registradas"):
+        reservas = cupos.listar_reservas()
+        if reservas.empty:
+            st.caption("Aún no hay reservas.")
+        else:
+            st.dataframe(reservas, use_container_width=True, hide_index=True)
+            activas = sorted(reservas.loc[reservas["cancelada"] == 0, "id"].unique(), reverse=True)
+            if activas:
+                col_c1, col_c2 = st.columns(2)
+                reserva_id = col_c1.selectbox("Reserva", activas, key="calc_reserva_cancelar")
+                if col_c2.button("Cancelar reserva", key="btn_cancelar_reserva"):
+                    cupos.cancelar(reserva_id)
+                    if reservada and reservada[1] == reserva_id:
+                        st.session_state.calc_reserva = None
+                    st.rerun()
+
+# ------------------ MIX DE CANALES ------------------ #
+
+def mix_inicial(config) -> pd.DataFrame:
+    """
+    Una línea con el primer canal y las tasas vacías (se resuelven con el
+    histórico de resultados o los defaults del canal en lineas_mix).
+    """
+    canal = next(iter(config.channels))
+    return pd.DataFrame(
+        [
+            {
+                "canal": canal,
+                "proveedor_sms": None,
+                "segmento": None,
+                "base": 2858,
+                "tasa_mql": None,
+                "tasa_sql": None,
+            }
+        ],
+        columns=COLUMNAS_MIX,
+    )
+
+def mix_vigente() -> pd.DataFrame:
+    """
+    Último mix enviado con el formulario (o el inicial si aún no se envió).
+    """
+    return st.session_state.get("calc_mix_actual", st.session_state.calc_mix)
+
+def editor_mix(config) -> pd.DataFrame:
+    """
+    Tabla editable del mix (un solo widget para cualquier cantidad de
+    líneas). La key cambia con calc_mix_version para que el editor se
+    reinicie cuando otra sección reescribe calc_mix (p. ej. la deduplicación).
+    """
+    mix = st.data_editor(
+        st.session_state.calc_mix,
+        key=f"calc_mix_{st.session_state.get('calc_mix_version', 0)}",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "canal": st.column_config.SelectboxColumn(
+                "Canal", options=list(config.channels), required=True
+            ),
+            "proveedor_sms": st.column_config.SelectboxColumn(
+                "Proveedor SMS",
+                options=PROVEEDORES_SMS,
+                help="Vacío = el proveedor de la campaña. Solo afecta SMS.",
+            ),
+            "segmento": st.column_config.SelectboxColumn(
+                "Segmento", options=SEGMENTOS, help="Vacío = el segmento de la campaña."
+            ),
+            "base": st.column_config.NumberColumn(
+                "Contactos", min_value=0, step=100, format="%d", default=0
+            ),
+            "tasa_mql": st.column_config.NumberColumn(
+                "Tasa MQL (0-1)",
+                min_value=0.0,
+                max_value=1.0,
+                step=0.0001,
+                format="%.4f",
+                help=(
+                    "Vacía = tasa del histórico de resultados (o default del canal). "
+                    "Solo aplica si el funnel es MQL → SQL."
+                ),
+            ),
+            "tasa_sql": st.column_config.NumberColumn(
+                "Tasa SQL (0-1)",
+                min_value=0.0,
+                max_value=1.0,
+                step=0.0001,
+                format="%.4f",
+                help=(
+                    "Vacía = tasa del histórico de resultados (o default del canal). "
+                    "En Directo: tasa de contactos que llegan a SQL. "
+                    "En MQL→SQL: tasa de MQL que pasan a SQL."
+                ),
+            ),
+        },
+    )
+    st.session_state.calc_mix_actual = mix
+    return mix
+
+def lineas_mix(mix: pd.DataFrame, config, pais: str, segmento: str, tipo_funnel: str) -> list:
+    """
+    Líneas válidas del mix (canal conocido y base > 0) en el formato de
+    calculadora.calcular_campania, resueltas por columnas: tasas vacías →
+    historico.tasas_default del canal / país / segmento (índice precalculado,
+    sin leer resultados; sin datos suficientes = defaults del canal);
+    proveedor y segmento vacíos se omiten (usan los de la campaña).
+    Solo para la UI: "linea" es la posición en la tabla, empezando en 1, y
+    "estimacion" es el resultado de tasas_default (media e intervalo).
+    """
+    # historico (y su índice de tasas) se carga con el primer render, no con el import de la página
+    from mdhub import historico
+
+    mix = mix.reset_index(drop=True)
+    canal = mix["canal"].astype("string").str.strip()
+    base = pd.to_numeric(mix["base"], errors="coerce").fillna(0)
+    validas = canal.isin(list(config.channels)).fillna(False).to_numpy() & (base > 0).to_numpy()
+    if not validas.any():
+        return []
+
+    mix = mix[validas]
+    canal = canal[validas].astype(str)
+    columnas = {
+        "linea": (mix.index + 1).tolist(),
+        "canal": canal.tolist(),
+        "base": base[validas].astype("int64").tolist(),
+    }
+    for col in ("proveedor_sms", "segmento"):
+        columnas[col] = mix[col].where(mix[col].notna(), "").astype(str).tolist()
+    defaults = [
+        historico.tasas_default(c, pais, s or segmento, tipo_funnel, config=config)
+        for c, s in zip(columnas["canal"], columnas["segmento"])
+    ]
+    for col in ("tasa_mql", "tasa_sql"):
+        columnas[col] = pd.to_numeric(mix[col], errors="coerce").fillna(
+            pd.Series([d[col] for d in defaults], index=mix.index)
+        ).tolist()
+    columnas["estimacion"] = defaults
+
+    lineas = []
+    for fila in zip(*columnas.values()):
+        linea = dict(zip(columnas, fila))
+        for col in ("proveedor_sms", "segmento"):
+            if not linea[col]:
+                del linea[col]
+        lineas.append(linea)
+    return lineas
+
+def nota_tasas(lineas: list, tipo_funnel: str) -> str:
+    """
+    Tasa esperada de cada línea con su intervalo creíble, marcando las
+    tasas escritas a mano que quedan fuera del intervalo.
+    """
+    columnas = [("tasa_sql", "intervalo_sql", "SQL")]
+    if tipo_funnel != FUNNEL_DIRECTO:
+        columnas.insert(0, ("tasa_mql", "intervalo_mql", "MQL"))
+    partes = []
+    for l in lineas:
+        est = l["estimacion"]
+        textos = []
+        for col, intervalo, etiqueta in columnas:
+            inferior, superior = est[intervalo]
+            texto = f"{etiqueta} {est[col]:.2%} [{inferior:.2%} – {superior:.2%}]"
+            if not posteriores.dentro_intervalo(l[col], est[intervalo]):
+                texto += f" ⚠ usas {l[col]:.2%}"
+            textos.append(texto)
+        fuente = (
+            f"histórico, {est['contactos']:,} contactos" if est["fuente"] == "historico" else "default del canal"
+        )
+        partes.append(f"{l['linea']}. {l['canal']} {' / '.join(textos)} ({fuente})")
+    return (
+        f"Tasas esperadas (media e intervalo creíble {lineas[0]['estimacion']['credibilidad']:.0%}): "
+        + " · ".join(partes)
+    )
+
+# ------------------ BASE DE CONTACTOS (DEDUP) ------------------ #
+
+def seccion_base_contactos():
+    from mdhub import contactos
+
+    with st.expander("Cargar base de contactos (normalizar y deduplicar)"):
+        st.caption(
+            "Sube la lista real de contactos de un canal: se normalizan teléfonos "
+            "(indicativo del país, espacios, 0 de marcación) o emails, se eliminan "
+            "duplicados y el conteo único llena la cantidad de contactos del canal."
+        )
+        col1, col2, col3 = st.columns(3)
+        mix = mix_vigente().reset_index(drop=True)
+        linea = col1.selectbox(
+            "Línea del mix de canales",
+            list(range(len(mix))),
+            format_func=lambda n: f"{n + 1}. {mix.at[n, 'canal'] if pd.notna(mix.at[n, 'canal']) else '—'}",
+            key="dedup_linea",
+        )
+        tipo = col2.selectbox(
+            "Tipo de contacto",
+            [contactos.TIPO_TELEFONO, contactos.TIPO_EMAIL],
+            format_func=lambda t: "Teléfono" if t == contactos.TIPO_TELEFONO else "Email",
+            key="dedup_tipo",
+        )
+        pais = col3.selectbox("País de los teléfonos", precios.actual().paises, key="dedup_pais")
+
+        colc1, colc2 = st.columns(2)
+        columna = colc1.text_input(
+            "Columna del contacto (vacío = detectar)", "", key="dedup_columna"
+        )
+        columna_pais = colc2.text_input(
+            "Columna de país por fila (opcional)", "", key="dedup_columna_pais"
+        )
+
+        archivo = st.file_uploader(
+            "Lista de contactos",
+            type=list(importacion.FORMATOS),
+            key="dedup_archivo",
+        )
+        procesar = st.button("Deduplicar", key="btn_dedup", disabled=archivo is None)
+
+        if procesar and archivo is not None:
+            progreso = st.empty()
+            try:
+                res = contactos.deduplicar_contactos(
+                    archivo,
+                    tipo,
+                    pais,
+                    columna=columna.strip() or None,
+                    columna_pais=columna_pais.strip() or None,
+                    al_avanzar=lambda n: progreso.write(f"Filas procesadas: {n:,}"),
+                )
+            except (ValueError, ImportError, MemoryError) as exc:
+                st.error(f"No se pudo procesar la base: {exc}")
+                return
+
+            if linea is not None:
+                # El conteo único pasa a la base de la línea; el editor se reinicia con él
+                mix.loc[linea, "base"] = res["unicos"]
+                st.session_state.calc_mix = mix
+                st.session_state.pop("calc_mix_actual", None)
+                st.session_state.calc_mix_version = st.session_state.get("calc_mix_version", 0) + 1
+                resultados = st.session_state.setdefault("dedup_resultados", {})
+                resultados[linea] = {**res, "canal": mix.at[linea, "canal"]}
+
+        for n, res in sorted(st.session_state.get("dedup_resultados", {}).items()):
+            st.write(
+                f"- Línea {n + 1}, {res['canal']} (`{res['columna']}`): "
+                f"**{res['unicos']:,} contactos únicos** "
+                f"de {res['filas']:,} filas ({res['duplicados']:,} duplicados, "
+                f"{res['invalidos']:,} inválidos) · {res['filas_por_segundo']:,.0f} filas/s "
+                f"· {res['memoria_mb']:,.1f} MB"
+            )
+
+# ------------------ MATRIZ DE ESCENARIOS ------------------ #
+
+def seccion_matriz_escenarios(
+    config, moneda_trabajo, tipo_cambio, periodo_ppto, tipo_funnel, envios_contacto, base_mix
+):
+    """
+    La campaña del formulario (funnel, periodo, envíos por contacto, tasa de
+    cambio) evaluada en todos los países × segmentos × canales × proveedores
+    en una pasada, ordenada por costo por SQL.
+    """
+    with st.expander("Matriz de escenarios (países × canales × proveedores × segmentos)"):
+        st.caption(
+            "Usa el funnel, el periodo de presupuesto, los envíos por contacto y la tasa de "
+            "cambio del formulario. Las tasas son las por defecto de cada país × segmento × "
+            "canal (histórico o config)."
+        )
+        col1, col2 = st.columns(2)
+        base = col1.number_input(
+            "Base por escenario (contactos)",
+            min_value=1,
+            value=int(base_mix) or 10_000,
+            step=1000,
+            key="matriz_base",
+        )
+        solo_en_cupo = col2.checkbox(
+            "Solo escenarios dentro del cupo", value=False, key="matriz_en_cupo"
+        )
+        colf1, colf2, colf3, colf4 = st.columns(4)
+        paises = colf1.multiselect(
+            "Países", config.paises, default=list(config.paises), key="matriz_paises"
+        )
+        segmentos = colf2.multiselect(
+            "Segmentos", SEGMENTOS, default=["Empresarios", "Aliados"], key="matriz_segmentos"
+        )
+        canales = colf3.multiselect(
+            "Canales", list(config.channels), default=list(config.channels), key="matriz_canales"
+        )
+        proveedores = colf4.multiselect(
+            "Proveedores SMS", PROVEEDORES_SMS, default=PROVEEDORES_SMS, key="matriz_proveedores"
+        )
+        if not (paises and segmentos and canales and proveedores):
+            st.info("Elige al menos un país, un segmento, un canal y un proveedor.")
+            return
+
+        if envios_contacto <= 0:
+            st.warning("La cantidad de envíos por contacto debe ser mayor a 0.")
+            return
+
+        from mdhub import escenarios, historico
+
+        tabla = escenarios.matriz_escenarios(
+            int(base),
+            envios_contacto,
+            tipo_funnel,
+            periodo_ppto,
+            tipo_cambio,
+            paises=paises,
+            segmentos=segmentos,
+            canales=canales,
+            proveedores=proveedores,
+            ventana=historico.VENTANA_DEFAULT,
+            config=config,
+        )
+        if solo_en_cupo:
+            tabla = tabla[~tabla["excede_cupo"]]
+        if tabla.empty:
+            st.info("No hay escenarios con costo configurado para esa selección.")
+            return
+
+        mejor = tabla.iloc[0]
+        if mejor["sql"] > 0:
+            cps_mejor = cambio.desde_cop(mejor["costo_por_sql_cop"], moneda_trabajo, tipo_cambio)
+            proveedor = f" ({mejor['proveedor_sms']})" if mejor["proveedor_sms"] else ""
+            st.write(
+                f"- Mejor escenario: **{mejor['pais']} · {mejor['segmento']} · "
+                f"{mejor['canal']}{proveedor}**, {int(mejor['sql']):,} SQL a "
+                f"**{cambio.formatear(cps_mejor, moneda_trabajo)} {moneda_trabajo}** por SQL."
+            )
+        else:
+            st.info("Con estas tasas ningún escenario da SQL.")
+
+        vista = tabla.copy()
+        for col in ("costo_total_cop", "costo_por_sql_cop"):
+            posicion = vista.columns.get_loc(col)
+            valores = cambio.desde_cop(vista.pop(col).to_numpy(), moneda_trabajo, tipo_cambio)
+            vista.insert(posicion, col.replace("_cop", f" ({moneda_trabajo})"), valores)
+        st.dataframe(vista, use_container_width=True, hide_index=True)
+        st.download_button(
+            "Descargar matriz (CSV)",
+            data=tabla.to_csv(index=False).encode("utf-8"),
+            file_name="matriz_escenarios.csv",
+            mime="text/csv",
+            key="btn_descargar_matriz",
+        )
+
+# ------------------ PLAN MASIVO (CSV / PARQUET) ------------------ #
+
+def seccion_plan_masivo():
+    with st.expander("Importar plan masivo (CSV / Parquet)"):
+        st.caption(
+            "Columnas: pais, canal, proveedor_sms, segmento, periodo, tipo_funnel, base, "
+            "envios_contacto, tasa_mql, tasa_sql, tipo_cambio y fecha (opcional). Solo "
+            "canal y base son obligatorias; las tasas vacías usan los defaults del canal y "
+            "el tipo de cambio vacío, la tasa de la fecha (o la última publicada)."
+        )
+        archivo = st.file_uploader(
+            "Archivo del plan",
+            type=list(importacion.FORMATOS),
+            key="plan_masivo_archivo",
+        )
+        procesar = st.button("Procesar plan", key="btn_plan_masivo", disabled=archivo is None)
+
+        if procesar and archivo is not None:
+            salidas.borrar((st.session_state.pop("plan_briefs", None) or {}).get("zip"))
+            salidas.borrar((st.session_state.get("plan_masivo") or {}).get("archivo"))
+
+            # La sesión guarda solo la clave; el CSV vive en la carpeta de salidas (con TTL)
+            clave_salida, ruta_salida = salidas.nueva("plan_", ".csv")
+            progreso = st.empty()
+            try:
+                acumulador = importacion.procesar_plan(
+                    archivo,
+                    ruta_salida,
+                    al_avanzar=lambda n: progreso.write(f"Filas procesadas: {n:,}"),
+                )
+            except (ValueError, ImportError) as exc:
+                salidas.borrar(clave_salida)
+                st.error(f"No se pudo procesar el plan: {exc}")
+                return
+
+            st.session_state.plan_masivo = {
+                "nombre": archivo.name,
+                "resumen": acumulador.resumen(),
+                "cupos": acumulador.uso_cupos(),
+                "archivo": clave_salida,
+            }
+
+        plan = st.session_state.get("plan_masivo")
+        ruta_plan = salidas.ruta(plan["archivo"]) if plan else None
+        if ruta_plan is None:
+            return
+
+        resumen = plan["resumen"]
+        st.markdown(f"#### Resultado del plan `{plan['nombre']}` ({resumen['filas']:,} filas)")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Base total", f"{resumen['total_base']:,}")
+        col2.metric("Envíos totales", f"{resumen['total_envios']:,.0f}")
+        col3.metric("SQL totales", f"{resumen['total_sql']:,}")
+        cps_fmt = (
+            f"{resumen['costo_por_sql_cop']:,.0f}" if resumen["total_sql"] > 0 else "N/A"
+        )
+        col4.metric("Costo por SQL", f"{cps_fmt} COP")
+        st.write(f"- Costo total estimado: **{resumen['total_costo_cop']:,.0f} COP**")
+
+        if not plan["cupos"].empty:
+            st.markdown("##### Uso de cupos de envíos vs presupuesto")
+            st.dataframe(plan["cupos"], use_container_width=True)
+
+        with open(ruta_plan, "rb") as f:
+            st.download_button(
+                "Descargar resultados por fila (CSV)",
+                data=f,
+                file_name="resultados_plan.csv",
+                mime="text/csv",
+                key="btn_descargar_plan",
+            )
+
+        if st.button("Generar briefs PDF", key="btn_briefs_plan", disabled=archivo is None):
+            from mdhub import briefs
+
+            archivo.seek(0)
+            barra = st.progress(0.0, text="Generando briefs…")
+            with tempfile.TemporaryDirectory(prefix="briefs_") as carpeta:
+                try:
+                    rutas = briefs.generar_briefs(
+                        archivo,
+                        carpeta,
+                        al_avanzar=lambda hechos, total: barra.progress(
+                            hechos / total, text=f"Briefs: {hechos:,} / {total:,}"
+                        ),
+                    )
+                except (ValueError, ImportError) as exc:
+                    st.error(f"No se pudieron generar los briefs: {exc}")
+                    return
+                salidas.borrar((st.session_state.get("plan_briefs") or {}).get("zip"))
+                clave_zip, ruta_zip = salidas.nueva("briefs_", ".zip")
+                with zipfile.ZipFile(ruta_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+                    for ruta in rutas:
+                        zf.write(ruta, os.path.basename(ruta))
+            st.session_state.plan_briefs = {"cantidad": len(rutas), "zip": clave_zip}
+
+        zip_briefs = st.session_state.get("plan_briefs")
+        ruta_zip = salidas.ruta(zip_briefs["zip"]) if zip_briefs else None
+        if ruta_zip is not None:
+            with open(ruta_zip, "rb") as f:
+                st.download_button(
+                    f"Descargar {zip_briefs['cantidad']:,} briefs (ZIP)",
+                    data=f,
+                    file_name="briefs_plan.zip",
+                    mime="application/zip",
+                    key="btn_descargar_briefs",
+                )
@@ -0,0 +1,190 @@
+"""
+Página Calendario: reparto de los envíos de un plan por día u hora bajo
+cupos y límites de los proveedores.
+"""
+
+import datetime as dt
+
+import pandas as pd
+import streamlit as st
+
+from mdhub import calendario, importacion, metricas, precios
+from mdhub.optimizador import PROVEEDORES_SMS
+
+SEGMENTOS = ["Empresarios", "Aliados", "Contadores", "Otro"]
+DIAS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+
+# ------------------ ENTRADAS ------------------ #
+
+def _plan_inicial(config) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "pais": [config.paises[0]] * 2,
+            "segmento": ["Empresarios"] * 2,
+            "canal": ["WhatsApp", "SMS"],
+            "proveedor_sms": [None, "Masive"],
+            "base": [10_000, 10_000],
+            "envios_contacto": [1.0, 1.0],
+        }
+    )
+
+def editor_plan(config) -> pd.DataFrame:
+    """
+    Plan a calendarizar: un archivo con columnas de plan masivo o la tabla editable.
+    """
+    archivo = st.file_uploader(
+        "Plan (opcional, mismas columnas que un plan masivo)",
+        type=list(importacion.FORMATOS),
+        key="cal_archivo",
+    )
+    if archivo is not None:
+        try:
+            plan = pd.concat(list(importacion.leer_en_chunks(archivo)), ignore_index=True)
+        except (ValueError, ImportError) as exc:
+            st.error(f"No se pudo leer el plan: {exc}")
+            return None
+        st.caption(f"{len(plan):,} líneas leídas de {archivo.name}.")
+        return plan
+
+    if "cal_plan" not in st.session_state:
+        st.session_state.cal_plan = _plan_inicial(config)
+    return st.data_editor(
+        st.session_state.cal_plan,
+        key="cal_plan_editor",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "pais": st.column_config.SelectboxColumn("País", options=config.paises, required=True),
+            "segmento": st.column_config.SelectboxColumn("Segmento", options=SEGMENTOS),
+            "canal": st.column_config.SelectboxColumn(
+                "Canal", options=list(config.channels), required=True
+            ),
+            "proveedor_sms": st.column_config.SelectboxColumn(
+                "Proveedor SMS", options=PROVEEDORES_SMS, help="Solo afecta SMS."
+            ),
+            "base": st.column_config.NumberColumn(
+                "Contactos", min_value=0, step=100, format="%d", default=0
+            ),
+            "envios_contacto": st.column_config.NumberColumn(
+                "Envíos por contacto", min_value=0.0, step=0.5, default=1.0
+            ),
+        },
+    )
+
+def editor_limites() -> dict:
+    """
+    Mensajes por segundo por canal / proveedor (vacío = sin límite).
+    """
+    limites = st.data_editor(
+        pd.DataFrame(
+            [
+                {"canal": canal, "proveedor_sms": proveedor, "mps": mps}
+                for (canal, proveedor), mps in calendario.LIMITES_MPS.items()
+            ]
+        ),
+        key="cal_limites",
+        hide_index=True,
+        use_container_width=True,
+        disabled=["canal", "proveedor_sms"],
+        column_config={
+            "mps": st.column_config.NumberColumn(
+                "Mensajes por segundo", min_value=0.0, step=1.0, help="Vacío = sin límite."
+            ),
+        },
+    )
+    return {
+        (fila.canal, fila.proveedor_sms): None if pd.isna(fila.mps) else float(fila.mps)
+        for fila in limites.itertuples(index=False)
+    }
+
+# ------------------ PÁGINA: CALENDARIO ------------------ #
+
+def page_calendario():
+    st.header("Calendario de envíos")
+    st.caption(
+        "Reparte los envíos de un plan por día u hora respetando los cupos mensuales y "
+        "anuales de BUDGET_ENVIOS (menos lo reservado), los mensajes por segundo de cada "
+        "proveedor y un envío por contacto al día. Lo que no entra queda como pendiente."
+    )
+
+    config = precios.actual()
+    col1, col2, col3 = st.columns(3)
+    hoy = dt.date.today()
+    inicio = col1.date_input("Inicio", value=hoy.replace(day=1), key="cal_inicio")
+    horizonte = col2.radio("Horizonte", ["Mes", "Año"], horizontal=True, key="cal_horizonte")
+    granularidad = col3.radio(
+        "Granularidad",
+        list(calendario.GRANULARIDADES),
+        format_func=lambda g: "Día" if g == "dia" else "Hora",
+        horizontal=True,
+        key="cal_granularidad",
+    )
+
+    colh1, colh2, colh3 = st.columns(3)
+    horario = colh1.slider(
+        "Horario de envío", min_value=0, max_value=24, value=calendario.HORARIO_DEFAULT, key="cal_horario"
+    )
+    dias = colh2.multiselect(
+        "Días de envío", DIAS, default=[DIAS[d] for d in calendario.DIAS_HABILES], key="cal_dias"
+    )
+    descontar = colh3.checkbox("Descontar reservas de cupos", value=True, key="cal_reservas")
+
+    plan = editor_plan(config)
+    with st.expander("Límites de los proveedores"):
+        limites = editor_limites()
+
+    if plan is not None and st.button("Calendarizar", key="btn_calendario"):
+        st.session_state.cal_resultado = None
+        try:
+            with metricas.medir("calendario.calculo", granularidad=granularidad):
+                st.session_state.cal_resultado = calendario.calendario_envios(
+                    plan,
+                    inicio,
+                    meses=12 if horizonte == "Año" else 1,
+                    granularidad=granularidad,
+                    horario=horario,
+                    dias_semana=[DIAS.index(d) for d in dias],
+                    limites_mps=limites,
+                    descontar_reservas=descontar,
+                    config=config,
+                )
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+
+    # El último calendario queda en la sesión (sobrevive a la descarga y a otros reruns)
+    resultado = st.session_state.get("cal_resultado")
+    if resultado is None:
+        return
+    mostrar_calendario(*resultado)
+
+def mostrar_calendario(cal, lineas):
+    descartadas = lineas.attrs.get("descartadas", 0)
+    if descartadas:
+        st.caption(f"Se ignoraron {descartadas:,} líneas sin país, canal o base.")
+
+    colr1, colr2, colr3 = st.columns(3)
+    colr1.metric("Envíos pedidos", f"{lineas['envios'].sum():,}")
+    colr2.metric("Programados", f"{lineas['programados'].sum():,}")
+    colr3.metric("Pendientes", f"{lineas['pendientes'].sum():,}")
+    if lineas["pendientes"].sum() > 0:
+        st.warning(
+            "Hay envíos que no entran en el horizonte; `limitado_por` indica qué "
+            "restricción los recortó."
+        )
+
+    st.markdown("#### Líneas")
+    st.dataframe(lineas, use_container_width=True)
+
+    st.markdown("#### Envíos por día y canal")
+    por_dia = cal.T.groupby(lineas["canal"].to_numpy()).sum().T
+    st.bar_chart(por_dia.groupby(por_dia.index.normalize()).sum())
+
+    st.download_button(
+        "Descargar calendario (CSV)",
+        calendario.calendario_largo(cal, lineas).to_csv(index=False).encode("utf-8"),
+        file_name="calendario_envios.csv",
+        mime="text/csv",
+        key="btn_descargar_calendario",
+    )
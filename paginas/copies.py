@@ -0,0 +1,193 @@
+"""
+Página Copies: repositorio de copies con filtros, búsqueda y edición.
+"""
+
+import math
+
+import streamlit as st
+
+from mdhub import copies, historico, importacion, metricas, precios
+
+from .rendimiento import etiquetas_sesion
+
+# ------------------ PÁGINA: COPIES ------------------ #
+
+def _guardar_edicion_copies(key_editor: str):
+    """
+    Callback del editor: aplica el delta editado a la base y reinicia el
+    editor para que muestre la página recién guardada.
+    """
+    # Corre antes del script: se etiqueta aquí con la sesión
+    with metricas.contexto(**etiquetas_sesion(), pagina="Copies"), metricas.medir("copies.guardar"):
+        copies.aplicar_ediciones(
+            st.session_state.copies_ids_pagina,
+            st.session_state[key_editor],
+        )
+    st.session_state.copies_version = st.session_state.get("copies_version", 0) + 1
+
+def page_copies():
+    st.header("Vista de copies")
+    st.info(
+        "Aquí puedes registrar copies y sus resultados de campañas anteriores. "
+        "Los cambios se guardan en la base local del hub."
+    )
+
+    # Filtros (se resuelven en SQL sobre columnas indexadas)
+    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    filtros = {}
+    for col_ui, columna, etiqueta in (
+        (col_f1, "canal", "Canal"),
+        (col_f2, "pais", "País"),
+        (col_f3, "segmento", "Segmento"),
+    ):
+        opciones = ["Todos"] + copies.valores_distintos(columna)
+        valor = col_ui.selectbox(etiqueta, opciones, key=f"copies_filtro_{columna}")
+        filtros[columna] = None if valor == "Todos" else valor
+    filtros["solo_ganadores"] = col_f4.checkbox("Mostrar solo ganadores", value=False)
+
+    consulta = st.text_input(
+        "Buscar en los copies",
+        placeholder='Ej: POS, $850, facturación electrónica, {{hubspot_firstname}}',
+        key="copies_busqueda",
+    )
+    if consulta.strip():
+        with metricas.medir("copies.busqueda"):
+            resultados = copies.buscar(consulta, filtros)
+        st.markdown(f"#### Resultados de búsqueda ({len(resultados)})")
+        if resultados.empty:
+            st.info("Ningún copy coincide con la búsqueda.")
+        else:
+            st.caption("Ordenados por relevancia, tasa de respuesta y SQL generados.")
+            st.dataframe(resultados, use_container_width=True)
+
+    with metricas.medir("copies.conteo"):
+        total = copies.contar(filtros)
+    col_p1, col_p2 = st.columns(2)
+    tamano = col_p1.selectbox("Copies por página", [25, 50, 100, 250], index=1, key="copies_tamano")
+    paginas = max(math.ceil(total / tamano), 1)
+    pagina = col_p2.number_input(
+        f"Página (de {paginas})",
+        min_value=1,
+        max_value=paginas,
+        value=1,
+        step=1,
+        key="copies_pagina",
+    )
+
+    with metricas.medir("copies.pagina"):
+        copies_df = copies.cargar_pagina(filtros, pagina=pagina - 1, tamano=tamano)
+    st.session_state.copies_ids_pagina = list(copies_df.index)
+    copies_df = copies_df.reset_index(drop=True)
+    st.caption(f"{total:,} copies con estos filtros.")
+
+    # Editor interactivo (solo la página visible)
+    key_editor = f"copies_editor_{st.session_state.get('copies_version', 0)}"
+    with metricas.medir("copies.editor"):
+        st.data_editor(
+            copies_df,
+            use_container_width=True,
+            num_rows="dynamic",
+            hide_index=True,
+            key=key_editor,
+            on_change=_guardar_edicion_copies,
+            args=(key_editor,),
+            column_config={
+                "es_ganador": st.column_config.CheckboxColumn("Es ganador"),
+                "tasa_respuesta": st.column_config.NumberColumn(
+                    "Tasa respuesta (0-1)",
+                    min_value=0.0,
+                    max_value=1.0,
+                    step=0.001,
+                ),
+                "sql_generados": st.column_config.NumberColumn(
+                    "SQL generados", min_value=0, step=1
+                ),
+            },
+        )
+
+    seccion_resultados_historicos()
+
+# ------------------ RESULTADOS HISTÓRICOS ------------------ #
+
+def seccion_resultados_historicos():
+    """
+    Importa exports de resultados al histórico (SQLite) y muestra las tasas
+    calibradas que usan por defecto la Calculadora y Simulaciones.
+    """
+    with st.expander("Resultados históricos (calibración de tasas)"):
+        st.caption(
+            "Columnas: fecha, canal, pais, segmento, contactos, entregados, respuestas, mql, sql. "
+            "Solo fecha y canal son obligatorias; sin contactos, cada fila es un contacto "
+            "(mql / sql pueden venir como 0-1 o True / False). Un archivo ya importado no se "
+            "vuelve a sumar."
+        )
+        archivo = st.file_uploader(
+            "Export de resultados",
+            type=list(importacion.FORMATOS),
+            key="resultados_archivo",
+        )
+        if st.button("Importar resultados", key="btn_resultados", disabled=archivo is None):
+            progreso = st.empty()
+            try:
+                with metricas.medir("copies.importar_resultados"):
+                    res = historico.importar_resultados(
+                        archivo,
+                        nombre=archivo.name,
+                        al_avanzar=lambda n: progreso.write(f"Filas leídas: {n:,}"),
+                    )
+            except (ValueError, ImportError) as exc:
+                st.error(f"No se pudieron importar los resultados: {exc}")
+                return
+            if res["importado"]:
+                st.success(
+                    f"Importación #{res['importacion_id']}: {res['filas']:,} filas "
+                    f"({res['invalidas']:,} sin fecha o canal válidos)."
+                )
+            else:
+                st.info(f"Este archivo ya estaba importado (importación #{res['importacion_id']}).")
+
+        with st.form("form_resultado_campania", clear_on_submit=True):
+            st.markdown("**Registrar el resultado de una campaña**")
+            config = precios.actual()
+            c1, c2, c3, c4 = st.columns(4)
+            pais = c1.selectbox("País", config.paises)
+            segmento = c2.text_input("Segmento", "Empresarios")
+            canal = c3.selectbox("Canal", list(config.channels))
+            fecha = c4.date_input("Fecha de envío")
+            c5, c6, c7, c8 = st.columns(4)
+            contactos = c5.number_input("Contactos", min_value=1, value=1000, step=100)
+            entregados = c6.number_input("Entregados", min_value=0, value=0, step=100)
+            mql = c7.number_input("MQL", min_value=0, value=0, step=1)
+            sql = c8.number_input("SQL", min_value=0, value=0, step=1)
+            c9, c10 = st.columns(2)
+            costo = c9.number_input("Costo de la campaña", min_value=0.0, value=0.0, step=1000.0)
+            moneda = c10.selectbox(
+                "Moneda del costo", ["COP", "USD"],
+                help="USD se pasa a COP con la tasa de la fecha de envío.",
+            )
+            if st.form_submit_button("Registrar resultado"):
+                with metricas.medir("copies.registrar_resultado"):
+                    historico.registrar_resultado(
+                        pais, segmento.strip() or "Otro", canal, fecha,
+                        contactos, entregados=entregados, mql=mql, sql=sql,
+                        costo=costo, moneda=moneda,
+                    )
+                st.success("Resultado registrado: las tasas por defecto ya lo incluyen.")
+
+        ventana = st.selectbox(
+            "Ventana",
+            historico.VENTANAS,
+            index=historico.VENTANAS.index(historico.VENTANA_DEFAULT),
+            format_func=lambda v: f"Últimos {v} meses" if v else "Todo el historial",
+            key="resultados_ventana",
+        )
+        tabla = historico.tabla_indice(ventana)
+        if tabla.empty:
+            st.caption("Aún no hay resultados importados.")
+            return
+        st.dataframe(tabla, use_container_width=True, hide_index=True)
+        st.caption(
+            f"Las tasas por defecto usan la ventana de {historico.VENTANA_DEFAULT} meses: media "
+            "posterior Beta del nivel más específico con datos (país × segmento × canal → "
+            "país × canal → canal), con los defaults del canal como prior."
+        )
@@ -0,0 +1,122 @@
+"""
+Controles y resultados de Monte Carlo, compartidos por la Calculadora y
+Simulaciones.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from mdhub import cambio, montecarlo
+from mdhub.cache import CACHE_CALCULOS, clave_canonica
+
+# ------------------ MONTE CARLO ------------------ #
+
+MAX_SIMULACIONES_MC = 5_000_000
+
+def opciones_montecarlo(prefijo: str, siempre_activo: bool = False) -> dict:
+    activo = siempre_activo or st.checkbox(
+        "Incluir simulación Monte Carlo (P10 / P50 / P90)", value=False, key=f"{prefijo}_mc_activo"
+    )
+    col1, col2, col3 = st.columns(3)
+    n_sim = col1.number_input(
+        "Simulaciones",
+        min_value=1_000,
+        max_value=MAX_SIMULACIONES_MC,
+        value=20_000,
+        step=10_000,
+        key=f"{prefijo}_mc_n",
+    )
+    semilla = col2.number_input(
+        "Semilla", min_value=0, value=montecarlo.SEMILLA, step=1, key=f"{prefijo}_mc_semilla"
+    )
+    tasa_entrega = col3.number_input(
+        "Tasa de entrega (0-1)",
+        min_value=0.0,
+        max_value=1.0,
+        value=1.0,
+        step=0.01,
+        key=f"{prefijo}_mc_entrega",
+        help="Ej: 3.996 entregados de 4.933 usuarios ≈ 0.81.",
+    )
+    col4, col5 = st.columns(2)
+    incierto = col4.checkbox(
+        "Tasas inciertas (Beta)", value=True, key=f"{prefijo}_mc_beta",
+        help="Cada simulación sortea las tasas MQL / SQL de una Beta centrada en la tasa ingresada.",
+    )
+    concentracion = col5.number_input(
+        "Concentración κ de la Beta",
+        min_value=1.0,
+        value=200.0,
+        step=50.0,
+        key=f"{prefijo}_mc_kappa",
+        help="Equivale a cuántos contactos 'respaldan' la tasa: mayor κ = menos incertidumbre.",
+    )
+    cobro_entrega = st.checkbox(
+        "Cobrar solo envíos entregados", value=False, key=f"{prefijo}_mc_cobro"
+    )
+    return {
+        "activo": activo,
+        "n_sim": int(n_sim),
+        "semilla": int(semilla),
+        "tasa_entrega": float(tasa_entrega),
+        "concentracion": float(concentracion) if incierto else None,
+        "cobro_por_entrega": cobro_entrega,
+    }
+
+def mostrar_montecarlo(resultado, mc_config: dict, moneda_trabajo: str, tipo_cambio: float):
+    columnas = ["base", "envios", "costo_unit_cop", "tasa_mql", "tasa_sql", "tipo_funnel"]
+    clave = clave_canonica(
+        "montecarlo",
+        {"canales": {c: resultado[c].tolist() for c in columnas}, "config": mc_config},
+    )
+    res = CACHE_CALCULOS.obtener_o_calcular(
+        clave,
+        lambda: montecarlo.simular(
+            resultado,
+            n_sim=mc_config["n_sim"],
+            semilla=mc_config["semilla"],
+            tasa_entrega=mc_config["tasa_entrega"],
+            concentracion=mc_config["concentracion"],
+            cobro_por_entrega=mc_config["cobro_por_entrega"],
+        ),
+    )
+
+    costo = cambio.desde_cop(res["costo_cop"], moneda_trabajo, tipo_cambio)
+    costo_por_sql = cambio.desde_cop(res["costo_por_sql_cop"], moneda_trabajo, tipo_cambio)
+    etiquetas = [f"P{p}" for p in montecarlo.PERCENTILES]
+
+    tabla = pd.DataFrame(
+        {
+            "SQL": [f"{v:,.0f}" for v in res["sql"]],
+            "MQL": [f"{v:,.0f}" for v in res["mql"]],
+            f"Costo ({moneda_trabajo})": [cambio.formatear(v, moneda_trabajo) for v in costo],
+            f"Costo por SQL ({moneda_trabajo})": [
+                "N/A" if np.isnan(v) else cambio.formatear(v, moneda_trabajo)
+                for v in costo_por_sql
+            ],
+        },
+        index=etiquetas,
+    )
+    st.dataframe(tabla, use_container_width=True)
+
+    por_canal = pd.DataFrame(
+        res["sql_por_canal"], columns=[f"SQL {e}" for e in etiquetas]
+    )
+    # Una fila por línea del mix (un canal puede repetirse con otro segmento / proveedor)
+    por_canal.insert(0, "canal", resultado["canal"].to_numpy())
+    if resultado["segmento"].nunique() > 1:
+        por_canal.insert(0, "segmento", resultado["segmento"].to_numpy())
+    if resultado["proveedor_sms"].nunique() > 1:
+        por_canal.insert(
+            por_canal.columns.get_loc("canal") + 1,
+            "proveedor_sms",
+            resultado["proveedor_sms"].to_numpy(),
+        )
+    st.dataframe(por_canal, use_container_width=True)
+
+    st.caption(
+        f"{res['simulaciones']:,} simulaciones (semilla {mc_config['semilla']}"
+        f"{', pool de procesos' if res['procesos'] else ''}). "
+        f"Probabilidad de 0 SQL: {res['prob_sin_sql']:.1%}."
+    )
@@ -0,0 +1,143 @@
+"""
+Página Optimizador: asignación de envíos por presupuesto o SQL objetivo.
+"""
+
+import streamlit as st
+
+from mdhub import cambio, metricas, motor, optimizador, precios
+
+# ------------------ PÁGINA: OPTIMIZADOR ------------------ #
+
+def page_optimizador():
+    st.header("Optimizador de envíos por presupuesto y cupos")
+    st.caption(
+        "Reparte envíos entre países, segmentos, canales y meses respetando los cupos "
+        "mensuales de BUDGET_ENVIOS, priorizando el menor costo por SQL."
+    )
+
+    config = precios.actual()
+    col1, col2, col3 = st.columns(3)
+    moneda_trabajo = col1.selectbox("Moneda de trabajo", ["COP", "USD"], key="opt_moneda")
+    fecha_fx, tasa_fx = cambio.tasa_vigente()
+    tipo_cambio = col2.number_input(
+        "Tasa de cambio USD → COP",
+        min_value=1.0,
+        value=tasa_fx,
+        step=50.0,
+        key="opt_fx",
+        help=f"Última tasa publicada ({fecha_fx})." if fecha_fx else None,
+    )
+    modo = col3.radio(
+        "Objetivo",
+        ["Maximizar SQL con un presupuesto", "Minimizar costo para un SQL objetivo"],
+        key="opt_modo",
+    )
+
+    colf1, colf2, colf3 = st.columns(3)
+    paises = colf1.multiselect("Países", config.paises, default=list(config.paises), key="opt_paises")
+    canales = colf2.multiselect(
+        "Canales", list(config.channels), default=list(config.channels), key="opt_canales"
+    )
+    segmentos = colf3.multiselect(
+        "Segmentos (cupo)",
+        optimizador.SEGMENTOS_CUPO,
+        default=optimizador.SEGMENTOS_CUPO,
+        key="opt_segmentos",
+    )
+
+    colp1, colp2, colp3 = st.columns(3)
+    meses = colp1.slider("Meses a planear", min_value=1, max_value=12, value=12, key="opt_meses")
+    tipo_funnel = colp2.radio(
+        "Tipo de funnel",
+        [motor.FUNNEL_DIRECTO, motor.FUNNEL_MQL_SQL],
+        horizontal=True,
+        key="opt_funnel",
+    )
+    envios_contacto = colp3.number_input(
+        "Envíos por contacto",
+        min_value=0.5,
+        value=1.0,
+        step=0.5,
+        key="opt_envios_contacto",
+    )
+
+    if modo.startswith("Maximizar"):
+        presupuesto = st.number_input(
+            f"Presupuesto total ({moneda_trabajo})",
+            min_value=0.0,
+            value=0.0,
+            step=100.0,
+            key="opt_presupuesto",
+        )
+        objetivo_sql = 0
+    else:
+        objetivo_sql = st.number_input(
+            "SQL objetivo", min_value=0, value=0, step=10, key="opt_sql_obj"
+        )
+        presupuesto = 0.0
+
+    if not st.button("Optimizar", key="btn_optimizar"):
+        return
+
+    with metricas.medir("optimizador.items"):
+        items = optimizador.construir_items(
+            paises=paises,
+            canales=canales,
+            segmentos=segmentos,
+            meses=meses,
+            tipo_funnel=tipo_funnel,
+            envios_contacto=envios_contacto,
+            fx=tipo_cambio,
+            config=config,
+        )
+    if items.empty:
+        st.warning("No hay combinaciones con cupo, costo y tasa SQL > 0 para optimizar.")
+        return
+
+    if modo.startswith("Maximizar"):
+        if presupuesto <= 0:
+            st.warning("Ingresa un presupuesto mayor a 0.")
+            return
+        presupuesto_cop = cambio.a_cop(presupuesto, moneda_trabajo, tipo_cambio)
+        with metricas.medir("optimizador.calculo", modo="maximizar_sql"):
+            asignacion, resumen = optimizador.maximizar_sql(items, presupuesto_cop)
+    else:
+        if objetivo_sql <= 0:
+            st.warning("Ingresa un SQL objetivo mayor a 0.")
+            return
+        with metricas.medir("optimizador.calculo", modo="minimizar_costo"):
+            asignacion, resumen = optimizador.minimizar_costo(items, objetivo_sql)
+        if not resumen["alcanzado"]:
+            st.error(
+                f"Los cupos disponibles solo alcanzan ~{resumen['sql_esperados']:,.0f} SQL "
+                f"(objetivo: {objetivo_sql:,})."
+            )
+
+    costo, cps = cambio.desde_cop(
+        [resumen["costo_total_cop"], resumen["costo_por_sql_cop"]], moneda_trabajo, tipo_cambio
+    )
+    costo_fmt = cambio.formatear(costo, moneda_trabajo)
+    cps_fmt = cambio.formatear(cps, moneda_trabajo)
+
+    colr1, colr2, colr3, colr4 = st.columns(4)
+    colr1.metric("Envíos asignados", f"{resumen['envios']:,}")
+    colr2.metric("SQL esperados", f"{resumen['sql_esperados']:,.1f}")
+    colr3.metric("Costo total", f"{costo_fmt} {moneda_trabajo}")
+    colr4.metric("Costo por SQL", f"{cps_fmt} {moneda_trabajo}")
+
+    st.markdown("#### Asignación por país / segmento / canal")
+    resumen_canal = (
+        asignacion.groupby(["pais", "segmento", "canal", "proveedor_sms"], as_index=False)
+        .agg(
+            envios=("envios", "sum"),
+            meses=("mes", "nunique"),
+            costo_total_cop=("costo_total_cop", "sum"),
+            sql_esperados=("sql_esperados", "sum"),
+            costo_por_sql_cop=("costo_por_sql_cop", "first"),
+        )
+        .sort_values("costo_por_sql_cop")
+    )
+    st.dataframe(resumen_canal, use_container_width=True)
+
+    with st.expander("Detalle por mes"):
+        st.dataframe(asignacion, use_container_width=True)
@@ -0,0 +1,81 @@
+"""
+Panel de rendimiento (sidebar): reruns de la sesión, tamaño del
+session_state y tiempos por fase medidos con mdhub.metricas.
+"""
+
+import uuid
+
+import streamlit as st
+
+from mdhub import metricas
+
+# ------------------ ETIQUETAS DE SESIÓN ------------------ #
+
+def contar_rerun() -> int:
+    """
+    Suma un rerun a la sesión (y le asigna un id corto la primera vez).
+    """
+    if "_sesion_id" not in st.session_state:
+        st.session_state["_sesion_id"] = uuid.uuid4().hex[:8]
+    st.session_state["_reruns"] = st.session_state.get("_reruns", 0) + 1
+    return st.session_state["_reruns"]
+
+def etiquetas_sesion() -> dict:
+    """
+    Etiquetas para metricas.contexto; los callbacks de widgets corren antes
+    del script y las usan para que sus mediciones también queden atribuidas.
+    """
+    return {
+        "sesion": st.session_state.get("_sesion_id"),
+        "rerun": st.session_state.get("_reruns", 0),
+    }
+
+# ------------------ PANEL ------------------ #
+
+def _kb(n_bytes: int) -> str:
+    return f"{n_bytes / 1024:,.1f} KB"
+
+def panel():
+    """
+    Muestra los tiempos del último rerun completo (el actual aún corre) y el
+    agregado del proceso. Apagado por defecto: solo se calcula al activarlo.
+    """
+    if not st.sidebar.toggle("Panel de rendimiento", value=False, key="debug_rendimiento"):
+        return
+
+    with st.sidebar.expander("Rendimiento", expanded=True):
+        tamanos = {
+            clave: metricas.tamano_profundo(valor)
+            for clave, valor in st.session_state.to_dict().items()
+        }
+        st.write(
+            f"- Sesión `{st.session_state.get('_sesion_id')}` · "
+            f"reruns: **{st.session_state.get('_reruns', 0):,}**\n"
+            f"- session_state: **{_kb(sum(tamanos.values()))}** en {len(tamanos)} claves"
+        )
+        mayores = sorted(tamanos.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        if mayores:
+            st.caption("Claves más pesadas: " + " · ".join(f"{k} ({_kb(v)})" for k, v in mayores))
+
+        traza = st.session_state.get("_ultima_traza") or []
+        if traza:
+            st.markdown("**Último rerun completo**")
+            st.table([{"fase": m["fase"], "ms": f"{m['ms']:,.1f}"} for m in traza])
+
+        resumen = metricas.estadisticas()
+        if resumen:
+            st.markdown("**Proceso (todas las sesiones)**")
+            st.table(
+                [
+                    {
+                        "fase": fila["fase"],
+                        "n": f"{fila['conteo']:,}",
+                        "p50 ms": f"{fila['p50_ms']:,.1f}",
+                        "p95 ms": f"{fila['p95_ms']:,.1f}",
+                        "máx ms": f"{fila['max_ms']:,.1f}",
+                    }
+                    for fila in resumen
+                ]
+            )
+        ruta = metricas.ruta_log()
+        st.caption(f"Log JSON: {ruta}" if ruta else "Log JSON apagado (define MDHUB_METRICAS_LOG).")
@@ -0,0 +1,576 @@
+"""
+Página Simulaciones: simulaciones 1 y 2, Monte Carlo y barrido de
+sensibilidad.
+"""
+
+import math
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from mdhub import (
+    cambio, historico, metricas, motor, planificador, posteriores, precios, simulaciones,
+)
+from mdhub.cache import CACHE_CALCULOS, clave_canonica
+from mdhub.costos import get_cost_cop, get_cost_display
+
+from .montecarlo import mostrar_montecarlo, opciones_montecarlo
+
+# ------------------ PÁGINA: SIMULACIONES ------------------ #
+
+MAX_CELDAS_BARRIDO = 4_000_000
+MAX_EJE_HEATMAP = 60
+MAX_EJE_TABLA = 200
+
+def page_simulaciones():
+    st.header("Simulaciones de budget y objetivos")
+    config = precios.actual()
+
+    st.markdown("### Configuración del canal para las simulaciones")
+
+    col_cfg1, col_cfg2, col_cfg3, col_cfg4 = st.columns(4)
+    moneda_trabajo = col_cfg1.selectbox(
+        "Moneda de trabajo",
+        ["COP", "USD"],
+        key="sim_moneda",
+    )
+    fecha_fx, tasa_fx = cambio.tasa_vigente()
+    tipo_cambio = col_cfg2.number_input(
+        "Tasa de cambio USD → COP",
+        min_value=1.0,
+        value=tasa_fx,
+        step=50.0,
+        key="sim_fx",
+        help=f"Última tasa publicada ({fecha_fx})." if fecha_fx else None,
+    )
+    pais = col_cfg3.selectbox(
+        "País",
+        config.paises,
+        key="sim_pais",
+    )
+    canal = col_cfg4.selectbox(
+        "Canal",
+        list(config.channels.keys()),
+        key="sim_canal",
+    )
+
+    col_sms1, col_sms2 = st.columns(2)
+    proveedor_sms = col_sms1.selectbox(
+        "Proveedor SMS",
+        ["Masive", "Nua"],
+        index=0,
+        key="sim_proveedor_sms",
+    )
+
+    tipo_funnel = st.radio(
+        "Tipo de funnel",
+        ["Directo a SQL", "MQL → SQL"],
+        index=0,
+        horizontal=True,
+        key="sim_funnel",
+    )
+
+    # Tasas por defecto: media posterior del histórico del canal y país (todos
+    # los segmentos) o, sin resultados, las de la config
+    info_default = historico.tasas_default(canal, pais, tipo_funnel=tipo_funnel, config=config)
+    col_r1, col_r2 = st.columns(2)
+    tasa_mql = col_r1.number_input(
+        "Tasa MQL (0-1, editable)",
+        min_value=0.0,
+        max_value=1.0,
+        step=0.0001,
+        value=float(info_default["tasa_mql"]),
+        format="%.4f",
+        key="sim_tasa_mql",
+        help="Solo aplica en funnel MQL → SQL.",
+    )
+    tasa_sql = col_r2.number_input(
+        "Tasa SQL (0-1, editable)",
+        min_value=0.0,
+        max_value=1.0,
+        step=0.0001,
+        value=float(info_default["tasa_sql"]),
+        format="%.4f",
+        key="sim_tasa_sql",
+        help="En Directo: base→SQL. En MQL→SQL: MQL→SQL.",
+    )
+    fuera = []
+    for etiqueta, valor, intervalo in (
+        ("MQL", tasa_mql, info_default["intervalo_mql"]),
+        ("SQL", tasa_sql, info_default["intervalo_sql"]),
+    ):
+        if not posteriores.dentro_intervalo(valor, intervalo):
+            fuera.append(f"{etiqueta} ({valor:.2%})")
+    fuente = (
+        f"histórico {info_default['desde']} a {info_default['hasta']}, "
+        f"{info_default['contactos']:,} contactos"
+        if info_default["fuente"] == "historico"
+        else "default del canal"
+    )
+    st.caption(
+        f"Tasas esperadas ({fuente}), intervalo creíble {info_default['credibilidad']:.0%}: "
+        f"MQL {info_default['tasa_mql']:.2%} [{info_default['intervalo_mql'][0]:.2%} – "
+        f"{info_default['intervalo_mql'][1]:.2%}] · SQL {info_default['tasa_sql']:.2%} "
+        f"[{info_default['intervalo_sql'][0]:.2%} – {info_default['intervalo_sql'][1]:.2%}]."
+    )
+    if fuera:
+        st.warning(
+            f"Tasa {' y '.join(fuera)} fuera del intervalo creíble: revisa si la muestra "
+            "que la respalda es suficiente."
+        )
+
+    costo_unit_cop = get_cost_cop(canal, tipo_cambio, pais, proveedor_sms, config)
+    costo_unit_display = get_cost_display(
+        canal, moneda_trabajo, tipo_cambio, pais, proveedor_sms, config
+    )
+    costo_fmt = cambio.formatear(costo_unit_display, moneda_trabajo, 4)
+    st.info(
+        f"Costo unitario estimado para {canal}: **{costo_fmt} {moneda_trabajo}** "
+        f"(~{costo_unit_cop:,.0f} COP)"
+    )
+
+    st.markdown("---")
+
+    # --------- SIMULACIÓN 1: con este budget, ¿cuántos MQL / SQL? --------- #
+    st.markdown("### 1. Con este presupuesto, ¿cuántos MQL / SQL podemos alcanzar?")
+
+    col_b1, col_b2 = st.columns(2)
+    budget_sim = col_b1.number_input(
+        f"Budget disponible ({moneda_trabajo})",
+        min_value=0.0,
+        value=0.0,
+        step=10.0,
+        key="sim_budget",
+    )
+    calc_sim1 = col_b2.button("Calcular simulación 1", key="btn_sim1")
+
+    if calc_sim1:
+        try:
+            with metricas.medir("simulaciones.sim1"):
+                sim1 = simulaciones.simulacion_presupuesto(
+                    budget_sim, canal, pais, proveedor_sms, tipo_funnel,
+                    tasa_mql, tasa_sql, moneda_trabajo, tipo_cambio, config,
+                )
+        except ValueError as exc:
+            st.warning(str(exc))
+        else:
+            budget_fmt = cambio.formatear(budget_sim, moneda_trabajo)
+            cps_fmt = (
+                cambio.formatear(sim1["costo_por_sql"], moneda_trabajo) if sim1["sql"] > 0
+                else "N/A"
+            )
+
+            st.write(
+                f"- Envíos posibles: **{sim1['envios']:,}**\n"
+                f"- Base aproximada: **{sim1['base']:,} contactos**"
+            )
+            st.write(
+                f"- MQL esperados: **{sim1['mql']:,}**\n"
+                f"- SQL esperados: **{sim1['sql']:,}**"
+            )
+            st.write(
+                f"- Budget usado: **{budget_fmt} {moneda_trabajo}** "
+                f"(~{sim1['budget_cop']:,.0f} COP)"
+            )
+            st.write(
+                f"- Costo por SQL aproximado: **{cps_fmt} {moneda_trabajo}**"
+            )
+
+    st.markdown("---")
+
+    with st.expander("Monte Carlo de la simulación 1"):
+        mc_config = opciones_montecarlo("sim", siempre_activo=True)
+        if st.button("Simular incertidumbre", key="btn_sim_mc"):
+            budget_cop = cambio.a_cop(budget_sim, moneda_trabajo, tipo_cambio)
+            envios_mc = math.floor(budget_cop / costo_unit_cop) if costo_unit_cop > 0 else 0
+            if envios_mc <= 0:
+                st.warning("Con ese budget no alcanzas ni un envío.")
+            else:
+                resultado_mc = motor.calcular_canales(
+                    pd.DataFrame(
+                        [
+                            {
+                                "pais": pais,
+                                "canal": canal,
+                                "proveedor_sms": proveedor_sms,
+                                "tipo_funnel": tipo_funnel,
+                                "base": envios_mc,
+                                "tasa_mql": tasa_mql,
+                                "tasa_sql": tasa_sql,
+                                "tipo_cambio": tipo_cambio,
+                            }
+                        ]
+                    ),
+                    config,
+                )
+                with metricas.medir("simulaciones.montecarlo"):
+                    mostrar_montecarlo(resultado_mc, mc_config, moneda_trabajo, tipo_cambio)
+
+    st.markdown("---")
+
+    # --------- SIMULACIÓN 2: objetivo MQL / SQL → budget necesario --------- #
+    st.markdown("### 2. Tenemos que alcanzar X MQL / SQL, ¿cuánto necesitamos?")
+
+    col_o1, col_o2, col_o3 = st.columns(3)
+    mql_obj = col_o1.number_input(
+        "MQL objetivo",
+        min_value=0,
+        value=0,
+        step=10,
+        key="sim_mql_obj",
+    )
+    sql_obj = col_o2.number_input(
+        "SQL objetivo",
+        min_value=0,
+        value=0,
+        step=10,
+        key="sim_sql_obj",
+    )
+    calc_sim2 = col_o3.button("Calcular simulación 2", key="btn_sim2")
+
+    if calc_sim2:
+        if costo_unit_cop <= 0:
+            st.warning("El costo unitario del canal es 0; no se puede simular.")
+        else:
+            directo = tipo_funnel == "Directo a SQL"
+            for objetivo, cantidad in (("sql", sql_obj), ("mql", mql_obj)):
+                if cantidad <= 0:
+                    continue
+                try:
+                    with metricas.medir("simulaciones.sim2", objetivo=objetivo):
+                        sim2 = simulaciones.simulacion_objetivo(
+                            objetivo, cantidad, canal, pais, proveedor_sms, tipo_funnel,
+                            tasa_mql, tasa_sql, moneda_trabajo, tipo_cambio, config,
+                        )
+                except ValueError as exc:
+                    st.warning(str(exc))
+                    continue
+
+                budget_fmt = cambio.formatear(sim2["budget"], moneda_trabajo)
+
+                if objetivo == "sql":
+                    titulo = f"**Para {cantidad:,} SQL (SQL objetivo):**"
+                    etiqueta = "MQL esperados (≈SQL)" if directo else "MQL esperados"
+                    esperado = sim2["mql"]
+                else:
+                    funnel = "en funnel directo" if directo else "en funnel MQL → SQL"
+                    titulo = f"**Para {cantidad:,} MQL ({funnel}):**"
+                    etiqueta = "SQL esperados (≈MQL)" if directo else "SQL esperados"
+                    esperado = sim2["sql"]
+
+                st.write(
+                    f"{titulo}\n"
+                    f"- Base necesaria: **{sim2['base']:,} contactos**\n"
+                    f"- Envíos estimados: **{sim2['envios']:,}**\n"
+                    f"- {etiqueta}: **{esperado:,}**\n"
+                    f"- Budget requerido: **{budget_fmt} {moneda_trabajo}** "
+                    f"(~{sim2['budget_cop']:,.0f} COP)"
+                )
+
+            if mql_obj == 0 and sql_obj == 0:
+                st.info("Ingresa al menos un objetivo (MQL o SQL) para esta simulación.")
+
+    st.markdown("---")
+
+    seccion_plan_multicanal(config, pais, tipo_funnel, moneda_trabajo, tipo_cambio)
+
+    st.markdown("---")
+
+    seccion_barrido(
+        canal, pais, proveedor_sms, tipo_funnel, moneda_trabajo, tipo_cambio, tasa_sql, tasa_mql
+    )
+
+# ------------------ PLAN MULTICANAL ------------------ #
+
+MAX_SLIDER_PLAN = 100_000
+
+def seccion_plan_multicanal(config, pais, tipo_funnel, moneda_trabajo, tipo_cambio):
+    """
+    Simulación 2 sobre todos los canales: el mix de menor costo para un
+    objetivo, con cupos de BUDGET_ENVIOS y bases disponibles. Se recalcula
+    en cada movimiento del slider (planificador.planificar tarda ms).
+    """
+    st.markdown("### 3. Plan multicanal de menor costo para un objetivo")
+    st.caption(
+        "Reparte contactos entre canales y proveedores SMS por costo por SQL / MQL, "
+        "respetando el cupo de envíos del segmento y la base disponible de cada canal."
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    objetivo = col1.radio(
+        "Objetivo", simulaciones.OBJETIVOS, format_func=str.upper, horizontal=True, key="plan_objetivo"
+    )
+    periodo = col2.selectbox("Período del cupo", ["Mensual", "Anual"], key="plan_periodo")
+    segmento = col3.selectbox(
+        "Segmento", ["Empresarios", "Aliados", "Contadores", "Otro"], key="plan_segmento"
+    )
+    envios_contacto = col4.number_input(
+        "Envíos por contacto", min_value=0.5, value=1.0, step=0.5, key="plan_envios_contacto"
+    )
+
+    canales = list(config.channels)
+    defaults = [
+        historico.tasas_default(c, pais, segmento, tipo_funnel, config=config) for c in canales
+    ]
+    limites = st.data_editor(
+        pd.DataFrame(
+            {
+                "canal": canales,
+                "base_disponible": [None] * len(canales),
+                "tasa_mql": [d["tasa_mql"] for d in defaults],
+                "tasa_sql": [d["tasa_sql"] for d in defaults],
+                "intervalo_sql": [
+                    f"{d['intervalo_sql'][0]:.2%} – {d['intervalo_sql'][1]:.2%}" for d in defaults
+                ],
+            }
+        ),
+        key="plan_limites",
+        hide_index=True,
+        use_container_width=True,
+        disabled=["canal", "intervalo_sql"],
+        column_config={
+            "base_disponible": st.column_config.NumberColumn(
+                "Base disponible", min_value=0, step=100, format="%d", help="Vacía = sin límite de base."
+            ),
+            "tasa_mql": st.column_config.NumberColumn(
+                "Tasa MQL", min_value=0.0, max_value=1.0, step=0.0001, format="%.4f"
+            ),
+            "tasa_sql": st.column_config.NumberColumn(
+                "Tasa SQL", min_value=0.0, max_value=1.0, step=0.0001, format="%.4f"
+            ),
+            "intervalo_sql": st.column_config.TextColumn(
+                "IC tasa SQL",
+                help=f"Intervalo creíble {posteriores.CREDIBILIDAD:.0%} de la tasa SQL por defecto.",
+            ),
+        },
+    )
+    calibrados = [c for c, d in zip(canales, defaults) if d["fuente"] == "historico"]
+    if calibrados:
+        st.caption(f"Tasas prellenadas con el histórico de resultados: {', '.join(calibrados)}.")
+    bases = {
+        c: float(b) for c, b in zip(limites["canal"], limites["base_disponible"]) if pd.notna(b)
+    }
+    tasas = {
+        fila.canal: {
+            col: float(valor) if pd.notna(valor) else 0.0
+            for col, valor in (("tasa_mql", fila.tasa_mql), ("tasa_sql", fila.tasa_sql))
+        }
+        for fila in limites.itertuples(index=False)
+    }
+
+    opciones = planificador.opciones_canales(
+        pais, periodo, segmento, tipo_funnel, envios_contacto, tipo_cambio,
+        bases=bases, tasas=tasas, config=config,
+    )
+    tope = planificador.capacidad(opciones, objetivo)
+    if tope < 1:
+        st.warning(f"Con estas tasas, cupos y bases ningún canal genera {objetivo.upper()}.")
+        return
+    maximo = int(min(tope, MAX_SLIDER_PLAN))
+    cantidad = st.slider(
+        f"{objetivo.upper()} objetivo",
+        min_value=1,
+        max_value=maximo,
+        value=min(100, maximo),
+        key="plan_cantidad",
+        help=(
+            f"Máximo alcanzable: {tope:,.0f}." if np.isfinite(tope)
+            else "Hay canales sin cupo ni base: el objetivo no tiene tope."
+        ),
+    )
+
+    with metricas.medir("simulaciones.plan_multicanal"):
+        plan, resumen = planificador.planificar(opciones, objetivo, cantidad)
+
+    if not resumen["alcanzado"]:
+        st.error(
+            f"Los cupos y bases solo alcanzan {resumen['logrado']:,} {objetivo.upper()} "
+            f"(objetivo: {cantidad:,})."
+        )
+
+    def fmt(valor_cop):
+        valor = cambio.desde_cop(valor_cop, moneda_trabajo, tipo_cambio)
+        return cambio.formatear(valor, moneda_trabajo)
+
+    cps = fmt(resumen["costo_por_sql_cop"]) if resumen["sql"] > 0 else "N/A"
+    colr1, colr2, colr3, colr4 = st.columns(4)
+    colr1.metric("Contactos", f"{resumen['base']:,}")
+    colr2.metric("MQL / SQL", f"{resumen['mql']:,} / {resumen['sql']:,}")
+    colr3.metric("Costo total", f"{fmt(resumen['costo_total_cop'])} {moneda_trabajo}")
+    colr4.metric("Costo por SQL", f"{cps} {moneda_trabajo}")
+
+    st.dataframe(
+        plan[
+            [
+                "canal", "proveedor_sms", "base", "envios", "mql", "sql",
+                "costo_total_cop", "costo_por_sql_cop", "%_cupo", "limite",
+            ]
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+# ------------------ BARRIDO DE SENSIBILIDAD ------------------ #
+
+def _rango(etiqueta, minimo, maximo, pasos_default, key, step, formato=None, max_value=None):
+    c1, c2, c3 = st.columns(3)
+    desde = c1.number_input(
+        f"{etiqueta} desde", min_value=0.0, max_value=max_value, value=minimo,
+        step=step, format=formato, key=f"{key}_desde",
+    )
+    hasta = c2.number_input(
+        f"{etiqueta} hasta", min_value=0.0, max_value=max_value, value=maximo,
+        step=step, format=formato, key=f"{key}_hasta",
+    )
+    pasos = c3.number_input(
+        "Pasos", min_value=1, max_value=1000, value=pasos_default, step=1, key=f"{key}_pasos",
+    )
+    return np.linspace(desde, hasta, int(pasos))
+
+def seccion_barrido(
+    canal, pais, proveedor_sms, tipo_funnel, moneda_trabajo, tipo_cambio, tasa_sql, tasa_mql
+):
+    st.markdown("### 4. Barrido de sensibilidad (budget × tasas × tasa de cambio)")
+    st.caption(
+        "Evalúa la simulación 1 sobre toda la grilla en un solo cálculo vectorizado "
+        "(hasta 1000 pasos por eje)."
+    )
+
+    budgets = _rango(
+        f"Budget ({moneda_trabajo})", 0.0, 10_000_000.0 if moneda_trabajo == "COP" else 2_500.0,
+        100, "sweep_budget", step=10.0,
+    )
+    tasas_sql = _rango(
+        "Tasa SQL", 0.0, max(float(tasa_sql) * 2, 0.01), 100, "sweep_tasa_sql",
+        step=0.0001, formato="%.4f", max_value=1.0,
+    )
+    if tipo_funnel == motor.FUNNEL_MQL_SQL:
+        tasas_mql = _rango(
+            "Tasa MQL", 0.0, max(float(tasa_mql) * 2, 0.01), 5, "sweep_tasa_mql",
+            step=0.0001, formato="%.4f", max_value=1.0,
+        )
+    else:
+        tasas_mql = np.array([0.0])
+    fxs = _rango(
+        "Tasa de cambio", float(tipo_cambio), float(tipo_cambio), 1, "sweep_fx", step=50.0,
+    )
+
+    celdas = len(budgets) * len(tasas_sql) * len(tasas_mql) * len(fxs)
+    if celdas > MAX_CELDAS_BARRIDO:
+        st.warning(
+            f"La grilla tiene {celdas:,} celdas; el máximo es {MAX_CELDAS_BARRIDO:,}. "
+            "Reduce los pasos de algún eje."
+        )
+        return
+
+    if st.button("Calcular barrido", key="btn_sweep"):
+        # La sesión guarda solo las entradas (ejes de ≤ 1000 pasos); la grilla
+        # completa vive en CACHE_CALCULOS y se recalcula si se desalojó
+        st.session_state.sweep = {
+            "canal": canal,
+            "pais": pais,
+            "proveedor_sms": proveedor_sms,
+            "tipo_funnel": tipo_funnel,
+            "moneda_trabajo": moneda_trabajo,
+            "budgets": budgets,
+            "tasas_sql": tasas_sql,
+            "tasas_mql": tasas_mql,
+            "fxs": fxs,
+            "version_precios": precios.actual().version,
+        }
+        with metricas.medir("simulaciones.barrido", celdas=celdas):
+            barrido_cacheado(st.session_state.sweep)
+
+    with metricas.medir("simulaciones.barrido_tablas"):
+        mostrar_barrido()
+
+def barrido_cacheado(entradas: dict) -> dict:
+    """
+    motor.barrido_sensibilidad con caché LRU compartida entre sesiones, con
+    clave en las entradas y la versión de precios. El resultado es
+    compartido: no se debe modificar.
+    """
+    entradas = dict(entradas)
+    config = precios.version(entradas.pop("version_precios"))
+    return CACHE_CALCULOS.obtener_o_calcular(
+        clave_canonica("barrido", [entradas, config.version]),
+        lambda: motor.barrido_sensibilidad(**entradas, config=config),
+    )
+
+def mostrar_barrido():
+    sweep = st.session_state.get("sweep")
+    if not sweep:
+        return
+    barrido = barrido_cacheado(sweep)
+    budgets, tasas_sql, tasas_mql, fxs = (
+        sweep["budgets"], sweep["tasas_sql"], sweep["tasas_mql"], sweep["fxs"]
+    )
+    moneda_trabajo = sweep["moneda_trabajo"]
+
+    col1, col2, col3 = st.columns(3)
+    metrica = col1.selectbox(
+        "Métrica", ["sql", "costo_por_sql"], key="sweep_metrica",
+        format_func=lambda m: "SQL" if m == "sql" else f"Costo por SQL ({moneda_trabajo})",
+    )
+    i_mql = col2.selectbox(
+        "Tasa MQL", range(len(tasas_mql)), format_func=lambda i: f"{tasas_mql[i]:.4f}",
+        key="sweep_sel_mql",
+    )
+    i_fx = col3.selectbox(
+        "Tasa de cambio", range(len(fxs)), format_func=lambda i: f"{fxs[i]:,.0f}",
+        key="sweep_sel_fx",
+    )
+
+    if metrica == "sql":
+        valores = barrido["sql"][:, :, i_mql, i_fx]
+    else:
+        valores = barrido["costo_por_sql_cop"][:, :, i_mql, i_fx]
+        valores = cambio.desde_cop(valores, moneda_trabajo, fxs[i_fx])
+
+    # Heatmap con a lo sumo MAX_EJE_HEATMAP celdas por eje (la tabla va completa)
+    paso_b = max(1, math.ceil(len(budgets) / MAX_EJE_HEATMAP))
+    paso_t = max(1, math.ceil(len(tasas_sql) / MAX_EJE_HEATMAP))
+    sub = valores[::paso_b, ::paso_t]
+    malla_b, malla_t = np.meshgrid(budgets[::paso_b], tasas_sql[::paso_t], indexing="ij")
+    datos = pd.DataFrame(
+        {"budget": malla_b.ravel(), "tasa_sql": malla_t.ravel(), "valor": sub.ravel()}
+    )
+    heatmap = (
+        alt.Chart(datos)
+        .mark_rect()
+        .encode(
+            x=alt.X("tasa_sql:O", title="Tasa SQL", axis=alt.Axis(format=".4f")),
+            y=alt.Y(
+                "budget:O",
+                title=f"Budget ({moneda_trabajo})",
+                sort="descending",
+                axis=alt.Axis(format=",.0f"),
+            ),
+            color=alt.Color("valor:Q", title=metrica),
+            tooltip=["budget", "tasa_sql", "valor"],
+        )
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+
+    # Tabla a mayor resolución (también submuestreada); la exportación va completa
+    paso_b = max(1, math.ceil(len(budgets) / MAX_EJE_TABLA))
+    paso_t = max(1, math.ceil(len(tasas_sql) / MAX_EJE_TABLA))
+    tabla = pd.DataFrame(
+        valores[::paso_b, ::paso_t],
+        index=pd.Index(budgets[::paso_b], name=f"budget_{moneda_trabajo}"),
+        columns=[f"{t:.6f}" for t in tasas_sql[::paso_t]],
+    )
+    st.dataframe(tabla, use_container_width=True)
+
+    if st.button("Preparar exportación de la grilla completa", key="btn_sweep_preparar"):
+        st.download_button(
+            "Descargar grilla (CSV)",
+            data=motor.barrido_a_tabla(barrido, budgets, tasas_sql, tasas_mql, fxs)
+            .to_csv(index=False)
+            .encode("utf-8"),
+            file_name="barrido_sensibilidad.csv",
+            mime="text/csv",
+            key="btn_sweep_export",
+        )